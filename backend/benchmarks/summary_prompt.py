@@ -0,0 +1,136 @@
+"""
+Prompt size and build time of AI person summaries vs. order history length.
+
+Compares the previous prompt, which embedded the whole order history as a
+Python ``repr``, with :func:`client.summaries.build_summary_prompt`, which uses
+aggregates and the most recent orders under a token budget. Histories are
+synthetic and built in memory; reading the ``PersonProfile`` and the recent
+carts in ``history_digest`` is not part of the timing::
+
+    python -m benchmarks.summary_prompt [--orders 10 100 1000 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from client.profiles import FAVORITE_DISHES  # noqa: E402
+from client.summaries import build_summary_prompt, estimate_tokens  # noqa: E402
+
+DISHES = ("Pizza Margherita", "Caesar Salad", "Coca-Cola", "Lagman", "Plov", "Green Tea", "Cheesecake")
+PERSON = SimpleNamespace(full_name="Regular Guest", age=34, gender="Female", emotion="Happy", body_type="Normal")
+
+
+def sample_orders(count: int) -> list[dict]:
+    """Orders newest first, shaped like the old full order history."""
+    base = datetime(2025, 1, 1, 19, tzinfo=timezone.utc)
+    orders = []
+    for i in range(count):
+        created = (base - timedelta(days=3 * i)).isoformat()
+        orders.append({
+            "cart_id": str(uuid.uuid4()),
+            "cart_created_at": created,
+            "cart_updated_at": created,
+            "table_number": 1 + i % 7,
+            "products": [
+                {"product_id": str(uuid.uuid4()), "product_name": DISHES[(i + j) % len(DISHES)], "added_at": created}
+                for j in range(1 + i % 4)
+            ],
+        })
+    return orders
+
+
+def legacy_prompt(orders: list[dict]) -> str:
+    """The prompt as built before: counters over every order plus the full history ``repr``."""
+    history = {"person_id": str(uuid.uuid4()), "person_name": PERSON.full_name, "orders": orders}
+    dishes = Counter(product["product_name"] for order in orders for product in order["products"])
+    tables = Counter(order["table_number"] for order in orders)
+    return f"""
+        Customer: {PERSON.full_name}
+        - Total visits: {len(orders)}
+        - Favorite table: {tables.most_common(1)[0][0]}
+        - Favorite dishes: {[{"dish": dish, "count": count} for dish, count in dishes.most_common(3)]}
+        - Total ordered items: {sum(dishes.values())}
+
+        Complete order history as JSON:
+        {history}
+        """
+
+
+def sample_digest(orders: list[dict]) -> dict:
+    """What ``history_digest`` returns for ``orders`` (statistics precomputed in the profile)."""
+    dishes = Counter(product["product_name"] for order in orders for product in order["products"])
+    tables = Counter(order["table_number"] for order in orders)
+    first = datetime.fromisoformat(orders[-1]["cart_created_at"])
+    last = datetime.fromisoformat(orders[0]["cart_created_at"])
+    return {
+        "total_visits": len(orders),
+        "total_items": sum(dishes.values()),
+        "first_visit": first,
+        "last_visit": last,
+        "visit_cadence_days": (last - first).total_seconds() / 86400 / max(len(orders) - 1, 1),
+        "favorite_table": tables.most_common(1)[0][0],
+        "favorite_dishes": [{"dish": dish, "count": count} for dish, count in dishes.most_common(FAVORITE_DISHES)],
+        "recent_orders": [
+            {
+                "cart_id": order["cart_id"],
+                "created_at": datetime.fromisoformat(order["cart_created_at"]),
+                "table_number": order["table_number"],
+                "products": [product["product_name"] for product in order["products"]],
+            }
+            for order in orders[:settings.AI_SUMMARY_PROMPT_ORDERS]
+        ],
+    }
+
+
+def timed(build, repeat: int) -> tuple[str, float]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        prompt = build()
+    return prompt, (time.perf_counter() - started) / repeat
+
+
+def run(order_counts: list[int], repeat: int = 5) -> list[dict]:
+    results = []
+    for count in order_counts:
+        orders = sample_orders(count)
+        legacy, legacy_time = timed(lambda: legacy_prompt(orders), repeat)
+        digest = sample_digest(orders)
+        bounded, bounded_time = timed(lambda: build_summary_prompt(PERSON, digest), repeat)
+        results.append({
+            "orders": count,
+            "legacy_tokens": estimate_tokens(legacy),
+            "legacy_ms": legacy_time * 1000,
+            "bounded_tokens": estimate_tokens(bounded),
+            "bounded_ms": bounded_time * 1000,
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, nargs="+", default=[10, 100, 1000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"budget={settings.AI_SUMMARY_PROMPT_TOKEN_BUDGET} tokens, last {settings.AI_SUMMARY_PROMPT_ORDERS} orders")
+    print(f"{'orders':>8} {'legacy tokens':>14} {'legacy ms':>10} {'bounded tokens':>15} {'bounded ms':>11}")
+    for row in run(args.orders, args.repeat):
+        print(f"{row['orders']:>8} {row['legacy_tokens']:>14} {row['legacy_ms']:>10.2f} "
+              f"{row['bounded_tokens']:>15} {row['bounded_ms']:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
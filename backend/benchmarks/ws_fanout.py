@@ -0,0 +1,150 @@
+"""
+Fan-out load test for ``ws/person/``.
+
+Runs ``config.asgi.application`` in-process (no sockets) with N simulated
+dashboards connected to ``ws/person/`` and M simulated cameras publishing
+``person_joined`` events through ``notify_person_joined``, the same path the
+detection API uses. Reports connection setup time, delivery latency
+percentiles, memory per connection and dropped messages::
+
+    python -m benchmarks.ws_fanout --dashboards 500 --cameras 4 --events 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from asgiref.sync import sync_to_async  # noqa: E402
+from channels.testing import WebsocketCommunicator  # noqa: E402
+
+from client.events import notify_person_joined  # noqa: E402
+from config.asgi import application  # noqa: E402
+from core import metrics  # noqa: E402
+from core.encoding import ENCODINGS, decode_event  # noqa: E402
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def connect_dashboards(count: int, path: str) -> tuple[list[WebsocketCommunicator], list[float]]:
+    dashboards, setup_times = [], []
+    for _ in range(count):
+        communicator = WebsocketCommunicator(application, path)
+        started = time.perf_counter()
+        connected, _ = await communicator.connect()
+        if not connected:
+            raise RuntimeError(f"Dashboard failed to connect to {path}")
+        setup_times.append(time.perf_counter() - started)
+        dashboards.append(communicator)
+    return dashboards, setup_times
+
+
+async def camera(index: int, events: int, interval: float, sent_at: dict[str, float]) -> None:
+    publish = sync_to_async(notify_person_joined)
+    for seq in range(events):
+        event_id = f"{index}-{seq}"
+        sent_at[event_id] = time.perf_counter()
+        await publish({"id": event_id, "vector": None, "age": 30, "gender": "Female"})
+        if interval:
+            await asyncio.sleep(interval)
+
+
+async def dashboard(communicator: WebsocketCommunicator, expected: int, idle_timeout: float,
+                    sent_at: dict[str, float], latencies: list[float]) -> int:
+    received = 0
+    while received < expected:
+        try:
+            message = await communicator.receive_output(timeout=idle_timeout)
+        except asyncio.TimeoutError:
+            break
+        if message["type"] != "websocket.send":
+            break
+        arrived = time.perf_counter()
+        payload = decode_event(message.get("bytes") or message.get("text"))
+        if payload.get("event") != "person_joined":
+            continue
+        latencies.append(arrived - sent_at[payload["person"]["id"]])
+        received += 1
+    return received
+
+
+async def run(args) -> dict:
+    metrics.reset()
+    path = f"/ws/person/?encoding={args.encoding}"
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    dashboards, setup_times = await connect_dashboards(args.dashboards, path)
+    connected = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    memory = sum(stat.size_diff for stat in connected.compare_to(baseline, "filename"))
+
+    expected = args.cameras * args.events
+    sent_at: dict[str, float] = {}
+    latencies: list[float] = []
+    interval = 1 / args.rate if args.rate else 0
+
+    started = time.perf_counter()
+    receivers = [
+        asyncio.create_task(dashboard(item, expected, args.idle_timeout, sent_at, latencies))
+        for item in dashboards
+    ]
+    await asyncio.gather(*(camera(i, args.events, interval, sent_at) for i in range(args.cameras)))
+    delivered = sum(await asyncio.gather(*receivers))
+    elapsed = time.perf_counter() - started
+
+    for item in dashboards:
+        # receive_output() cancels the application on timeout; only close live ones.
+        if not item.future.done():
+            await item.disconnect()
+
+    return {
+        "dashboards": args.dashboards,
+        "cameras": args.cameras,
+        "published": expected,
+        "expected_deliveries": expected * args.dashboards,
+        "delivered": delivered,
+        "dropped": expected * args.dashboards - delivered,
+        "elapsed_s": elapsed,
+        "setup_ms": {f"p{q}": percentile(setup_times, q) * 1000 for q in (50, 95, 100)},
+        "latency_ms": {f"p{q}": percentile(latencies, q) * 1000 for q in (50, 95, 99, 100)},
+        "memory_per_connection_kb": memory / max(args.dashboards, 1) / 1024,
+        "metrics": metrics.snapshot(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dashboards", type=int, default=100, help="simulated ws/person/ clients")
+    parser.add_argument("--cameras", type=int, default=2, help="simulated publishers")
+    parser.add_argument("--events", type=int, default=50, help="events per camera")
+    parser.add_argument("--rate", type=float, default=20, help="events per second per camera (0 = unthrottled)")
+    parser.add_argument("--encoding", choices=ENCODINGS, default="json")
+    parser.add_argument("--idle-timeout", type=float, default=2.0, help="seconds without a frame before a dashboard gives up")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print(f"dashboards={result['dashboards']} cameras={result['cameras']} published={result['published']}")
+    print("connection setup ms  p50={p50:.2f} p95={p95:.2f} max={p100:.2f}".format(**result["setup_ms"]))
+    print("delivery latency ms  p50={p50:.2f} p95={p95:.2f} p99={p99:.2f} max={p100:.2f}".format(**result["latency_ms"]))
+    print(f"memory per connection  {result['memory_per_connection_kb']:.1f} KiB")
+    print(f"delivered {result['delivered']}/{result['expected_deliveries']} "
+          f"(dropped {result['dropped']}) in {result['elapsed_s']:.2f}s")
+    print(f"counters  {result['metrics']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Bytes per event and CPU cost of ``person_joined`` frame encodings.
+
+Compares every encoding in :mod:`core.encoding` with and without
+permessage-deflate (raw DEFLATE with context takeover, as negotiated by
+browsers by default)::
+
+    python -m benchmarks.ws_payloads [--events 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from core.encoding import ENCODINGS, encode_event
+
+GENDERS = ("Male", "Female")
+EMOTIONS = ("Happy", "Neutral", "Sad", "Angry", "Surprised")
+BODY_TYPES = ("Slim", "Normal", "Athletic", "Heavy")
+
+
+def sample_payloads(count: int) -> list[dict]:
+    """Build ``person_joined`` payloads shaped like ``notify_person_joined`` output."""
+    base = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+    payloads = []
+    for i in range(count):
+        seen_at = (base + timedelta(seconds=i)).isoformat()
+        payloads.append({
+            "event": "person_joined",
+            "person": {
+                "id": str(uuid.uuid4()),
+                "image": f"/media/people/{uuid.uuid4().hex}.jpg",
+                "full_name": None if i % 3 else f"Guest {i}",
+                "phone_number": None,
+                "age": 18 + i % 50,
+                "gender": GENDERS[i % len(GENDERS)],
+                "emotion": EMOTIONS[i % len(EMOTIONS)],
+                "body_type": BODY_TYPES[i % len(BODY_TYPES)],
+                "entry_time": seen_at,
+                "exit_time": None,
+                "created_at": seen_at,
+                "updated_at": seen_at,
+            },
+        })
+    return payloads
+
+
+def frame_bytes(text_data, bytes_data) -> bytes:
+    return bytes_data if bytes_data is not None else text_data.encode()
+
+
+def run(events: int) -> list[dict]:
+    payloads = sample_payloads(events)
+    results = []
+    for encoding in ENCODINGS:
+        for deflate in (False, True):
+            compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS) if deflate else None
+            total = 0
+            started = time.process_time()
+            for payload in payloads:
+                data = frame_bytes(*encode_event(payload, encoding))
+                if compressor is not None:
+                    # permessage-deflate strips the trailing 00 00 ff ff of a sync flush
+                    data = (compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH))[:-4]
+                total += len(data)
+            elapsed = time.process_time() - started
+            results.append({
+                "mode": f"{encoding}{'+deflate' if deflate else ''}",
+                "bytes_per_event": total / events,
+                "cpu_ms_per_10k": elapsed * 1000 * 10_000 / events,
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'mode':<20}{'bytes/event':>14}{'CPU ms/10k':>14}")
+    for row in run(args.events):
+        print(f"{row['mode']:<20}{row['bytes_per_event']:>14.1f}{row['cpu_ms_per_10k']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,12 @@
 """Admin registrations for client app."""
 from django.contrib import admin
 from . import models
+from .search import filter_people
 
 
 @admin.register(models.Organization)
 class OrganizationAdmin(admin.ModelAdmin):
-    list_display = ("id", "name", "private_key")
+    list_display = ("id", "name", "private_key", "timezone")
     search_fields = ("name", "private_key")
 
 
@@ -15,6 +16,15 @@ class PersonAdmin(admin.ModelAdmin):
     search_fields = ("full_name", "phone_number")
     list_filter = ("organization",)
 
+    def get_queryset(self, request):
+        # Вектор (128 чисел) не нужен ни в списке, ни в поиске
+        return super().get_queryset(request).select_related("organization").defer("vector")
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск через client.search (триграммные индексы) вместо icontains по всей таблице;
+        # фильтры и сортировка списка применяются к результату как обычно
+        return filter_people(queryset, search_term), False
+
 
 @admin.register(models.Product)
 class ProductAdmin(admin.ModelAdmin):
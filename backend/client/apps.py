@@ -6,3 +6,6 @@ class ClientConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "client"
     verbose_name = "Client"
+
+    def ready(self) -> None:
+        from . import checks, signals  # noqa: F401
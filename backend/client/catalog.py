@@ -0,0 +1,120 @@
+"""Product autocomplete served from an in-process, per-organization catalog.
+
+POS terminals ask for completions on every keystroke. Catalogs of up to
+``PRODUCT_CATALOG_CACHE_SIZE`` products are loaded once, serialized, and kept
+in memory as a sorted list of name words, so a completion is a binary search
+and costs no database query. The catalog is rebuilt when the organization's
+``CATALOG`` version counter from :mod:`client.stats_cache` moves, which only
+product writes do (see ``client.signals``); people and orders leave it alone.
+
+Larger catalogs are searched in the database with the same rule (every query
+word starts a word of the name), as a case-insensitive regular expression per
+word. On PostgreSQL the ``pg_trgm`` GIN index on ``Product.name`` (migration
+0015) serves these regex matches.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import Case, IntegerField, Value, When
+
+from .models import Product
+from .serializers import ProductSerializer
+from .stats_cache import CATALOG, get_version
+
+_WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> list[str]:
+    """Слова названия в нижнем регистре."""
+    return _WORD.findall(text.lower())
+
+
+class Catalog:
+    """Сериализованные продукты организации и отсортированный список слов их названий."""
+
+    def __init__(self, products: list[dict]):
+        self.products = products  # по возрастанию названия
+        self.names = [product["name"].lower() for product in products]
+        entries = sorted({(word, position) for position, name in enumerate(self.names) for word in words(name)})
+        self.words = [word for word, _position in entries]
+        self.positions = [position for _word, position in entries]
+
+    def complete(self, query: str, limit: int) -> list[dict]:
+        """
+        Продукты, в названии которых каждое слово ``query`` начинает какое-то слово.
+
+        Сначала названия, начинающиеся с ``query``, затем остальные, по алфавиту.
+        """
+        tokens = words(query)
+        if not tokens:
+            return []
+        start = bisect_left(self.words, tokens[0])
+        candidates = set()
+        for word, position in zip(self.words[start:], self.positions[start:]):
+            if not word.startswith(tokens[0]):
+                break
+            candidates.add(position)
+
+        prefix = query.strip().lower()
+        matches = [
+            position for position in candidates
+            if all(any(word.startswith(token) for word in words(self.names[position])) for token in tokens[1:])
+        ]
+        matches.sort(key=lambda position: (not self.names[position].startswith(prefix), position))
+        return [self.products[position] for position in matches[:limit]]
+
+
+_catalogs: OrderedDict = OrderedDict()
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(organization_id) -> Optional[Catalog]:
+    """Catalog of an organization, or ``None`` when it has too many products to keep in memory."""
+    version = get_version(organization_id, CATALOG)
+    key = str(organization_id)
+    with _catalogs_lock:
+        cached = _catalogs.get(key)
+        if cached is not None and cached[0] == version:
+            _catalogs.move_to_end(key)
+            return cached[1]
+
+    size = settings.PRODUCT_CATALOG_CACHE_SIZE
+    products = list(Product.objects.filter(organization_id=organization_id).order_by("name")[:size + 1])
+    # Большой каталог тоже запоминаем (как None), чтобы не перечитывать его на каждое нажатие
+    catalog = Catalog(ProductSerializer(products, many=True).data) if len(products) <= size else None
+    with _catalogs_lock:
+        _catalogs[key] = (version, catalog)
+        _catalogs.move_to_end(key)
+        while len(_catalogs) > settings.PRODUCT_CATALOG_CACHE_ORGANIZATIONS:
+            _catalogs.popitem(last=False)
+    return catalog
+
+
+def autocomplete(organization_id, query: str, limit: Optional[int] = None) -> list[dict]:
+    """Сериализованные продукты организации для подсказки по ``query``."""
+    limit = limit or settings.PRODUCT_AUTOCOMPLETE_LIMIT
+    catalog = get_catalog(organization_id)
+    if catalog is not None:
+        return catalog.complete(query, limit)
+
+    tokens = words(query)
+    if not tokens:
+        return []
+    products = Product.objects.filter(organization_id=organization_id)
+    for token in tokens:
+        # Начало слова: в начале названия или после не-буквенного символа, как в words()
+        products = products.filter(name__iregex=r"(^|\W)" + re.escape(token))
+    products = products.annotate(
+        prefix_match=Case(
+            When(name__istartswith=query.strip(), then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    ).order_by("prefix_match", "name")[:limit]
+    return ProductSerializer(products, many=True).data
@@ -0,0 +1,26 @@
+"""System checks for deployment settings the client app relies on."""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Statistics versions, ETags and summary locks need a cache shared by all workers."""
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        Warning(
+            f"The default cache is {backend.rsplit('.', 1)[-1]}, which is local to one process.",
+            hint=(
+                "Set REDIS_URL. Statistics cache versions, ETags and AI summary locks must be shared by all "
+                "workers, otherwise writes in one process do not invalidate responses cached by another."
+            ),
+            id="client.W001",
+        )
+    ]
@@ -0,0 +1,69 @@
+"""Conditional GET for read endpoints: ``If-None-Match`` answered with ``304 Not Modified``.
+
+ETags are derived from the write-driven version counters of
+:mod:`client.stats_cache` (or, for statistics, stored next to the cached
+result), so a matching request is answered before the main query runs and
+without serializing anything. The version is read before the response is
+built: a write that lands meanwhile can only make the ETag older than the
+content, which costs one extra full response but never hides a change.
+"""
+from __future__ import annotations
+
+import hashlib
+from functools import wraps
+from typing import Callable, Optional
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import urlencode
+
+from core import metrics
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag (quoted hex digest) of ``parts``."""
+    return '"%s"' % hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def request_etag(request, *parts) -> str:
+    """ETag of ``parts`` for this path and query string (parameter order does not matter)."""
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    return make_etag(request.path, query, *parts)
+
+
+def with_etag(response, etag: str):
+    """Attach ``etag`` to a successful response and ask clients to revalidate every time."""
+    if 200 <= response.status_code < 300:
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def not_modified(request, etag: str, name: str) -> Optional[HttpResponse]:
+    """``304 Not Modified`` when ``If-None-Match`` matches ``etag``, otherwise ``None``."""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        metrics.increment(f"conditional_get.{name}.not_modified")
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional(name: str, etag_func: Callable[..., Optional[str]]):
+    """
+    Decorator for ``APIView.get``: answer 304 when ``etag_func`` matches ``If-None-Match``.
+
+    ``etag_func(request, *args, **kwargs)`` may return ``None`` to skip the
+    check (e.g. for a missing object, so the view can return its 404).
+    """
+    def decorator(get):
+        @wraps(get)
+        def wrapper(self, request, *args, **kwargs):
+            etag = etag_func(request, *args, **kwargs)
+            if etag is None:
+                return get(self, request, *args, **kwargs)
+            response = not_modified(request, etag, name)
+            if response is not None:
+                return response
+            return with_etag(get(self, request, *args, **kwargs), etag)
+        return wrapper
+    return decorator
@@ -1,5 +1,7 @@
 from .notify_person_joined import notify_person_joined
+from .notify_presence_changed import notify_presence_changed
 
 __all__ = [
     "notify_person_joined",
+    "notify_presence_changed",
 ]
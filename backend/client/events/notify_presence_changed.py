@@ -0,0 +1,13 @@
+from core.event_bus import publish
+
+
+def notify_presence_changed(organization_id, action: str, entry: dict) -> None:
+    """Notify connected clients that someone entered, moved or left."""
+    payload = {
+        "event": "presence",
+        "action": action,
+        "organization": str(organization_id),
+        "person": entry,
+    }
+
+    publish("presence_changed", payload)
@@ -0,0 +1,154 @@
+"""Constant-memory exports of people, carts and cart products.
+
+Rows are read with ``QuerySet.iterator(chunk_size=...)`` (a server-side cursor on
+PostgreSQL) as plain tuples, so neither model instances nor the full result are
+held in memory. CSV is produced line by line; Parquet is written one row group
+per chunk and needs the optional ``pyarrow`` package.
+
+Under ASGI a streaming response must be fed by an async iterator, otherwise
+Django collects a sync one into a list before sending anything. ``aiter_csv``
+therefore pulls the same lines in batches of ``EXPORT_CHUNK_SIZE`` through
+``sync_to_async``; all batches run in the request's database thread, where the
+cursor was opened.
+"""
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import AsyncIterator, Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .models import Cart, CartProduct, Person
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    model: type
+    columns: tuple[str, ...]
+
+    def rows(self, organization_id=None, start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """Iterate over value tuples ordered by creation time."""
+        queryset = self.model.objects.all()
+        if organization_id:
+            queryset = queryset.filter(organization_id=organization_id)
+        if start:
+            queryset = queryset.filter(created_at__gte=start)
+        if end:
+            queryset = queryset.filter(created_at__lt=end)
+        return (
+            queryset.order_by("created_at", "id")
+            .values_list(*self.columns)
+            .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+        )
+
+
+EXPORT_DATASETS = {
+    "people": ExportDataset(
+        Person,
+        (
+            "id", "organization_id", "full_name", "phone_number", "age", "gender", "emotion",
+            "body_type", "entry_time", "exit_time", "created_at",
+        ),
+    ),
+    "carts": ExportDataset(
+        Cart,
+        ("id", "organization_id", "person_id", "table_number", "created_at"),
+    ),
+    "cart_products": ExportDataset(
+        CartProduct,
+        ("id", "organization_id", "cart_id", "cart__person_id", "product_id", "product__name", "created_at"),
+    ),
+}
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _header(dataset: ExportDataset) -> list[str]:
+    return [column.replace("__", "_") for column in dataset.columns]
+
+
+def iter_csv(dataset_name: str, organization_id=None, start=None, end=None) -> Iterator[str]:
+    """Yield the export as CSV lines, header first."""
+    dataset = EXPORT_DATASETS[dataset_name]
+    writer = csv.writer(_Echo())
+    yield writer.writerow(_header(dataset))
+    for row in dataset.rows(organization_id, start, end):
+        yield writer.writerow(row)
+
+
+async def aiter_csv(dataset_name: str, organization_id=None, start=None, end=None) -> AsyncIterator[str]:
+    """Yield the export as CSV text, one batch of ``EXPORT_CHUNK_SIZE`` lines at a time."""
+    lines = iter_csv(dataset_name, organization_id, start, end)
+    next_batch = sync_to_async(lambda: "".join(islice(lines, settings.EXPORT_CHUNK_SIZE)), thread_sensitive=True)
+    try:
+        while batch := await next_batch():
+            yield batch
+    finally:
+        await sync_to_async(lines.close, thread_sensitive=True)()
+
+
+def stream_csv(request, dataset_name: str, organization_id=None, start=None, end=None):
+    """CSV lines for a streaming response: async under ASGI, where ``META`` has no ``wsgi.version``."""
+    stream = iter_csv if "wsgi.version" in request.META else aiter_csv
+    return stream(dataset_name, organization_id, start, end)
+
+
+def write_csv(stream, dataset_name: str, organization_id=None, start=None, end=None) -> int:
+    """Write the export to a text stream; returns the number of data rows."""
+    count = -1
+    for count, line in enumerate(iter_csv(dataset_name, organization_id, start, end)):
+        stream.write(line)
+    return count
+
+
+def _arrow_type(model, column: str):
+    *relations, name = column.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    internal_type = model._meta.get_field(name).get_internal_type()
+    if internal_type == "DateTimeField":
+        return pyarrow.timestamp("us", tz="UTC")
+    if internal_type in ("IntegerField", "BigIntegerField", "SmallIntegerField"):
+        return pyarrow.int64()
+    return pyarrow.string()
+
+
+def write_parquet(path: str, dataset_name: str, organization_id=None, start=None, end=None) -> int:
+    """Write the export to a Parquet file, one row group per chunk; returns the number of rows."""
+    if pyarrow is None:
+        raise RuntimeError("Parquet export requires the pyarrow package")
+
+    dataset = EXPORT_DATASETS[dataset_name]
+    types = [_arrow_type(dataset.model, column) for column in dataset.columns]
+    schema = pyarrow.schema(list(zip(_header(dataset), types)))
+    rows = dataset.rows(organization_id, start, end)
+
+    written = 0
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        while chunk := list(islice(rows, settings.EXPORT_CHUNK_SIZE)):
+            arrays = [
+                pyarrow.array(
+                    [None if value is None else str(value) for value in values]
+                    if arrow_type == pyarrow.string() else list(values),
+                    type=arrow_type,
+                )
+                for arrow_type, values in zip(types, zip(*chunk))
+            ]
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+            written += len(chunk)
+    return written
@@ -0,0 +1,39 @@
+"""Side effects of ingesting detections, carts and exits."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from .events import notify_presence_changed
+from .presence import get_occupancy_index
+from .sketches import record_visitor
+
+
+def record_detection(
+    person,
+    *,
+    seen_at: Optional[datetime] = None,
+    table_number: Optional[int] = None,
+) -> None:
+    """Mark ``person`` as present, count them as a visitor and broadcast occupancy deltas."""
+    index = get_occupancy_index()
+    organization_id = person.organization_id
+    record_visitor(organization_id, person.id, seen_at=seen_at)
+
+    for entry in index.expire(organization_id, now=seen_at):
+        notify_presence_changed(organization_id, "leave", entry.as_dict())
+
+    action, entry = index.touch(
+        organization_id,
+        person.id,
+        seen_at=seen_at,
+        table_number=table_number,
+    )
+    notify_presence_changed(organization_id, action, entry.as_dict())
+
+
+def record_exit(person) -> None:
+    """Remove ``person`` from the occupancy index."""
+    entry = get_occupancy_index().leave(person.organization_id, person.id)
+    if entry is not None:
+        notify_presence_changed(person.organization_id, "leave", entry.as_dict())
@@ -0,0 +1,58 @@
+"""Chat-completion clients used for AI summaries.
+
+``get_llm_client()`` returns the backend chosen by ``AI_SUMMARY_BACKEND``:
+``openai`` shares one ``openai.OpenAI`` instance (and its connection pool)
+per API key, ``fake`` answers locally so tests and offline setups never
+touch the network.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from functools import lru_cache
+from typing import Optional
+
+import openai
+from django.conf import settings
+
+
+class OpenAIClient:
+    """Chat completions through the OpenAI API."""
+
+    def __init__(self, api_key: str):
+        self._client = openai.OpenAI(api_key=api_key, timeout=settings.AI_SUMMARY_TIMEOUT)
+
+    def complete(self, system: str, prompt: str, max_tokens: int = 300) -> str:
+        response = self._client.chat.completions.create(
+            model=settings.AI_SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=max_tokens,
+            temperature=0.7,
+        )
+        return response.choices[0].message.content.strip()
+
+
+class FakeLLMClient:
+    """Deterministic offline client: the answer depends only on the prompt."""
+
+    def complete(self, system: str, prompt: str, max_tokens: int = 300) -> str:
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+        return f"Offline summary {digest} ({len(prompt)} prompt characters)."
+
+
+@lru_cache(maxsize=4)
+def _openai_client(api_key: str) -> OpenAIClient:
+    return OpenAIClient(api_key)
+
+
+def get_llm_client() -> Optional[OpenAIClient | FakeLLMClient]:
+    """Configured client, or ``None`` when OpenAI is selected but no API key is set."""
+    if settings.AI_SUMMARY_BACKEND == "fake":
+        return FakeLLMClient()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    return _openai_client(api_key)
@@ -0,0 +1,63 @@
+"""Export people, carts or cart products to CSV or Parquet in constant memory."""
+import uuid
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from client.exports import EXPORT_DATASETS, write_csv, write_parquet
+
+
+def _parse_moment(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        parsed_date = parse_date(value)
+        if parsed_date is None:
+            raise CommandError(f"Invalid date: {value}")
+        parsed = datetime.combine(parsed_date, datetime.min.time())
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class Command(BaseCommand):
+    help = "Stream a dataset (people, carts, cart_products) to a CSV or Parquet file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(EXPORT_DATASETS))
+        parser.add_argument("--format", choices=("csv", "parquet"), default="csv")
+        parser.add_argument(
+            "--output",
+            help="Output file path (default: stdout for CSV; required for Parquet).",
+        )
+        parser.add_argument("--organization", help="Only export this organization UUID.")
+        parser.add_argument("--start", help="Include rows created at or after this date/datetime.")
+        parser.add_argument("--end", help="Include rows created before this date/datetime.")
+
+    def handle(self, *args, **options):
+        organization_id = options.get("organization")
+        if organization_id:
+            try:
+                organization_id = uuid.UUID(organization_id)
+            except ValueError:
+                raise CommandError(f"Invalid organization UUID: {organization_id}")
+        start = _parse_moment(options["start"]) if options.get("start") else None
+        end = _parse_moment(options["end"]) if options.get("end") else None
+        dataset, output = options["dataset"], options.get("output")
+
+        if options["format"] == "parquet":
+            if not output:
+                raise CommandError("--output is required for Parquet")
+            try:
+                written = write_parquet(output, dataset, organization_id, start, end)
+            except RuntimeError as exc:
+                raise CommandError(str(exc))
+        elif output:
+            with open(output, "w", newline="", encoding="utf-8") as stream:
+                written = write_csv(stream, dataset, organization_id, start, end)
+        else:
+            written = write_csv(self.stdout, dataset, organization_id, start, end)
+            self.stdout.flush()
+
+        self.stderr.write(self.style.SUCCESS(f"Exported {written} {dataset} rows"))
@@ -0,0 +1,30 @@
+"""Regenerate PersonProfile rows from carts and cart products."""
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from client.models import Organization
+from client.profiles import rebuild_profiles
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-person order profiles (visits, last visit, favorite table and dishes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization",
+            help="Only rebuild profiles of people in this organization UUID.",
+        )
+
+    def handle(self, *args, **options):
+        organization_id = options.get("organization")
+        if organization_id:
+            try:
+                organization_id = uuid.UUID(organization_id)
+            except ValueError:
+                raise CommandError(f"Invalid organization UUID: {organization_id}")
+        if organization_id and not Organization.objects.filter(id=organization_id).exists():
+            raise CommandError(f"Organization {organization_id} not found")
+
+        written = rebuild_profiles(organization_id)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} person profiles"))
@@ -0,0 +1,30 @@
+"""Regenerate PersonStatRollup rows from the Person table."""
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from client.models import Organization
+from client.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild hourly demographic rollups used by the statistics endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization",
+            help="Only rebuild rollups for this organization UUID.",
+        )
+
+    def handle(self, *args, **options):
+        organization_id = options.get("organization")
+        if organization_id:
+            try:
+                organization_id = uuid.UUID(organization_id)
+            except ValueError:
+                raise CommandError(f"Invalid organization UUID: {organization_id}")
+        if organization_id and not Organization.objects.filter(id=organization_id).exists():
+            raise CommandError(f"Organization {organization_id} not found")
+
+        written = rebuild_rollups(organization_id)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} rollup rows"))
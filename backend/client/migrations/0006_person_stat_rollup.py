@@ -0,0 +1,43 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:16
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def fill_rollups(apps, schema_editor):
+    from client.rollups import rebuild_rollups
+
+    rebuild_rollups(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0005_personvector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersonStatRollup",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("hour", models.DateTimeField()),
+                ("dimension", models.CharField(max_length=32)),
+                ("value", models.CharField(max_length=255)),
+                ("count", models.IntegerField(default=0)),
+                ("organization", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="stat_rollups", to="client.organization")),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="personstatrollup",
+            index=models.Index(fields=["organization", "dimension", "hour"], name="client_rollup_org_dim_hour"),
+        ),
+        migrations.AddConstraint(
+            model_name="personstatrollup",
+            constraint=models.UniqueConstraint(fields=("organization", "hour", "dimension", "value"), name="unique_person_stat_rollup"),
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.2 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0006_person_stat_rollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="person",
+            index=models.Index(fields=["organization", "created_at"], name="client_person_org_created"),
+        ),
+        migrations.AddIndex(
+            model_name="person",
+            index=models.Index(fields=["organization", "gender", "emotion", "body_type", "age"], name="client_person_org_demo"),
+        ),
+    ]
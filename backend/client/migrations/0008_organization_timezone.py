@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-19 18:40
+
+import client.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0007_person_org_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="organization",
+            name="timezone",
+            field=models.CharField(default="UTC", max_length=64, validators=[client.utils.validate_timezone]),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-19 19:05
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0008_organization_timezone"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VisitorSketch",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("hour", models.DateTimeField()),
+                ("registers", models.BinaryField()),
+                ("organization", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="visitor_sketches", to="client.organization")),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="visitorsketch",
+            constraint=models.UniqueConstraint(fields=("organization", "hour"), name="unique_visitor_sketch"),
+        ),
+    ]
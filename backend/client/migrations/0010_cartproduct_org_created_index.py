@@ -0,0 +1,17 @@
+# Generated by Django 5.1.2 on 2026-10-19 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0009_visitor_sketch"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cartproduct",
+            index=models.Index(fields=["organization", "created_at"], name="client_cartprod_org_created"),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.2 on 2026-10-19 20:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0010_cartproduct_org_created_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="person",
+            index=models.Index(fields=["created_at", "id"], name="client_person_created_id"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["created_at", "id"], name="client_product_created_id"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["organization", "created_at", "id"], name="client_product_org_created_id"),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-19 21:10
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0011_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersonSummary",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("text", models.TextField()),
+                ("fingerprint", models.CharField(max_length=64)),
+                ("person", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="summary", to="client.person")),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.2 on 2026-10-19 22:40
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def fill_profiles(apps, schema_editor):
+    from client.profiles import rebuild_profiles
+
+    rebuild_profiles(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0012_person_summary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersonProfile",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("total_visits", models.PositiveIntegerField(default=0)),
+                ("total_items", models.PositiveIntegerField(default=0)),
+                ("first_visit", models.DateTimeField(blank=True, null=True)),
+                ("last_visit", models.DateTimeField(blank=True, null=True)),
+                ("favorite_table", models.IntegerField(blank=True, null=True)),
+                ("favorite_dishes", models.JSONField(default=list)),
+                ("table_counts", models.JSONField(default=dict)),
+                ("dish_counts", models.JSONField(default=dict)),
+                ("person", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="profile", to="client.person")),
+            ],
+        ),
+        migrations.RunPython(fill_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.2 on 2026-10-19 23:05
+
+from django.db import migrations, models
+
+# GIN-индексы pg_trgm для поиска по имени и телефону (только PostgreSQL)
+TRIGRAM_INDEXES = (
+    ("client_person_name_trgm", "full_name"),
+    ("client_person_phone_trgm", "phone_normalized"),
+)
+
+
+def normalize_phone(value):
+    return "".join(char for char in value or "" if char.isdigit())
+
+
+def fill_phone_normalized(apps, schema_editor):
+    Person = apps.get_model("client", "Person")
+    people = Person.objects.exclude(phone_number__isnull=True).exclude(phone_number="").only("id", "phone_number")
+    batch = []
+    for person in people.iterator(chunk_size=2000):
+        person.phone_normalized = normalize_phone(person.phone_number)
+        batch.append(person)
+        if len(batch) >= 2000:
+            Person.objects.bulk_update(batch, ["phone_normalized"])
+            batch = []
+    Person.objects.bulk_update(batch, ["phone_normalized"])
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "client_person" USING gin ("{column}" gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0013_person_profile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="person",
+            name="phone_normalized",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="person",
+            index=models.Index(fields=["organization", "phone_normalized"], name="client_person_org_phone"),
+        ),
+        migrations.RunPython(fill_phone_normalized, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
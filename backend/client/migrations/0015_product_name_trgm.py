@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-19 23:40
+
+from django.db import migrations
+
+# GIN-индекс pg_trgm для поиска продуктов по названию (только PostgreSQL)
+INDEX_NAME = "client_product_name_trgm"
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS "{INDEX_NAME}" ON "client_product" USING gin ("name" gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS "{INDEX_NAME}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("client", "0014_person_search"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
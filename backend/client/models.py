@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from django.db import models
 from core.models import BaseModel
-from .utils import generate_private_key
+from .utils import generate_private_key, normalize_phone, validate_timezone
 from pgvector.django import VectorField
 
 
@@ -17,6 +17,7 @@ class Organization(BaseModel):
         default=generate_private_key,
         editable=False,
     )
+    timezone = models.CharField(max_length=64, default="UTC", validators=[validate_timezone])
 
     def __str__(self) -> str:
         return self.name
@@ -28,6 +29,7 @@ class Person(BaseModel):
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="people")
     full_name = models.CharField(max_length=255, blank=True, null=True)
     phone_number = models.CharField(max_length=255, blank=True, null=True)
+    phone_normalized = models.CharField(max_length=255, blank=True, default="", editable=False)
     vector = VectorField(dimensions=128, blank=True, null=True)
     image = models.ImageField(upload_to="people/", blank=True, null=True)
     age = models.IntegerField(blank=True, null=True)
@@ -37,9 +39,29 @@ class Person(BaseModel):
     entry_time = models.DateTimeField(blank=True, null=True)
     exit_time = models.DateTimeField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="client_person_created_id"),
+            models.Index(fields=["organization", "created_at"], name="client_person_org_created"),
+            models.Index(
+                fields=["organization", "gender", "emotion", "body_type", "age"],
+                name="client_person_org_demo",
+            ),
+            models.Index(fields=["organization", "phone_normalized"], name="client_person_org_phone"),
+        ]
+
     def __str__(self):
         return f"Person {self.id}"
 
+    def save(self, *args, **kwargs):
+        """Keep ``phone_normalized`` (digits only) in step with ``phone_number``."""
+        update_fields = kwargs.get("update_fields")
+        if "phone_number" not in self.get_deferred_fields():
+            self.phone_normalized = normalize_phone(self.phone_number)
+            if update_fields is not None and "phone_number" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "phone_normalized"}
+        super().save(*args, **kwargs)
+
 
 class Product(BaseModel):
     """Sellable product."""
@@ -47,6 +69,12 @@ class Product(BaseModel):
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="products")
     name = models.CharField(max_length=255, unique=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="client_product_created_id"),
+            models.Index(fields=["organization", "created_at", "id"], name="client_product_org_created_id"),
+        ]
+
     def __str__(self) -> str:
         return self.name
 
@@ -70,5 +98,78 @@ class CartProduct(BaseModel):
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE)
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["organization", "created_at"], name="client_cartprod_org_created"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.cart} -> {self.product}"
+
+
+class PersonStatRollup(BaseModel):
+    """Hourly count of people per demographic value, maintained incrementally."""
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="stat_rollups")
+    hour = models.DateTimeField()
+    dimension = models.CharField(max_length=32)
+    value = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "hour", "dimension", "value"],
+                name="unique_person_stat_rollup",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["organization", "dimension", "hour"], name="client_rollup_org_dim_hour"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.dimension}={self.value} @ {self.hour:%Y-%m-%d %H:00}: {self.count}"
+
+
+class VisitorSketch(BaseModel):
+    """HyperLogLog sketch of the people detected in an organization during one hour."""
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="visitor_sketches")
+    hour = models.DateTimeField()
+    registers = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["organization", "hour"], name="unique_visitor_sketch"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Visitors of {self.organization_id} @ {self.hour:%Y-%m-%d %H:00}"
+
+
+class PersonSummary(BaseModel):
+    """AI summary of a person's order history and the fingerprint of the data it was built from."""
+
+    person = models.OneToOneField(Person, on_delete=models.CASCADE, related_name="summary")
+    text = models.TextField()
+    fingerprint = models.CharField(max_length=64)
+
+    def __str__(self) -> str:
+        return f"Summary of {self.person_id}"
+
+
+class PersonProfile(BaseModel):
+    """Per-person order statistics maintained incrementally from carts and cart products."""
+
+    person = models.OneToOneField(Person, on_delete=models.CASCADE, related_name="profile")
+    total_visits = models.PositiveIntegerField(default=0)
+    total_items = models.PositiveIntegerField(default=0)
+    first_visit = models.DateTimeField(blank=True, null=True)
+    last_visit = models.DateTimeField(blank=True, null=True)
+    favorite_table = models.IntegerField(blank=True, null=True)
+    favorite_dishes = models.JSONField(default=list)
+    table_counts = models.JSONField(default=dict)
+    dish_counts = models.JSONField(default=dict)
+
+    def __str__(self) -> str:
+        return f"Profile of {self.person_id}"
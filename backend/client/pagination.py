@@ -0,0 +1,163 @@
+"""Keyset (cursor) pagination over ``(created_at, id)``, newest first.
+
+Pages are fetched with ``WHERE (created_at, id) < (last seen)`` (a SQL row
+comparison, ``>`` going backward) instead of ``OFFSET``, so every page costs the
+same range scan of the ``(created_at, id)`` index. ``created_at <= last seen``
+is added next to it as a plain bound for planners that do not turn row
+comparisons into index ranges. Cursors are opaque URL-safe strings that encode
+the boundary row and the direction.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from django.db import connection
+from django.db.models import BooleanField, F, Func, QuerySet, Value
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.response import Response
+
+COUNT_MODES = ("exact", "estimate", "none")
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+class RowComparison(Func):
+    """``(column, ...) <operator> (value, ...)`` as one SQL row comparison (PostgreSQL, SQLite 3.15+)."""
+
+    output_field = BooleanField()
+
+    def __init__(self, model, columns: tuple[str, ...], operator: str, values: tuple):
+        self.operator = operator
+        fields = [model._meta.get_field(column) for column in columns]
+        super().__init__(
+            *(F(column) for column in columns),
+            *(Value(value, output_field=field) for field, value in zip(fields, values)),
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sqls, params = [], []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            sqls.append(sql)
+            params.extend(expression_params)
+        width = len(sqls) // 2
+        return f"({', '.join(sqls[:width])}) {self.operator} ({', '.join(sqls[width:])})", params
+
+
+def encode_cursor(created_at: datetime, pk, backward: bool = False) -> str:
+    """Encode a boundary row and direction into an opaque cursor."""
+    payload = json.dumps({"t": created_at.isoformat(), "id": str(pk), "b": int(backward)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID, bool]:
+    """Return ``(created_at, id, backward)`` from a cursor made by :func:`encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(payload["t"])
+        pk = uuid.UUID(payload["id"])
+        backward = bool(payload["b"])
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursor(cursor)
+    if created_at is None:
+        raise InvalidCursor(cursor)
+    return created_at, pk, backward
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Planner row estimate on PostgreSQL (``pg_class.reltuples`` for the whole table,
+    ``EXPLAIN`` for filtered querysets); exact count on other backends.
+    """
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(queryset: QuerySet, mode: str) -> Optional[int]:
+    """Row count according to ``mode`` (one of :data:`COUNT_MODES`)."""
+    if mode == "exact":
+        return queryset.count()
+    if mode == "estimate":
+        return estimate_count(queryset)
+    return None
+
+
+def paginate_by_cursor(queryset: QuerySet, cursor: Optional[str], page_size: int) -> dict:
+    """
+    Return one page of ``queryset`` ordered by ``(-created_at, -id)``.
+
+    The result holds ``results`` (model instances), ``next_cursor`` and
+    ``previous_cursor``. Raises :class:`InvalidCursor` for malformed cursors.
+    """
+    backward = False
+    if cursor:
+        created_at, pk, backward = decode_cursor(cursor)
+        operator, bound = (">", "created_at__gte") if backward else ("<", "created_at__lte")
+        queryset = queryset.filter(
+            RowComparison(queryset.model, ("created_at", "id"), operator, (created_at, pk)),
+            **{bound: created_at},
+        )
+
+    ordering = ("created_at", "id") if backward else ("-created_at", "-id")
+    rows = list(queryset.order_by(*ordering)[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backward:
+        rows.reverse()
+
+    has_next = (not backward and has_more) or (backward and bool(cursor))
+    has_previous = (backward and has_more) or (not backward and bool(cursor))
+    return {
+        "results": rows,
+        "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].pk) if rows and has_next else None,
+        "previous_cursor": (
+            encode_cursor(rows[0].created_at, rows[0].pk, backward=True) if rows and has_previous else None
+        ),
+    }
+
+
+def cursor_paginated_response(request, queryset: QuerySet, serializer_class, page_size: int) -> Response:
+    """Ответ списка с курсорной пагинацией (параметры cursor и count)."""
+    count_mode = request.GET.get('count', 'none')
+    if count_mode not in COUNT_MODES:
+        return Response(
+            {"error": "count должен быть одним из: exact, estimate, none"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        page = paginate_by_cursor(queryset, request.GET.get('cursor'), page_size)
+    except InvalidCursor:
+        return Response(
+            {"error": "Неверный cursor"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    response_data = {
+        "count": count_rows(queryset, count_mode),
+        "page_size": page_size,
+        "has_next": page["next_cursor"] is not None,
+        "has_previous": page["previous_cursor"] is not None,
+        "next_cursor": page["next_cursor"],
+        "previous_cursor": page["previous_cursor"],
+        "results": serializer_class(page["results"], many=True).data
+    }
+    return Response(response_data, status=status.HTTP_200_OK)
@@ -0,0 +1,107 @@
+"""In-memory occupancy index of people currently present in each organization."""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+
+@dataclass
+class PresenceEntry:
+    person_id: str
+    entered_at: datetime
+    last_seen: datetime
+    table_number: Optional[int] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "person_id": self.person_id,
+            "entered_at": self.entered_at.isoformat(),
+            "last_seen": self.last_seen.isoformat(),
+            "table_number": self.table_number,
+        }
+
+
+class OccupancyIndex:
+    """
+    Per-organization map of person id -> :class:`PresenceEntry`.
+
+    The index is fed incrementally by ingestion (detections, carts, exits)
+    and never reads the ``Person`` table: after a restart it refills from
+    new detections and converges within one inactivity timeout. People not
+    seen for ``timeout`` are expired lazily on the next access.
+    """
+
+    def __init__(self, timeout: timedelta) -> None:
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._orgs: dict[str, dict[str, PresenceEntry]] = {}
+
+    def touch(
+        self,
+        organization_id,
+        person_id,
+        *,
+        seen_at: Optional[datetime] = None,
+        table_number: Optional[int] = None,
+    ) -> tuple[str, PresenceEntry]:
+        """Record a sighting; returns ``("enter" | "update", entry)``."""
+        seen_at = seen_at or timezone.now()
+        org_key, person_key = str(organization_id), str(person_id)
+        with self._lock:
+            people = self._orgs.setdefault(org_key, {})
+            entry = people.get(person_key)
+            if entry is None or seen_at - entry.last_seen > self.timeout:
+                entry = PresenceEntry(person_key, entered_at=seen_at, last_seen=seen_at, table_number=table_number)
+                people[person_key] = entry
+                return "enter", entry
+            entry.last_seen = max(entry.last_seen, seen_at)
+            if table_number is not None:
+                entry.table_number = table_number
+            return "update", entry
+
+    def leave(self, organization_id, person_id) -> Optional[PresenceEntry]:
+        """Remove a person; returns the removed entry, if any."""
+        with self._lock:
+            people = self._orgs.get(str(organization_id), {})
+            return people.pop(str(person_id), None)
+
+    def expire(self, organization_id, now: Optional[datetime] = None) -> list[PresenceEntry]:
+        """Drop and return entries not seen within the timeout."""
+        deadline = (now or timezone.now()) - self.timeout
+        with self._lock:
+            people = self._orgs.get(str(organization_id))
+            if not people:
+                return []
+            expired = [entry for entry in people.values() if entry.last_seen < deadline]
+            for entry in expired:
+                del people[entry.person_id]
+            return expired
+
+    def snapshot(self, organization_id) -> list[PresenceEntry]:
+        """Return current (non-expired) entries ordered by last sighting."""
+        with self._lock:
+            people = list(self._orgs.get(str(organization_id), {}).values())
+        return sorted(people, key=lambda entry: entry.last_seen, reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._orgs.clear()
+
+
+_index: Optional[OccupancyIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_occupancy_index() -> OccupancyIndex:
+    """Return the process-wide occupancy index."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = OccupancyIndex(timedelta(seconds=settings.PRESENCE_TIMEOUT_SECONDS))
+    return _index
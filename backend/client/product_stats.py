@@ -0,0 +1,56 @@
+"""Product popularity and co-purchase counts, each computed with one aggregated query."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from django.db.models import Count, F
+
+from .models import CartProduct
+
+
+def _cart_products(start: datetime, end: datetime, organization_id=None):
+    rows = CartProduct.objects.filter(created_at__gte=start, created_at__lt=end)
+    if organization_id:
+        rows = rows.filter(organization_id=organization_id)
+    return rows.order_by()
+
+
+def top_products(start: datetime, end: datetime, organization_id=None, limit: int = 10) -> list[dict]:
+    """Most ordered products in ``[start, end)``: times ordered and number of distinct carts."""
+    rows = (
+        _cart_products(start, end, organization_id)
+        .values("product_id", name=F("product__name"))
+        .annotate(count=Count("id"), carts=Count("cart_id", distinct=True))
+        .order_by("-count", "name")[:limit]
+    )
+    return list(rows)
+
+
+def co_purchases(
+    start: datetime,
+    end: datetime,
+    organization_id=None,
+    product_id=None,
+    limit: int = 10,
+) -> list[dict]:
+    """
+    Product pairs ordered in the same cart, by number of shared carts.
+
+    Self-joins ``CartProduct`` through the cart. Without ``product_id`` each pair is
+    reported once; with it, the products most often ordered together with that product.
+    """
+    rows = _cart_products(start, end, organization_id).annotate(
+        other_product_id=F("cart__cartproduct__product_id"),
+        other_name=F("cart__cartproduct__product__name"),
+    )
+    if product_id:
+        rows = rows.filter(product_id=product_id).exclude(other_product_id=product_id)
+    else:
+        rows = rows.filter(product_id__lt=F("other_product_id"))
+
+    rows = (
+        rows.values("product_id", "other_product_id", "other_name", name=F("product__name"))
+        .annotate(carts=Count("cart_id", distinct=True))
+        .order_by("-carts", "name", "other_name")[:limit]
+    )
+    return list(rows)
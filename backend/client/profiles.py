@@ -0,0 +1,179 @@
+"""Denormalized per-person order profile: visit counts, last visit and favorites.
+
+``PersonProfile`` keeps per-table and per-dish counters next to the derived
+favorites, so creating a cart or cart product is a single-row update and
+readers get favorites without touching the order history. Rarer edits
+(moving a cart, deleting an order) recompute the profile from SQL
+aggregates, and so does renaming a product, since dishes are counted by
+name. ``rebuild_profiles`` regenerates every profile from scratch.
+"""
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Count, F, Max, Min
+
+from .models import Cart, CartProduct, PersonProfile
+
+FAVORITE_DISHES = 5
+
+
+def get_profile(person) -> PersonProfile:
+    """Profile of ``person``; an empty unsaved one when they have no orders yet."""
+    profile = getattr(person, "profile", None)
+    return profile if profile is not None else PersonProfile(person_id=person.pk)
+
+
+def rank_favorites(profile: PersonProfile) -> None:
+    """Derive ``favorite_table`` and ``favorite_dishes`` from the counters."""
+    tables = [(int(table), count) for table, count in profile.table_counts.items() if count > 0]
+    profile.favorite_table = min(tables, key=lambda item: (-item[1], item[0]))[0] if tables else None
+    dishes = sorted(
+        ((dish, count) for dish, count in profile.dish_counts.items() if count > 0),
+        key=lambda item: (-item[1], item[0]),
+    )
+    profile.favorite_dishes = [{"dish": dish, "count": count} for dish, count in dishes[:FAVORITE_DISHES]]
+
+
+def _add(counts: dict, key, delta: int) -> None:
+    key = str(key)
+    value = counts.get(key, 0) + delta
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+def _build_profiles(carts, cart_products, profile_model=PersonProfile) -> list[PersonProfile]:
+    """Profiles computed with three grouped queries over the given carts and cart products."""
+    profiles = {
+        row["person_id"]: profile_model(
+            person_id=row["person_id"],
+            total_visits=row["total_visits"],
+            first_visit=row["first_visit"],
+            last_visit=row["last_visit"],
+        )
+        for row in carts.values("person_id").annotate(
+            total_visits=Count("id"),
+            first_visit=Min("created_at"),
+            last_visit=Max("created_at"),
+        ).order_by()
+    }
+    tables = (
+        carts.exclude(table_number__isnull=True)
+        .values("person_id", "table_number")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in tables:
+        profiles[row["person_id"]].table_counts[str(row["table_number"])] = row["count"]
+    dishes = (
+        cart_products.values(person_id=F("cart__person_id"), dish=F("product__name"))
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in dishes:
+        profile = profiles[row["person_id"]]
+        profile.dish_counts[row["dish"]] = row["count"]
+        profile.total_items += row["count"]
+
+    for profile in profiles.values():
+        rank_favorites(profile)
+    return list(profiles.values())
+
+
+def refresh_profile(person_id) -> Optional[PersonProfile]:
+    """Recompute one person's profile from their order history."""
+    built = _build_profiles(
+        Cart.objects.filter(person_id=person_id),
+        CartProduct.objects.filter(cart__person_id=person_id),
+    )
+    if not built:
+        PersonProfile.objects.filter(person_id=person_id).delete()
+        return None
+    fields = {
+        name: getattr(built[0], name)
+        for name in (
+            "total_visits", "total_items", "first_visit", "last_visit",
+            "table_counts", "dish_counts", "favorite_table", "favorite_dishes",
+        )
+    }
+    profile, _ = PersonProfile.objects.update_or_create(person_id=person_id, defaults=fields)
+    return profile
+
+
+def update_profile(person_id, change: Callable[[PersonProfile], None]) -> None:
+    """Apply ``change`` to the locked profile row and re-rank favorites."""
+    with transaction.atomic():
+        profile = PersonProfile.objects.select_for_update().filter(person_id=person_id).first()
+        if profile is None:
+            # Первый заказ: история уже содержит эту запись, профиль строится по ней
+            refresh_profile(person_id)
+            return
+        change(profile)
+        rank_favorites(profile)
+        profile.save()
+
+
+def add_cart(cart: Cart) -> None:
+    """Count a new cart as a visit."""
+    def change(profile: PersonProfile) -> None:
+        profile.total_visits += 1
+        profile.first_visit = min(filter(None, [profile.first_visit, cart.created_at]))
+        profile.last_visit = max(filter(None, [profile.last_visit, cart.created_at]))
+        if cart.table_number is not None:
+            _add(profile.table_counts, cart.table_number, 1)
+
+    update_profile(cart.person_id, change)
+
+
+def add_cart_product(person_id, dish: str, delta: int) -> None:
+    """Add (``delta=1``) or remove (``delta=-1``) one ordered dish."""
+    def change(profile: PersonProfile) -> None:
+        profile.total_items = max(profile.total_items + delta, 0)
+        _add(profile.dish_counts, dish, delta)
+
+    update_profile(person_id, change)
+
+
+def _replace_profiles(carts, cart_products, profiles, profile_model=PersonProfile) -> int:
+    """Swap ``profiles`` for ones recomputed from ``carts`` and ``cart_products``."""
+    new_rows = _build_profiles(carts, cart_products, profile_model)
+    with transaction.atomic():
+        profiles.delete()
+        profile_model.objects.bulk_create(new_rows, batch_size=1000)
+    return len(new_rows)
+
+
+def refresh_product_profiles(product_id) -> int:
+    """Recompute the profiles of everyone who ordered ``product_id``, e.g. after a rename."""
+    people = CartProduct.objects.filter(product_id=product_id).values("cart__person_id")
+    return _replace_profiles(
+        Cart.objects.filter(person_id__in=people),
+        CartProduct.objects.filter(cart__person_id__in=people),
+        PersonProfile.objects.filter(person_id__in=people),
+    )
+
+
+def rebuild_profiles(organization_id=None, apps=None) -> int:
+    """
+    Regenerate profiles from carts and cart products; returns the number of profiles written.
+
+    Migrations pass their ``apps`` registry so the historical models are used.
+    """
+    get_model = (apps or django_apps).get_model
+    cart_model, cart_product_model, person_model, profile_model = (
+        get_model("client", name) for name in ("Cart", "CartProduct", "Person", "PersonProfile")
+    )
+    carts = cart_model.objects.all()
+    cart_products = cart_product_model.objects.all()
+    profiles = profile_model.objects.all()
+    if organization_id:
+        people = person_model.objects.filter(organization_id=organization_id)
+        carts = carts.filter(person__in=people)
+        cart_products = cart_products.filter(cart__person__in=people)
+        profiles = profiles.filter(person__in=people)
+
+    return _replace_profiles(carts, cart_products, profiles, profile_model)
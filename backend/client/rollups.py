@@ -0,0 +1,130 @@
+"""Incrementally maintained hourly rollups of person demographics."""
+from __future__ import annotations
+
+from datetime import datetime, timezone as dt_timezone
+from typing import Iterable, Optional
+
+from django.apps import apps as django_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncHour
+
+from .models import PersonStatRollup
+
+ROLLUP_DIMENSIONS = ("gender", "emotion", "body_type", "age")
+
+
+def rollup_hour(moment: datetime) -> datetime:
+    """Truncate ``moment`` to the start of its UTC hour."""
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_keys(values: dict) -> set[tuple[str, str]]:
+    """``(dimension, value)`` pairs counted for a person; unset values are skipped."""
+    return {
+        (dimension, str(values[dimension]))
+        for dimension in ROLLUP_DIMENSIONS
+        if values.get(dimension) not in (None, "")
+    }
+
+
+def apply_rollup_delta(organization_id, hour: datetime, keys: Iterable[tuple[str, str]], delta: int) -> None:
+    """Add ``delta`` to the rollup rows of ``keys`` for one organization and hour."""
+    for dimension, value in keys:
+        rows = PersonStatRollup.objects.filter(
+            organization_id=organization_id,
+            hour=hour,
+            dimension=dimension,
+            value=value,
+        )
+        if rows.update(count=F("count") + delta) or delta < 0:
+            continue
+        try:
+            with transaction.atomic():
+                rows.create(
+                    organization_id=organization_id,
+                    hour=hour,
+                    dimension=dimension,
+                    value=value,
+                    count=delta,
+                )
+        except IntegrityError:
+            # Created concurrently by another writer.
+            rows.update(count=F("count") + delta)
+
+
+def rollup_queryset(dimension: str, organization_id=None):
+    """Rollup rows of ``dimension``, optionally for one organization."""
+    rollups = PersonStatRollup.objects.filter(dimension=dimension)
+    if organization_id:
+        rollups = rollups.filter(organization_id=organization_id)
+    return rollups
+
+
+def aggregate_rollups(dimension: str, organization_id=None) -> list[dict]:
+    """Return ``[{"value": ..., "count": ...}]`` for ``dimension`` summed over all hours."""
+    return list(
+        rollup_queryset(dimension, organization_id).values("value")
+        .annotate(count=Sum("count"))
+        .filter(count__gt=0)
+        .order_by("value")
+    )
+
+
+def aggregate_all_rollups(organization_id=None) -> dict[str, list[dict]]:
+    """Like :func:`aggregate_rollups` for every dimension at once, in one query."""
+    rollups = PersonStatRollup.objects.all()
+    if organization_id:
+        rollups = rollups.filter(organization_id=organization_id)
+    rows = (
+        rollups.values("dimension", "value")
+        .annotate(count=Sum("count"))
+        .filter(count__gt=0)
+        .order_by("dimension", "value")
+    )
+    grouped: dict[str, list[dict]] = {dimension: [] for dimension in ROLLUP_DIMENSIONS}
+    for row in rows:
+        grouped.setdefault(row["dimension"], []).append({"value": row["value"], "count": row["count"]})
+    return grouped
+
+
+def rebuild_rollups(organization_id: Optional[str] = None, apps=None) -> int:
+    """
+    Regenerate rollups from the ``Person`` table; returns the number of rows written.
+
+    Migrations pass their ``apps`` registry so the historical models are used.
+    """
+    person_model = (apps or django_apps).get_model("client", "Person")
+    rollup_model = (apps or django_apps).get_model("client", "PersonStatRollup")
+    people = person_model.objects.all()
+    rollups = rollup_model.objects.all()
+    if organization_id:
+        people = people.filter(organization_id=organization_id)
+        rollups = rollups.filter(organization_id=organization_id)
+
+    new_rows = []
+    for dimension in ROLLUP_DIMENSIONS:
+        counted = people.exclude(**{f"{dimension}__isnull": True})
+        if dimension != "age":
+            counted = counted.exclude(**{dimension: ""})
+        grouped = (
+            counted.annotate(hour=TruncHour("created_at", tzinfo=dt_timezone.utc))
+            .values("organization_id", "hour", dimension)
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+        new_rows.extend(
+            rollup_model(
+                organization_id=row["organization_id"],
+                hour=row["hour"],
+                dimension=dimension,
+                value=str(row[dimension]),
+                count=row["count"],
+            )
+            for row in grouped
+        )
+
+    with transaction.atomic():
+        rollups.delete()
+        rollup_model.objects.bulk_create(new_rows, batch_size=1000)
+    return len(new_rows)
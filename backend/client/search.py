@@ -0,0 +1,205 @@
+"""Person search by partial name or phone number, ranked and scoped to an organization.
+
+On PostgreSQL names are matched with ``pg_trgm`` word similarity (typos and
+partial words) and phones through the digits-only ``Person.phone_normalized``
+column; both are served by the GIN trigram indexes of migration 0014, exact
+phones by the ``(organization, phone_normalized)`` index.
+
+Other databases (SQLite in tests and local development) use a small in-memory
+trigram index per organization. It is rebuilt lazily whenever the
+organization's version counter from :mod:`client.stats_cache` moves, so every
+person write is visible to the next search.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, FloatField, Q, QuerySet, Value, When
+from django.db.models.functions import Greatest
+
+from .models import Person
+from .stats_cache import get_version
+from .utils import normalize_phone
+
+# Ранги совпадений по телефону и по началу имени (для запросов короче триграммы)
+PHONE_EXACT = 1.0
+PHONE_PREFIX = 0.9
+PHONE_CONTAINS = 0.6
+NAME_PREFIX = 0.5
+
+MIN_TRIGRAM_QUERY = 3  # короче — ищем только по началу имени
+MIN_PHONE_DIGITS = 3  # меньше цифр в запросе — телефон не сравниваем
+WORD_SIMILARITY_THRESHOLD = 0.6  # pg_trgm.word_similarity_threshold по умолчанию
+
+_WORD = re.compile(r"\w+")
+
+
+def search_people(
+    query: str,
+    organization_id=None,
+    limit: Optional[int] = None,
+    queryset: Optional[QuerySet] = None,
+) -> list[Person]:
+    """
+    Люди, подходящие под ``query`` (часть имени или телефона), по убыванию ранга.
+
+    У каждого объекта есть атрибут ``search_rank`` от 0 до 1. ``queryset``
+    задаёт, как загружать Person (select_related, defer и т.п.).
+    """
+    query = " ".join(query.split())
+    if not query:
+        return []
+    limit = limit or settings.PERSON_SEARCH_LIMIT
+    persons = Person.objects.all() if queryset is None else queryset
+    if organization_id:
+        persons = persons.filter(organization_id=organization_id)
+    if connections[persons.db].vendor == "postgresql":
+        return list(_trigram_search(persons, query, limit))
+    return _memory_search(persons, query, organization_id, limit)
+
+
+def filter_people(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    ``queryset`` narrowed to people matching ``query``, unranked and without a limit.
+
+    For callers that filter and order the results themselves, like the admin changelist.
+    """
+    query = " ".join(query.split())
+    if not query:
+        return queryset
+    if connections[queryset.db].vendor == "postgresql":
+        matches, _rank = _trigram_matches(query)
+        return queryset.filter(matches)
+    return queryset.filter(pk__in=list(memory_index().search(query)))
+
+
+def _phone_digits(query: str) -> str:
+    digits = normalize_phone(query)
+    return digits if len(digits) >= MIN_PHONE_DIGITS else ""
+
+
+def _trigram_matches(query: str) -> tuple[Q, Any]:
+    """Условие совпадения и выражение ранга для PostgreSQL."""
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    if len(query) < MIN_TRIGRAM_QUERY:
+        matches = Q(full_name__istartswith=query)
+        name_rank = Case(When(matches, then=Value(NAME_PREFIX)), default=Value(0.0), output_field=FloatField())
+    else:
+        matches = Q(full_name__trigram_word_similar=query) | Q(full_name__icontains=query)
+        name_rank = TrigramWordSimilarity(query, "full_name")
+
+    rank = name_rank
+    digits = _phone_digits(query)
+    if digits:
+        matches |= Q(phone_normalized__contains=digits)
+        rank = Greatest(name_rank, Case(
+            When(phone_normalized=digits, then=Value(PHONE_EXACT)),
+            When(phone_normalized__startswith=digits, then=Value(PHONE_PREFIX)),
+            When(phone_normalized__contains=digits, then=Value(PHONE_CONTAINS)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ))
+    return matches, rank
+
+
+def _trigram_search(persons: QuerySet, query: str, limit: int) -> QuerySet:
+    matches, rank = _trigram_matches(query)
+    return persons.filter(matches).annotate(search_rank=rank).order_by("-search_rank", "full_name", "id")[:limit]
+
+
+def trigrams(text: str) -> set[str]:
+    """Триграммы как в pg_trgm: слова в нижнем регистре, два пробела в начале и один в конце."""
+    result = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class MemoryIndex:
+    """Триграммный индекс имён и нормализованные телефоны одной организации."""
+
+    def __init__(self, rows):
+        self.names = {}
+        self.phones = {}
+        self.postings = defaultdict(set)
+        for pk, full_name, phone in rows:
+            if full_name:
+                self.names[pk] = full_name.lower()
+                for trigram in trigrams(full_name):
+                    self.postings[trigram].add(pk)
+            if phone:
+                self.phones[pk] = phone
+
+    def search(self, query: str) -> dict:
+        """Ранги подходящих Person: ``{pk: rank}``."""
+        ranks = {}
+        lowered = query.lower()
+        if len(query) < MIN_TRIGRAM_QUERY:
+            for pk, name in self.names.items():
+                if name.startswith(lowered):
+                    ranks[pk] = NAME_PREFIX
+        else:
+            wanted = trigrams(query)
+            shared = defaultdict(int)
+            for trigram in wanted:
+                for pk in self.postings.get(trigram, ()):
+                    shared[pk] += 1
+            for pk, count in shared.items():
+                similarity = count / len(wanted)
+                if similarity >= WORD_SIMILARITY_THRESHOLD or lowered in self.names[pk]:
+                    ranks[pk] = similarity
+
+        digits = _phone_digits(query)
+        if digits:
+            for pk, phone in self.phones.items():
+                if phone == digits:
+                    rank = PHONE_EXACT
+                elif phone.startswith(digits):
+                    rank = PHONE_PREFIX
+                elif digits in phone:
+                    rank = PHONE_CONTAINS
+                else:
+                    continue
+                ranks[pk] = max(ranks.get(pk, 0.0), rank)
+        return ranks
+
+
+_indexes: dict = {}
+_indexes_lock = threading.Lock()
+
+
+def memory_index(organization_id=None) -> MemoryIndex:
+    """In-memory index of an organization (``None`` means all), rebuilt after writes."""
+    version = get_version(organization_id)
+    key = str(organization_id) if organization_id else None
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    people = Person.objects.all()
+    if organization_id:
+        people = people.filter(organization_id=organization_id)
+    index = MemoryIndex(people.values_list("id", "full_name", "phone_normalized").iterator())
+    with _indexes_lock:
+        _indexes[key] = (version, index)
+    return index
+
+
+def _memory_search(persons: QuerySet, query: str, organization_id, limit: int) -> list[Person]:
+    index = memory_index(organization_id)
+    ranks = index.search(query)
+    best = sorted(ranks, key=lambda pk: (-ranks[pk], index.names.get(pk, ""), str(pk)))[:limit]
+    found = {person.pk: person for person in persons.filter(pk__in=best)}
+    results = []
+    for pk in best:
+        if pk in found:
+            found[pk].search_rank = ranks[pk]
+            results.append(found[pk])
+    return results
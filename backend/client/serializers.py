@@ -5,9 +5,11 @@ import json
 from typing import Any
 
 from rest_framework import serializers
+from drf_spectacular.utils import extend_schema_field
 
 from .matching import find_best_person_match
-from .models import Person, Organization, CartProduct, Cart, Product
+from .models import Person, PersonProfile, Organization, CartProduct, Cart, Product
+from .profiles import get_profile
 
 
 class PersonVectorSerializer(serializers.ModelSerializer):
@@ -148,9 +150,36 @@ class PersonUpdateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class PersonListSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """Оставляет только поля из аргумента fields (sparse fieldset), если он передан."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class PersonProfileSerializer(serializers.ModelSerializer):
+    """Сериализатор предпосчитанной статистики заказов Person (PersonProfile)."""
+
+    class Meta:
+        model = PersonProfile
+        fields = (
+            "total_visits",
+            "total_items",
+            "first_visit",
+            "last_visit",
+            "favorite_table",
+            "favorite_dishes"
+        )
+
+
+class PersonListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Сериализатор для списка Person."""
 
+    profile = serializers.SerializerMethodField()
+
     class Meta:
         model = Person
         fields = (
@@ -164,11 +193,33 @@ class PersonListSerializer(serializers.ModelSerializer):
             "body_type",
             "entry_time",
             "exit_time",
+            "profile",
             "created_at",
             "updated_at"
         )
         read_only_fields = ("id", "created_at", "updated_at")
 
+    @extend_schema_field(PersonProfileSerializer)
+    def get_profile(self, obj):
+        """Возвращает статистику заказов из PersonProfile (нули, если заказов не было)."""
+        return PersonProfileSerializer(get_profile(obj)).data
+
+
+class PersonSearchResultSerializer(PersonListSerializer):
+    """Сериализатор результата поиска Person: поля списка и ранг совпадения."""
+
+    rank = serializers.FloatField(source="search_rank", read_only=True)
+
+    class Meta(PersonListSerializer.Meta):
+        fields = PersonListSerializer.Meta.fields + ("rank",)
+
+
+class PersonSearchResponseSerializer(serializers.Serializer):
+    """Сериализатор ответа поиска Person."""
+    query = serializers.CharField()
+    count = serializers.IntegerField()
+    results = PersonSearchResultSerializer(many=True)
+
 
 # Сериализаторы для статистики
 class VisitCountDataSerializer(serializers.Serializer):
@@ -180,10 +231,55 @@ class VisitCountDataSerializer(serializers.Serializer):
 class VisitCountSerializer(serializers.Serializer):
     """Сериализатор для статистики посещений."""
     type = serializers.CharField()
+    bucket = serializers.CharField()
+    timezone = serializers.CharField()
     total_visits = serializers.IntegerField()
     data = VisitCountDataSerializer(many=True)
 
 
+class UniqueVisitorsSerializer(serializers.Serializer):
+    """Сериализатор для статистики уникальных посетителей."""
+    type = serializers.CharField()
+    bucket = serializers.CharField()
+    timezone = serializers.CharField()
+    unique_visitors = serializers.IntegerField()
+    relative_error = serializers.FloatField()
+    data = VisitCountDataSerializer(many=True)
+
+
+class TopProductSerializer(serializers.Serializer):
+    """Сериализатор для популярного продукта."""
+    product_id = serializers.UUIDField()
+    name = serializers.CharField()
+    count = serializers.IntegerField()
+    carts = serializers.IntegerField()
+
+
+class TopProductsSerializer(serializers.Serializer):
+    """Сериализатор для статистики популярных продуктов."""
+    type = serializers.CharField()
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    data = TopProductSerializer(many=True)
+
+
+class CoPurchaseSerializer(serializers.Serializer):
+    """Сериализатор для пары продуктов, заказанных вместе."""
+    product_id = serializers.UUIDField()
+    name = serializers.CharField()
+    other_product_id = serializers.UUIDField()
+    other_name = serializers.CharField()
+    carts = serializers.IntegerField()
+
+
+class CoPurchasesSerializer(serializers.Serializer):
+    """Сериализатор для статистики совместных заказов."""
+    type = serializers.CharField()
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    data = CoPurchaseSerializer(many=True)
+
+
 class BodyTypeStatsDataSerializer(serializers.Serializer):
     """Сериализатор для данных статистики типов телосложения."""
     type = serializers.CharField()
@@ -232,6 +328,32 @@ class AgeStatsSerializer(serializers.Serializer):
     data = AgeStatsDataSerializer(many=True)
 
 
+class DashboardStatsSerializer(serializers.Serializer):
+    """Сериализатор для сводной статистики дашборда."""
+    visit_count = VisitCountSerializer()
+    body_type = BodyTypeStatsSerializer()
+    gender = GenderStatsSerializer()
+    emotion = EmotionStatsSerializer()
+    age = AgeStatsSerializer()
+
+
+# Сериализаторы для присутствия
+class PresenceEntrySerializer(serializers.Serializer):
+    """Сериализатор для человека, находящегося в заведении."""
+    person_id = serializers.UUIDField()
+    entered_at = serializers.DateTimeField()
+    last_seen = serializers.DateTimeField()
+    table_number = serializers.IntegerField(allow_null=True)
+
+
+class PresenceSnapshotSerializer(serializers.Serializer):
+    """Сериализатор для снимка присутствия по организации."""
+    organization = serializers.UUIDField()
+    count = serializers.IntegerField()
+    timeout_seconds = serializers.IntegerField()
+    people = PresenceEntrySerializer(many=True)
+
+
 # Сериализаторы для CartProduct
 class CartProductSerializer(serializers.ModelSerializer):
     """Сериализатор для CartProduct."""
@@ -335,7 +457,7 @@ class PersonOrderHistorySerializer(serializers.Serializer):
     cart_id = serializers.UUIDField()
     cart_created_at = serializers.DateTimeField()
     cart_updated_at = serializers.DateTimeField()
-    table_number = serializers.IntegerField()
+    table_number = serializers.IntegerField(allow_null=True)
     products = serializers.ListField(
         child=serializers.DictField(),
         help_text="Список товаров в заказе"
@@ -349,6 +471,10 @@ class PersonOrderHistoryResponseSerializer(serializers.Serializer):
     person_id = serializers.UUIDField()
     person_name = serializers.CharField()
     total_orders = serializers.IntegerField()
+    current_page = serializers.IntegerField()
+    page_size = serializers.IntegerField()
+    total_pages = serializers.IntegerField()
+    has_next = serializers.BooleanField()
     orders = PersonOrderHistorySerializer(many=True)
 
 
@@ -417,6 +543,13 @@ class ProductSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "created_at", "updated_at")
 
 
+class ProductAutocompleteResponseSerializer(serializers.Serializer):
+    """Сериализатор ответа автодополнения продуктов."""
+    query = serializers.CharField()
+    count = serializers.IntegerField()
+    results = ProductSerializer(many=True)
+
+
 class CartProductDetailSerializer(serializers.ModelSerializer):
     """Детальный сериализатор для CartProduct с информацией о продукте."""
 
@@ -453,17 +586,21 @@ class CartDetailSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("id", "created_at", "updated_at")
 
-    def get_total_products(self, obj):
-        """Возвращает общее количество товаров в корзине."""
-        return obj.cartproduct_set.count()
+    def get_total_products(self, obj) -> int:
+        """Возвращает общее количество товаров в корзине (из аннотации или prefetch, без запроса)."""
+        total = getattr(obj, 'total_products', None)
+        if total is not None:
+            return total
+        return len(obj.cartproduct_set.all())
 
 
 class PersonDetailSerializer(serializers.ModelSerializer):
     """Детальный сериализатор для Person со всеми корзинами и товарами."""
 
-    carts = CartDetailSerializer(many=True, read_only=True)
+    carts = serializers.SerializerMethodField()
     total_carts = serializers.SerializerMethodField()
     total_products_in_carts = serializers.SerializerMethodField()
+    profile = serializers.SerializerMethodField()
 
     class Meta:
         model = Person
@@ -482,21 +619,32 @@ class PersonDetailSerializer(serializers.ModelSerializer):
             "carts",
             "total_carts",
             "total_products_in_carts",
+            "profile",
             "created_at",
             "updated_at"
         )
         read_only_fields = ("id", "created_at", "updated_at")
 
-    def get_total_carts(self, obj):
-        """Возвращает общее количество корзин у Person."""
-        return obj.carts.count()
+    @extend_schema_field(CartDetailSerializer(many=True))
+    def get_carts(self, obj):
+        """Возвращает корзины: страницу из context['carts'], если передана, иначе все."""
+        carts = self.context.get('carts')
+        if carts is None:
+            carts = obj.carts.all()
+        return CartDetailSerializer(carts, many=True).data
 
-    def get_total_products_in_carts(self, obj):
-        """Возвращает общее количество товаров во всех корзинах Person."""
-        total = 0
-        for cart in obj.carts.all():
-            total += cart.cartproduct_set.count()
-        return total
+    def get_total_carts(self, obj) -> int:
+        """Возвращает общее количество корзин у Person (из PersonProfile)."""
+        return get_profile(obj).total_visits
+
+    def get_total_products_in_carts(self, obj) -> int:
+        """Возвращает общее количество товаров во всех корзинах Person (из PersonProfile)."""
+        return get_profile(obj).total_items
+
+    @extend_schema_field(PersonProfileSerializer)
+    def get_profile(self, obj):
+        """Возвращает статистику заказов и любимые блюда/стол из PersonProfile."""
+        return PersonProfileSerializer(get_profile(obj)).data
 
 
 class PersonSummarySerializer(serializers.Serializer):
@@ -510,6 +658,15 @@ class PersonSummarySerializer(serializers.Serializer):
         child=serializers.DictField(),
         help_text="Список любимых блюд с количеством заказов"
     )
-    ai_summary = serializers.CharField(help_text="Краткая сводка от ИИ")
+    ai_summary = serializers.CharField(
+        allow_null=True,
+        help_text="Краткая сводка от ИИ; null, пока первая сводка генерируется"
+    )
+    ai_summary_stale = serializers.BooleanField(
+        help_text="Сводка построена по устаревшей истории заказов"
+    )
+    ai_summary_pending = serializers.BooleanField(
+        help_text="Новая сводка генерируется в фоне"
+    )
     last_visit = serializers.DateTimeField(allow_null=True)
     total_spent_items = serializers.IntegerField(help_text="Общее количество заказанных блюд")
@@ -0,0 +1,196 @@
+"""Signal handlers keeping derived data in sync with writes."""
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Cart, CartProduct, Organization, Person, Product
+from .profiles import add_cart, add_cart_product, refresh_product_profiles, refresh_profile
+from .rollups import ROLLUP_DIMENSIONS, apply_rollup_delta, rollup_hour, rollup_keys
+from .stats_cache import (
+    CATALOG,
+    HISTORY,
+    bump_version,
+    forget_organization_timezone,
+    forget_person_organization,
+    remember_person_organization,
+)
+
+
+@receiver(pre_save, sender=Person)
+def remember_person_rollup_state(sender, instance, **kwargs):
+    """Capture the stored demographics so post_save can apply a diff."""
+    instance._rollup_previous = None
+    if instance._state.adding:
+        return
+    instance._rollup_previous = (
+        Person.objects.filter(pk=instance.pk)
+        .values("organization_id", "created_at", *ROLLUP_DIMENSIONS)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Person)
+def update_person_rollups(sender, instance, created, **kwargs):
+    """Increment rollups for new people and move counts for changed values."""
+    current = {dimension: getattr(instance, dimension) for dimension in ROLLUP_DIMENSIONS}
+    new_keys = rollup_keys(current)
+    new_hour = rollup_hour(instance.created_at)
+    previous = getattr(instance, "_rollup_previous", None)
+
+    if created or previous is None:
+        apply_rollup_delta(instance.organization_id, new_hour, new_keys, 1)
+        return
+
+    old_keys = rollup_keys(previous)
+    old_hour = rollup_hour(previous["created_at"])
+    if previous["organization_id"] == instance.organization_id and old_hour == new_hour:
+        apply_rollup_delta(instance.organization_id, new_hour, old_keys - new_keys, -1)
+        apply_rollup_delta(instance.organization_id, new_hour, new_keys - old_keys, 1)
+    else:
+        apply_rollup_delta(previous["organization_id"], old_hour, old_keys, -1)
+        apply_rollup_delta(instance.organization_id, new_hour, new_keys, 1)
+
+
+@receiver(post_delete, sender=Person)
+def remove_person_rollups(sender, instance, **kwargs):
+    """Decrement rollups for deleted people."""
+    current = {dimension: getattr(instance, dimension) for dimension in ROLLUP_DIMENSIONS}
+    apply_rollup_delta(instance.organization_id, rollup_hour(instance.created_at), rollup_keys(current), -1)
+
+
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+def invalidate_person_statistics(sender, instance, created=False, **kwargs):
+    """Bump the statistics cache version of the person's organization(s)."""
+    bump_version(instance.organization_id)
+    if kwargs["signal"] is post_delete:
+        # Удаление меняет уже закрытые интервалы посещений
+        bump_version(instance.organization_id, HISTORY)
+        forget_person_organization(instance.pk)
+        return
+    remember_person_organization(instance.pk, instance.organization_id)
+    previous = getattr(instance, "_rollup_previous", None)
+    if created or not previous:
+        return
+    if previous["organization_id"] != instance.organization_id or previous["created_at"] != instance.created_at:
+        for organization_id in {previous["organization_id"], instance.organization_id}:
+            bump_version(organization_id)
+            bump_version(organization_id, HISTORY)
+
+
+@receiver(post_save, sender=Cart)
+@receiver(post_delete, sender=Cart)
+@receiver(post_save, sender=CartProduct)
+@receiver(post_delete, sender=CartProduct)
+def invalidate_cart_statistics(sender, instance, **kwargs):
+    """Bump the statistics cache version when orders change."""
+    bump_version(instance.organization_id)
+
+
+@receiver(pre_save, sender=Product)
+def remember_product_state(sender, instance, **kwargs):
+    """Capture the stored name and organization so post_save can tell what changed."""
+    instance._product_previous = None
+    if not instance._state.adding:
+        instance._product_previous = (
+            Product.objects.filter(pk=instance.pk).values("name", "organization_id").first()
+        )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_statistics(sender, instance, **kwargs):
+    """Product names appear in product statistics, in people's carts and in the autocomplete catalog."""
+    organizations = {instance.organization_id}
+    previous = getattr(instance, "_product_previous", None)
+    if kwargs["signal"] is post_save and previous:
+        # Перенос в другую организацию убирает продукт из каталога прежней
+        organizations.add(previous["organization_id"])
+    for organization_id in organizations:
+        bump_version(organization_id)
+        bump_version(organization_id, CATALOG)
+
+
+@receiver(post_save, sender=Product)
+def update_profiles_on_product_rename(sender, instance, created, **kwargs):
+    """Profiles count dishes by name, so a rename recomputes everyone who ordered the product."""
+    previous = getattr(instance, "_product_previous", None)
+    if not created and previous is not None and previous["name"] != instance.name:
+        refresh_product_profiles(instance.pk)
+
+
+@receiver(post_save, sender=Organization)
+def invalidate_organization_statistics(sender, instance, **kwargs):
+    """Timezone changes move bucket boundaries, so drop every cached result."""
+    forget_organization_timezone(instance.pk)
+    bump_version(instance.pk)
+    bump_version(instance.pk, HISTORY)
+
+
+def _cascaded_from(origin, *models) -> bool:
+    """Whether a delete was started on one of ``models`` (instance or queryset)."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+@receiver(pre_save, sender=Cart)
+def remember_cart_profile_state(sender, instance, **kwargs):
+    """Capture the stored owner and table so post_save can tell what moved."""
+    instance._profile_previous = None
+    if not instance._state.adding:
+        instance._profile_previous = (
+            Cart.objects.filter(pk=instance.pk).values("person_id", "table_number", "created_at").first()
+        )
+
+
+@receiver(post_save, sender=Cart)
+def update_profile_on_cart_save(sender, instance, created, **kwargs):
+    """Count new carts incrementally; recompute profiles when a cart is edited."""
+    previous = getattr(instance, "_profile_previous", None)
+    if created or previous is None:
+        add_cart(instance)
+        return
+    if (previous["person_id"], previous["table_number"], previous["created_at"]) != (
+        instance.person_id, instance.table_number, instance.created_at
+    ):
+        for person_id in {previous["person_id"], instance.person_id}:
+            refresh_profile(person_id)
+
+
+@receiver(post_delete, sender=Cart)
+def update_profile_on_cart_delete(sender, instance, origin=None, **kwargs):
+    """Recompute the owner's profile unless the owner itself is being deleted."""
+    if _cascaded_from(origin, Person, Organization):
+        return
+    refresh_profile(instance.person_id)
+
+
+@receiver(pre_save, sender=CartProduct)
+def remember_cart_product_profile_state(sender, instance, **kwargs):
+    """Capture the stored cart owner and product so post_save can tell what moved."""
+    instance._profile_previous = None
+    if not instance._state.adding:
+        instance._profile_previous = (
+            CartProduct.objects.filter(pk=instance.pk).values("cart__person_id", "product_id").first()
+        )
+
+
+@receiver(post_save, sender=CartProduct)
+def update_profile_on_cart_product_save(sender, instance, created, **kwargs):
+    """Count new dishes incrementally; recompute profiles when a row is moved."""
+    previous = getattr(instance, "_profile_previous", None)
+    person_id = instance.cart.person_id
+    if created or previous is None:
+        add_cart_product(person_id, instance.product.name, 1)
+        return
+    if (previous["cart__person_id"], previous["product_id"]) != (person_id, instance.product_id):
+        for affected in {previous["cart__person_id"], person_id}:
+            refresh_profile(affected)
+
+
+@receiver(post_delete, sender=CartProduct)
+def update_profile_on_cart_product_delete(sender, instance, origin=None, **kwargs):
+    """Remove a dish from the profile; cart and person deletes recompute or drop it instead."""
+    if _cascaded_from(origin, Cart, Person, Organization):
+        return
+    add_cart_product(instance.cart.person_id, instance.product.name, -1)
@@ -0,0 +1,70 @@
+"""Hourly HyperLogLog sketches of distinct visitors per organization."""
+from __future__ import annotations
+
+from datetime import datetime, tzinfo as TzInfo
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .hll import HyperLogLog
+from .models import VisitorSketch
+from .rollups import rollup_hour
+from .stats_cache import bump_version
+from .timeseries import Bucket, bucket_starts, floor_to_bucket
+
+
+def record_visitor(organization_id, person_id, seen_at: Optional[datetime] = None) -> None:
+    """Add a person to the sketch of the hour they were seen in."""
+    hour = rollup_hour(seen_at or timezone.now())
+    sketches = VisitorSketch.objects.filter(organization_id=organization_id, hour=hour)
+
+    with transaction.atomic():
+        sketch = sketches.select_for_update().first()
+        if sketch is None:
+            hll = HyperLogLog()
+            hll.add(person_id)
+            try:
+                with transaction.atomic():
+                    sketches.create(organization_id=organization_id, hour=hour, registers=hll.to_bytes())
+                bump_version(organization_id)
+                return
+            except IntegrityError:
+                # Created concurrently by another writer.
+                sketch = sketches.select_for_update().get()
+
+        hll = HyperLogLog.from_bytes(sketch.registers)
+        if hll.add(person_id):
+            sketch.registers = hll.to_bytes()
+            sketch.save(update_fields=["registers", "updated_at"])
+            bump_version(organization_id)
+
+
+def unique_visitors(
+    start: datetime,
+    end: datetime,
+    bucket: Bucket,
+    tz: Optional[TzInfo] = None,
+    organization_id=None,
+) -> tuple[HyperLogLog, list[tuple[datetime, int]]]:
+    """
+    Merge hourly sketches in ``[start, end)``.
+
+    Returns the sketch of the whole window and the estimated distinct visitors per
+    bucket. Buckets are built from whole UTC hours, so ``bucket`` must be at least an hour.
+    """
+    sketches = VisitorSketch.objects.filter(hour__gte=start, hour__lt=end)
+    if organization_id:
+        sketches = sketches.filter(organization_id=organization_id)
+
+    per_bucket: dict[datetime, HyperLogLog] = {}
+    for hour, registers in sketches.values_list("hour", "registers"):
+        moment = floor_to_bucket(hour, bucket, tz)
+        per_bucket.setdefault(moment, HyperLogLog()).merge(HyperLogLog.from_bytes(registers))
+
+    total = HyperLogLog.union(per_bucket.values())
+    series = [
+        (moment, per_bucket[moment].count() if moment in per_bucket else 0)
+        for moment in bucket_starts(start, end, bucket, tz)
+    ]
+    return total, series
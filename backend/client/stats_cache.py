@@ -0,0 +1,198 @@
+"""Cache for statistics responses, invalidated by write-driven version counters.
+
+Every organization has a version number stored in the Django cache; person and
+cart writes bump it (see ``client.signals``). Cached results are keyed by
+endpoint, organization, request range and the current version, so a write makes
+the old entries unreachable instead of deleting them. Entries also expire after
+``STATISTICS_CACHE_TIMEOUT`` seconds, which bounds staleness for results that
+depend on the clock (e.g. "last 6 hours") rather than on writes.
+
+Closed time buckets of visit counts are cached without expiry under a separate
+*history* version. New people always land in the open bucket, so only writes
+that touch the past (deletes, moving a person between organizations) bump it.
+A bucket is only cached once it ended ``STATS_CLOSED_BUCKET_GRACE`` seconds
+ago: ``created_at`` is taken before the row commits, so a person saved just
+before a boundary can become visible just after it.
+
+All of this lives in the default Django cache, which must be shared by every
+worker process (``REDIS_URL``, see ``config.settings``); with a process-local
+cache a write only invalidates the process that handled it. The ``client.W001``
+deploy check warns about that. A counter that is evicted anyway restarts from
+the current time in milliseconds, which is above any value it reached by
+increments, so it never repeats a version that keys an old entry.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta, tzinfo as TzInfo
+from typing import Any, Callable, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from core import metrics
+
+from .models import Organization, Person
+from .timeseries import Bucket, bucket_starts, count_by_bucket, floor_to_bucket
+
+ALL_ORGANIZATIONS = "all"
+
+VERSION = "version"
+HISTORY = "history"
+CATALOG = "catalog"  # only product writes; read by client.catalog
+
+
+def _version_key(organization_id, kind: str = VERSION) -> str:
+    return f"statistics:{kind}:{organization_id or ALL_ORGANIZATIONS}"
+
+
+def get_version(organization_id=None, kind: str = VERSION) -> int:
+    """Current version for an organization (``None`` means all organizations)."""
+    key = _version_key(organization_id, kind)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so an evicted counter never reuses an old version
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(organization_id, kind: str = VERSION) -> None:
+    """Invalidate cached statistics of an organization and the all-organizations view."""
+    for key in {_version_key(organization_id, kind), _version_key(None, kind)}:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), timeout=None)
+
+
+def _timezone_key(organization_id) -> str:
+    return f"statistics:timezone:{organization_id}"
+
+
+def organization_timezone(organization_id=None) -> TzInfo:
+    """Timezone used to bucket an organization's statistics (cached; default ``TIME_ZONE``)."""
+    if not organization_id:
+        return timezone.get_default_timezone()
+    name = cache.get(_timezone_key(organization_id))
+    if name is None:
+        name = (
+            Organization.objects.filter(pk=organization_id).values_list("timezone", flat=True).first()
+            or settings.TIME_ZONE
+        )
+        cache.set(_timezone_key(organization_id), name, timeout=None)
+    return ZoneInfo(name)
+
+
+def forget_organization_timezone(organization_id) -> None:
+    """Drop the cached timezone after the organization changes."""
+    cache.delete(_timezone_key(organization_id))
+
+
+def _person_organization_key(person_id) -> str:
+    return f"statistics:person-organization:{person_id}"
+
+
+def person_organization(person_id):
+    """Organization of a person (cached; ``None`` when the person does not exist)."""
+    key = _person_organization_key(person_id)
+    organization_id = cache.get(key)
+    if organization_id is None:
+        organization_id = Person.objects.filter(pk=person_id).values_list("organization_id", flat=True).first()
+        if organization_id is not None:
+            cache.set(key, organization_id, timeout=None)
+    return organization_id
+
+
+def remember_person_organization(person_id, organization_id) -> None:
+    """Store a person's organization after it is saved."""
+    cache.set(_person_organization_key(person_id), organization_id, timeout=None)
+
+
+def forget_person_organization(person_id) -> None:
+    """Drop the cached organization of a deleted person."""
+    cache.delete(_person_organization_key(person_id))
+
+
+def cache_key(endpoint: str, organization_id=None, params: Iterable[Any] = ()) -> str:
+    """Key for one endpoint/organization/range at the organization's current version."""
+    parts = ":".join(str(part) for part in params)
+    return (
+        f"statistics:{endpoint}:{organization_id or ALL_ORGANIZATIONS}:{parts}:"
+        f"v{get_version(organization_id)}"
+    )
+
+
+def cached_stats_entry(
+    endpoint: str,
+    compute: Callable[[], Any],
+    organization_id=None,
+    params: Iterable[Any] = (),
+    timeout: Optional[int] = None,
+) -> tuple[Any, str]:
+    """
+    Return ``(result, etag)`` for the key, computing and storing both on a miss.
+
+    The ETag hashes the result itself, so it stays valid across recomputations
+    that produce the same numbers.
+    """
+    key = cache_key(endpoint, organization_id, params)
+    entry = cache.get(key)
+    if entry is not None:
+        metrics.increment(f"statistics_cache.{endpoint}.hit")
+        return entry
+
+    metrics.increment(f"statistics_cache.{endpoint}.miss")
+    result = compute()
+    digest = hashlib.sha1(json.dumps(result, sort_keys=True, default=str).encode()).hexdigest()
+    entry = (result, f'"{digest}"')
+    cache.set(key, entry, settings.STATISTICS_CACHE_TIMEOUT if timeout is None else timeout)
+    return entry
+
+
+def cached_count_by_bucket(
+    queryset: QuerySet,
+    field: str,
+    start: datetime,
+    end: datetime,
+    bucket: Bucket,
+    tz: TzInfo,
+    organization_id=None,
+    now: Optional[datetime] = None,
+) -> list[tuple[datetime, int]]:
+    """
+    :func:`~client.timeseries.count_by_bucket` that keeps closed buckets in the cache.
+
+    ``start`` and ``end`` must be aligned to ``bucket`` in ``tz``. Buckets that closed
+    more than ``STATS_CLOSED_BUCKET_GRACE`` seconds ago are stored forever; the query
+    covers the first uncached bucket through ``end``, so a warm cache reads only the
+    open bucket (and one just closed) and the result still takes one query.
+    """
+    settled = (now or timezone.now()) - timedelta(seconds=settings.STATS_CLOSED_BUCKET_GRACE)
+    open_start = floor_to_bucket(settled, bucket, tz)
+    starts = bucket_starts(start, end, bucket, tz)
+    prefix = (
+        f"statistics:buckets:{organization_id or ALL_ORGANIZATIONS}:{tz}:{bucket.name}:"
+        f"h{get_version(organization_id, HISTORY)}"
+    )
+    keys = {moment: f"{prefix}:{moment.isoformat()}" for moment in starts if moment < open_start}
+    cached = cache.get_many(list(keys.values())) if keys else {}
+    counts = {moment: cached[key] for moment, key in keys.items() if key in cached}
+    metrics.increment("statistics_cache.buckets.hit", len(counts))
+
+    missing = [moment for moment in starts if moment not in counts]
+    if missing:
+        metrics.increment("statistics_cache.buckets.miss", len(missing))
+        rows = count_by_bucket(queryset, field, missing[0], end, bucket, tz)
+        counts.update(rows)
+        cache.set_many(
+            {keys[moment]: count for moment, count in rows if moment in keys and keys[moment] not in cached},
+            timeout=None,
+        )
+
+    return [(moment, counts[moment]) for moment in starts]
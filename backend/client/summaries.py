@@ -0,0 +1,260 @@
+"""Persisted AI summaries of a person's order history.
+
+A summary is stored with the fingerprint (SHA-256) of the data it was generated
+from and is only regenerated when that fingerprint changes. Generation runs in
+a small thread pool: the request returns the stored summary at once, flagged
+``stale`` when it no longer matches the history and ``pending`` while a new one
+is being generated. A cache lock keeps concurrent requests from generating the
+same summary twice. With ``AI_SUMMARY_INLINE`` the job runs in the request
+thread instead, which is what tests use.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Prefetch
+
+from .llm import get_llm_client
+from .models import Cart, CartProduct, PersonSummary
+from .profiles import get_profile
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = (
+    "You are a restaurant assistant that analyzes customer data "
+    "and provides insights for better service."
+)
+UNAVAILABLE_MESSAGE = "AI analysis unavailable: OPENAI_API_KEY not configured"
+CHARS_PER_TOKEN = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return _tokens_for_length(len(text))
+
+
+def _tokens_for_length(length: int) -> int:
+    return length // CHARS_PER_TOKEN + 1
+
+
+def history_digest(person) -> dict:
+    """
+    Order statistics of the person plus their most recent orders.
+
+    Totals and favorites are read from the person's :class:`PersonProfile` and
+    only the last ``AI_SUMMARY_PROMPT_ORDERS`` carts are loaded, so the cost does
+    not grow with the history. The same digest feeds the summary response and
+    the prompt.
+    """
+    profile = get_profile(person)
+    recent_carts = (
+        Cart.objects.filter(person_id=person.pk)
+        .order_by("-created_at", "-id")
+        .prefetch_related(Prefetch(
+            "cartproduct_set",
+            queryset=CartProduct.objects.select_related("product").order_by("created_at"),
+        ))[:settings.AI_SUMMARY_PROMPT_ORDERS]
+    )
+
+    cadence = None
+    if profile.total_visits > 1:
+        cadence = (profile.last_visit - profile.first_visit).total_seconds() / 86400 / (profile.total_visits - 1)
+    return {
+        "total_visits": profile.total_visits,
+        "total_items": profile.total_items,
+        "first_visit": profile.first_visit,
+        "last_visit": profile.last_visit,
+        "visit_cadence_days": cadence,
+        "favorite_table": profile.favorite_table,
+        "favorite_dishes": profile.favorite_dishes,
+        "recent_orders": [
+            {
+                "cart_id": str(cart.id),
+                "created_at": cart.created_at,
+                "table_number": cart.table_number,
+                "products": [cart_product.product.name for cart_product in cart.cartproduct_set.all()],
+            }
+            for cart in recent_carts
+        ],
+    }
+
+
+def summary_fingerprint(person, digest: dict) -> str:
+    """Hash of everything the prompt is built from."""
+    payload = {
+        "person": [person.full_name, person.age, person.gender, person.emotion, person.body_type],
+        "digest": digest,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _date(value) -> str:
+    return f"{value:%Y-%m-%d}" if value else "Never"
+
+
+def _order_line(order: dict) -> str:
+    products = ", ".join(
+        name if count == 1 else f"{name} x{count}"
+        for name, count in Counter(order["products"]).items()
+    )
+    table = f"table {order['table_number']}" if order["table_number"] else "no table"
+    return f"- {order['created_at']:%Y-%m-%d %H:%M}, {table}: {products or 'nothing ordered'}"
+
+
+def build_summary_prompt(person, digest: dict, token_budget: Optional[int] = None) -> str:
+    """
+    Prompt asking for a short English summary of the guest's preferences.
+
+    Built from the aggregates in ``digest`` and as many of its recent orders
+    (newest first) as fit in ``token_budget`` (``AI_SUMMARY_PROMPT_TOKEN_BUDGET``
+    by default), so its size is bounded however long the history is.
+    """
+    if token_budget is None:
+        token_budget = settings.AI_SUMMARY_PROMPT_TOKEN_BUDGET
+    dishes = ", ".join(f"{item['dish']} ({item['count']})" for item in digest["favorite_dishes"])
+    cadence = digest["visit_cadence_days"]
+    head = "\n".join([
+        "Analyze restaurant customer data and create a brief personalized summary.",
+        "",
+        f"Customer: {person.full_name or 'Unknown'}",
+        f"Age: {person.age or 'Not specified'}",
+        f"Gender: {person.gender or 'Not specified'}",
+        f"Emotion: {person.emotion or 'Not specified'}",
+        f"Body Type: {person.body_type or 'Not specified'}",
+        "",
+        "Visit Statistics:",
+        f"- Total visits: {digest['total_visits']}",
+        f"- First visit: {_date(digest['first_visit'])}",
+        f"- Last visit: {_date(digest['last_visit'])}",
+        f"- Average days between visits: {f'{cadence:.1f}' if cadence is not None else 'Not determined'}",
+        f"- Favorite table: {digest['favorite_table'] or 'Not determined'}",
+        f"- Favorite dishes: {dishes or 'Not determined'}",
+        f"- Total ordered items: {digest['total_items']}",
+    ])
+    tail = "\n".join([
+        "Create a brief (2-3 sentences) personalized summary in English",
+        "that will help restaurant staff better serve this customer.",
+        "Focus on their dining patterns, preferences, and behavioral insights.",
+    ])
+
+    def orders_title(shown: int) -> str:
+        return f"Most recent orders, newest first ({shown} of {digest['total_visits']}):"
+
+    # Бюджет считается по длине всего промпта, включая разделители секций
+    used = len(head) + len(tail) + len(orders_title(len(digest["recent_orders"]))) + 4
+    lines = []
+    for order in digest["recent_orders"]:
+        line = _order_line(order)
+        used += len(line) + 1
+        if _tokens_for_length(used) > token_budget:
+            break
+        lines.append(line)
+
+    sections = [head]
+    if lines:
+        sections.append("\n".join([orders_title(len(lines)), *lines]))
+    sections.append(tail)
+    return "\n\n".join(sections)
+
+
+def _lock_key(person_id) -> str:
+    return f"person-summary:lock:{person_id}"
+
+
+def _error_key(person_id) -> str:
+    return f"person-summary:error:{person_id}"
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.AI_SUMMARY_WORKERS,
+                thread_name_prefix="person-summary",
+            )
+        return _executor
+
+
+def generate_summary(client, person, digest: dict, fingerprint: str) -> PersonSummary:
+    """Ask the LLM for a summary and store it under ``fingerprint``."""
+    text = client.complete(SYSTEM_PROMPT, build_summary_prompt(person, digest))
+    summary, _ = PersonSummary.objects.update_or_create(
+        person_id=person.pk,
+        defaults={"text": text, "fingerprint": fingerprint},
+    )
+    return summary
+
+
+def _run_job(client, person, digest: dict, fingerprint: str, inline: bool) -> None:
+    if not inline:
+        close_old_connections()
+    try:
+        generate_summary(client, person, digest, fingerprint)
+    except Exception as exc:
+        logger.exception("AI summary generation failed for person %s", person.pk)
+        # Ошибка запоминается на AI_SUMMARY_RETRY_DELAY, чтобы не повторять запрос к API на каждый GET
+        cache.set(_error_key(person.pk), f"Error generating AI summary: {exc}", settings.AI_SUMMARY_RETRY_DELAY)
+    finally:
+        cache.delete(_lock_key(person.pk))
+        if not inline:
+            close_old_connections()
+
+
+def schedule_summary(client, person, digest: dict, fingerprint: str) -> bool:
+    """
+    Start generating a summary unless one is already in progress.
+
+    Returns ``True`` while generation is pending; in inline mode the job has
+    finished by the time this returns ``False``.
+    """
+    if not cache.add(_lock_key(person.pk), fingerprint, settings.AI_SUMMARY_LOCK_TIMEOUT):
+        return True
+    if settings.AI_SUMMARY_INLINE:
+        _run_job(client, person, digest, fingerprint, inline=True)
+        return False
+    _get_executor().submit(_run_job, client, person, digest, fingerprint, False)
+    return True
+
+
+def person_summary(person, digest: dict) -> dict:
+    """
+    Stored summary of ``person`` with ``stale`` and ``pending`` flags.
+
+    ``digest`` comes from :func:`history_digest`. Schedules regeneration when
+    the stored summary is missing or was built from a different digest. ``ai_summary`` is ``None`` until the first
+    summary is ready.
+    """
+    fingerprint = summary_fingerprint(person, digest)
+    summary = PersonSummary.objects.filter(person_id=person.pk).first()
+    if summary is not None and summary.fingerprint == fingerprint:
+        return {"ai_summary": summary.text, "stale": False, "pending": False}
+
+    client = get_llm_client()
+    if client is None:
+        text = summary.text if summary is not None else UNAVAILABLE_MESSAGE
+        return {"ai_summary": text, "stale": summary is not None, "pending": False}
+
+    error = cache.get(_error_key(person.pk))
+    pending = False
+    if error is None:
+        pending = schedule_summary(client, person, digest, fingerprint)
+        if not pending:
+            summary = PersonSummary.objects.filter(person_id=person.pk).first()
+            error = cache.get(_error_key(person.pk))
+
+    if summary is not None:
+        return {"ai_summary": summary.text, "stale": summary.fingerprint != fingerprint, "pending": pending}
+    return {"ai_summary": None if pending else error, "stale": True, "pending": pending}
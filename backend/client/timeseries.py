@@ -0,0 +1,111 @@
+"""Bucketed time-series counts computed with a single aggregated query."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, tzinfo as TzInfo
+from typing import Optional
+
+from django.db.models import Count, IntegerField, QuerySet, Value
+from django.db.models.functions import ExtractMinute, Trunc, TruncHour
+from django.utils import timezone
+
+
+@dataclass(frozen=True)
+class Bucket:
+    name: str
+    step: timedelta
+    label_format: str
+    trunc_kind: str
+
+
+BUCKETS = {
+    "15m": Bucket("15m", timedelta(minutes=15), "%Y-%m-%d %H:%M", "hour"),
+    "hour": Bucket("hour", timedelta(hours=1), "%Y-%m-%d %H:00", "hour"),
+    "day": Bucket("day", timedelta(days=1), "%Y-%m-%d", "day"),
+    "week": Bucket("week", timedelta(weeks=1), "%Y-%m-%d", "week"),
+}
+
+# Presets for the legacy ``type`` parameter: (bucket, number of buckets).
+PRESETS = {
+    "last_6_hours": ("hour", 6),
+    "day": ("hour", 24),
+    "week": ("day", 7),
+    "month": ("day", 30),
+}
+
+MAX_BUCKETS = 2000
+
+
+def floor_to_bucket(moment: datetime, bucket: Bucket, tz: Optional[TzInfo] = None) -> datetime:
+    """Align ``moment`` to the start of its bucket in ``tz`` (weeks start on Monday)."""
+    local = timezone.localtime(moment, tz or timezone.get_current_timezone())
+    if bucket.name == "15m":
+        return local.replace(minute=local.minute - local.minute % 15, second=0, microsecond=0)
+    if bucket.name == "hour":
+        return local.replace(minute=0, second=0, microsecond=0)
+    local = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket.name == "week":
+        local -= timedelta(days=local.weekday())
+    return local
+
+
+def preset_range(preset: str, now: Optional[datetime] = None, tz: Optional[TzInfo] = None) -> tuple[Bucket, datetime, datetime]:
+    """Return ``(bucket, start, end)`` for the last N buckets including the current one."""
+    bucket_name, count = PRESETS[preset]
+    bucket = BUCKETS[bucket_name]
+    end = floor_to_bucket(now or timezone.now(), bucket, tz) + bucket.step
+    return bucket, end - bucket.step * count, end
+
+
+def align_range(start: datetime, end: datetime, bucket: Bucket, tz: Optional[TzInfo] = None) -> tuple[datetime, datetime]:
+    """Widen ``[start, end)`` to whole buckets in ``tz``."""
+    aligned_start = floor_to_bucket(start, bucket, tz)
+    aligned_end = floor_to_bucket(end, bucket, tz)
+    if aligned_end < end:
+        aligned_end = floor_to_bucket(aligned_end + bucket.step, bucket, tz)
+    return aligned_start, aligned_end
+
+
+def bucket_starts(start: datetime, end: datetime, bucket: Bucket, tz: Optional[TzInfo] = None) -> list[datetime]:
+    """Bucket start times covering ``[start, end)``."""
+    starts = []
+    current = floor_to_bucket(start, bucket, tz)
+    while current < end:
+        starts.append(current)
+        current = floor_to_bucket(current + bucket.step, bucket, tz)
+    return starts
+
+
+def count_by_bucket(
+    queryset: QuerySet,
+    field: str,
+    start: datetime,
+    end: datetime,
+    bucket: Bucket,
+    tz: Optional[TzInfo] = None,
+) -> list[tuple[datetime, int]]:
+    """
+    Count rows of ``queryset`` per bucket of ``field`` in ``[start, end)``.
+
+    Runs one ``GROUP BY`` query and fills empty buckets with zero in Python.
+    """
+    tz = tz or timezone.get_current_timezone()
+    rows = queryset.filter(**{f"{field}__gte": start, f"{field}__lt": end}).order_by()
+
+    counts: dict[datetime, int] = {}
+    if bucket.name == "15m":
+        rows = rows.annotate(
+            hour=TruncHour(field, tzinfo=tz),
+            quarter=ExtractMinute(field, tzinfo=tz) / Value(15, output_field=IntegerField()),
+        ).values("hour", "quarter").annotate(count=Count("pk"))
+        for row in rows:
+            moment = row["hour"] + timedelta(minutes=15 * int(row["quarter"]))
+            counts[moment] = counts.get(moment, 0) + row["count"]
+    else:
+        rows = rows.annotate(
+            bucket=Trunc(field, bucket.trunc_kind, tzinfo=tz),
+        ).values("bucket").annotate(count=Count("pk"))
+        for row in rows:
+            counts[row["bucket"]] = counts.get(row["bucket"], 0) + row["count"]
+
+    return [(moment, counts.get(moment, 0)) for moment in bucket_starts(start, end, bucket, tz)]
@@ -4,6 +4,7 @@ from .views import (
     PersonVectorView,
     PersonUpdateView,
     PersonListView,
+    PersonSearchView,
     PersonDetailView,
     PersonSummaryView,
     PersonOrderHistoryView,
@@ -11,11 +12,18 @@ from .views import (
     CartProductCreateView,
     BulkCartProductCreateView,
     ProductListView,
+    ProductAutocompleteView,
+    PresenceSnapshotView,
     VisitCountStatsView,
+    UniqueVisitorsStatsView,
     BodyTypeStatsView,
     GenderStatsView,
     EmotionStatsView,
     AgeStatsView,
+    DashboardStatsView,
+    TopProductsStatsView,
+    CoPurchaseStatsView,
+    ExportView,
 )
 
 
@@ -23,6 +31,7 @@ urlpatterns = [
     # Person endpoints
     path("person/", PersonVectorView.as_view(), name="person-vector"),
     path("persons/list/", PersonListView.as_view(), name="person-list"),
+    path("persons/search/", PersonSearchView.as_view(), name="person-search"),
     path("person/<uuid:person_id>/", PersonUpdateView.as_view(), name="person-update"),
     path("person/<uuid:person_id>/detail/", PersonDetailView.as_view(), name="person-detail"),
     path("person/<uuid:person_id>/summary/", PersonSummaryView.as_view(), name="person-summary"),
@@ -35,11 +44,22 @@ urlpatterns = [
 
     # Product endpoints
     path("products/", ProductListView.as_view(), name="product-list"),
+    path("products/autocomplete/", ProductAutocompleteView.as_view(), name="product-autocomplete"),
+
+    # Presence endpoints
+    path("presence/", PresenceSnapshotView.as_view(), name="presence-snapshot"),
+
+    # Export endpoints
+    path("exports/<str:dataset>/", ExportView.as_view(), name="export"),
 
     # Statistics endpoints
     path("statistics/visit-count/", VisitCountStatsView.as_view(), name="visit-count-stats"),
+    path("statistics/unique-visitors/", UniqueVisitorsStatsView.as_view(), name="unique-visitors-stats"),
     path("statistics/body-type/", BodyTypeStatsView.as_view(), name="body-type-stats"),
     path("statistics/gender/", GenderStatsView.as_view(), name="gender-stats"),
     path("statistics/emotion/", EmotionStatsView.as_view(), name="emotion-stats"),
     path("statistics/age/", AgeStatsView.as_view(), name="age-stats"),
+    path("statistics/dashboard/", DashboardStatsView.as_view(), name="dashboard-stats"),
+    path("statistics/top-products/", TopProductsStatsView.as_view(), name="top-products-stats"),
+    path("statistics/co-purchases/", CoPurchaseStatsView.as_view(), name="co-purchase-stats"),
 ]
@@ -6,6 +6,7 @@ from .person_views import (
     PersonVectorView,
     PersonUpdateView,
     PersonListView,
+    PersonSearchView,
     PersonDetailView,
     PersonSummaryView,
     PersonOrderHistoryView,
@@ -17,13 +18,24 @@ from .cart_views import (
 )
 from .product_views import (
     ProductListView,
+    ProductAutocompleteView,
+)
+from .presence_views import (
+    PresenceSnapshotView,
+)
+from .export_views import (
+    ExportView,
 )
 from .statistics_views import (
     VisitCountStatsView,
+    UniqueVisitorsStatsView,
     BodyTypeStatsView,
     GenderStatsView,
     EmotionStatsView,
     AgeStatsView,
+    DashboardStatsView,
+    TopProductsStatsView,
+    CoPurchaseStatsView,
 )
 
 __all__ = [
@@ -31,6 +43,7 @@ __all__ = [
     'PersonVectorView',
     'PersonUpdateView',
     'PersonListView',
+    'PersonSearchView',
     'PersonDetailView',
     'PersonSummaryView',
     'PersonOrderHistoryView',
@@ -40,10 +53,19 @@ __all__ = [
     'BulkCartProductCreateView',
     # Product views
     'ProductListView',
+    'ProductAutocompleteView',
+    # Presence views
+    'PresenceSnapshotView',
+    # Export views
+    'ExportView',
     # Statistics views
     'VisitCountStatsView',
+    'UniqueVisitorsStatsView',
     'BodyTypeStatsView',
     'GenderStatsView',
     'EmotionStatsView',
     'AgeStatsView',
+    'DashboardStatsView',
+    'TopProductsStatsView',
+    'CoPurchaseStatsView',
 ]
@@ -17,6 +17,7 @@ from ..serializers import (
     CartProductSerializer,
     BulkCartProductCreateSerializer,
 )
+from ..ingestion import record_detection
 
 
 @extend_schema(
@@ -40,6 +41,7 @@ class CartCreateView(APIView):
         if serializer.is_valid():
             try:
                 cart = serializer.save()
+                record_detection(cart.person, table_number=cart.table_number)
                 response_serializer = CartSerializer(cart)
                 return Response(response_serializer.data, status=status.HTTP_201_CREATED)
             except Exception as e:
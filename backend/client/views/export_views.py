@@ -0,0 +1,89 @@
+"""
+Export-related views.
+"""
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
+from django.http import StreamingHttpResponse
+
+from ..exports import EXPORT_DATASETS, stream_csv
+from .statistics_views import _parse_datetime, _parse_organization
+
+
+@extend_schema(
+    tags=['Export'],
+    summary='Stream a CSV export',
+    description=(
+        'Потоково отдает CSV с людьми (people), корзинами (carts) или позициями корзин (cart_products). '
+        'Строки читаются курсором порциями по EXPORT_CHUNK_SIZE, память не зависит от объема выгрузки.'
+    ),
+    parameters=[
+        OpenApiParameter(
+            name='dataset',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.PATH,
+            description='Набор данных: people, carts, cart_products'
+        ),
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='start',
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description='Начало диапазона по created_at (ISO 8601, включительно)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='end',
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description='Конец диапазона по created_at (ISO 8601, не включительно)',
+            required=False
+        ),
+    ],
+    responses={
+        (200, 'text/csv'): OpenApiTypes.STR,
+        400: {'description': 'Неверные параметры'},
+        404: {'description': 'Неизвестный набор данных'}
+    }
+)
+class ExportView(APIView):
+    """GET API для потоковой выгрузки данных в CSV."""
+
+    def get(self, request, dataset, *args, **kwargs):
+        """Возвращает StreamingHttpResponse с CSV."""
+        if dataset not in EXPORT_DATASETS:
+            return Response(
+                {"error": f"Неизвестный набор данных. Доступные: {', '.join(EXPORT_DATASETS)}"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        organization_id, error = _parse_organization(request)
+        if error:
+            return error
+
+        bounds = {}
+        for name in ('start', 'end'):
+            value = request.GET.get(name)
+            if value:
+                bounds[name] = _parse_datetime(value)
+                if bounds[name] is None:
+                    return Response(
+                        {"error": f"Параметр '{name}' должен быть датой ISO 8601"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+
+        response = StreamingHttpResponse(
+            stream_csv(request, dataset, organization_id, bounds.get('start'), bounds.get('end')),
+            content_type='text/csv'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{dataset}.csv"'
+        return response
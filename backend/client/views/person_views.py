@@ -2,25 +2,58 @@
 Person-related views.
 """
 
+import uuid
+from functools import partial
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
+from django.conf import settings
 from django.core.paginator import Paginator
-from collections import Counter
+from django.db.models import Count, Prefetch
 
 from ..models import Person, CartProduct, Cart
 from ..serializers import (
     PersonVectorSerializer,
     PersonUpdateSerializer,
     PersonListSerializer,
+    PersonSearchResponseSerializer,
+    PersonSearchResultSerializer,
     PersonDetailSerializer,
     PersonSummarySerializer,
+    PersonProfileSerializer,
     PersonOrderHistoryResponseSerializer,
 )
-from ..utils import _generate_ai_summary
+from ..conditional import conditional, request_etag
 from ..events import notify_person_joined
+from ..ingestion import record_detection, record_exit
+from ..pagination import cursor_paginated_response
+from ..search import search_people
+from ..stats_cache import get_version, person_organization
+from ..summaries import history_digest, person_summary
+
+# Не нужны при чтении Person с профилем: эмбеддинг и счётчики PersonProfile по столам и блюдам
+PERSON_DEFERRED_FIELDS = ('vector', 'profile__table_counts', 'profile__dish_counts')
+
+
+def _person_list_etag(request, *args, **kwargs):
+    """ETag списка: версия данных организации (или всех) и параметры запроса."""
+    organization_id = request.GET.get('organization')
+    try:
+        organization_id = uuid.UUID(organization_id) if organization_id else None
+    except ValueError:
+        return None
+    return request_etag(request, get_version(organization_id))
+
+
+def _person_etag(request, person_id, *args, **kwargs):
+    """ETag данных одного Person: версия данных его организации и параметры запроса."""
+    organization_id = person_organization(person_id)
+    if organization_id is None:
+        return None
+    return request_etag(request, get_version(organization_id))
 
 
 @extend_schema(
@@ -41,6 +74,7 @@ class PersonVectorView(APIView):
         serializer = PersonVectorSerializer(data=request.data)
         if serializer.is_valid():
             person = serializer.save()
+            record_detection(person)
 
             response_data = PersonVectorSerializer(person).data
             match_result = getattr(serializer, "match_result", None)
@@ -107,6 +141,8 @@ class PersonUpdateView(APIView):
         serializer = PersonUpdateSerializer(person, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            if serializer.validated_data.get('exit_time'):
+                record_exit(person)
             return Response(serializer.data, status=status.HTTP_200_OK)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -130,7 +166,41 @@ class PersonUpdateView(APIView):
             location=OpenApiParameter.QUERY,
             description='Размер страницы (по умолчанию: 10, максимум: 100)',
             default=10
-        )
+        ),
+        OpenApiParameter(
+            name='cursor',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description=(
+                'Курсорная пагинация: пустое значение — первая страница, дальше next_cursor/previous_cursor '
+                'из ответа. Если передан, page игнорируется'
+            ),
+            required=False
+        ),
+        OpenApiParameter(
+            name='count',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Подсчет total при курсорной пагинации: exact, estimate, none (по умолчанию: none)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='fields',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description=(
+                'Поля ответа через запятую, например id,full_name,age. Из БД читаются только они; '
+                'vector никогда не загружается'
+            ),
+            required=False
+        ),
     ],
     responses={
         200: PersonListSerializer(many=True),
@@ -140,6 +210,7 @@ class PersonUpdateView(APIView):
 class PersonListView(APIView):
     """GET API для получения списка Person с пагинацией."""
 
+    @conditional('person-list', _person_list_etag)
     def get(self, request, *args, **kwargs) -> Response:
         """Возвращает список Person с пагинацией."""
         page = request.GET.get('page', 1)
@@ -159,7 +230,39 @@ class PersonListView(APIView):
         if page_size < 1:
             page_size = 10
 
-        persons = Person.objects.all().order_by('-created_at')
+        fields = PersonListSerializer.Meta.fields
+        if request.GET.get('fields'):
+            fields = tuple(name.strip() for name in request.GET['fields'].split(',') if name.strip())
+            unknown = set(fields) - set(PersonListSerializer.Meta.fields)
+            if unknown:
+                return Response(
+                    {"error": f"Неизвестные поля: {', '.join(sorted(unknown))}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        # Читаем только нужные столбцы: vector (128 чисел) в список не попадает
+        columns = [name for name in fields if name != 'profile'] + ['created_at']
+        persons = Person.objects.all()
+        if 'profile' in fields:
+            # Статистика заказов из PersonProfile тем же запросом (LEFT JOIN), без счётчиков блюд
+            persons = persons.select_related('profile')
+            columns += [f'profile__{name}' for name in PersonProfileSerializer.Meta.fields]
+        persons = persons.only(*columns)
+        organization_id = request.GET.get('organization')
+        if organization_id:
+            try:
+                persons = persons.filter(organization_id=uuid.UUID(organization_id))
+            except ValueError:
+                return Response(
+                    {"error": "Неверный формат UUID для organization"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        serializer_class = partial(PersonListSerializer, fields=fields)
+        if 'cursor' in request.GET:
+            return cursor_paginated_response(request, persons, serializer_class, page_size)
+
+        persons = persons.order_by('-created_at')
         paginator = Paginator(persons, page_size)
 
         try:
@@ -170,7 +273,7 @@ class PersonListView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        serializer = PersonListSerializer(page_obj.object_list, many=True)
+        serializer = serializer_class(page_obj.object_list, many=True)
         response_data = {
             "count": paginator.count,
             "total_pages": paginator.num_pages,
@@ -185,42 +288,168 @@ class PersonListView(APIView):
         return Response(response_data, status=status.HTTP_200_OK)
 
 
+@extend_schema(
+    tags=['Person Management'],
+    summary='Search persons by name or phone',
+    description=(
+        'Ищет Person по части имени (с опечатками) или номера телефона в любом формате. '
+        'Результаты отсортированы по rank: 1 — точный телефон, 0.9 — начало телефона, '
+        'для имени — триграммная похожесть'
+    ),
+    parameters=[
+        OpenApiParameter(
+            name='q',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Часть имени или телефона, например "алиш" или "90 123"',
+            required=True
+        ),
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Искать только в организации (UUID)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='limit',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description='Сколько результатов вернуть (по умолчанию: 20, максимум: 100)',
+            default=20
+        ),
+    ],
+    responses={
+        200: PersonSearchResponseSerializer,
+        400: {'description': 'Ошибка валидации параметров'}
+    }
+)
+class PersonSearchView(APIView):
+    """GET API для поиска Person по имени и телефону."""
+
+    @conditional('person-search', _person_list_etag)
+    def get(self, request, *args, **kwargs) -> Response:
+        """Возвращает Person, подходящих под запрос, по убыванию ранга."""
+        query = request.GET.get('q', '').strip()
+        if not query:
+            return Response(
+                {"error": "Параметр q обязателен"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = int(request.GET.get('limit', settings.PERSON_SEARCH_LIMIT))
+        except (ValueError, TypeError):
+            return Response(
+                {"error": "limit должен быть числом"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = min(max(limit, 1), settings.PERSON_SEARCH_MAX_LIMIT)
+
+        organization_id = request.GET.get('organization')
+        if organization_id:
+            try:
+                organization_id = uuid.UUID(organization_id)
+            except ValueError:
+                return Response(
+                    {"error": "Неверный формат UUID для organization"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        persons = Person.objects.select_related('profile').defer(*PERSON_DEFERRED_FIELDS)
+        found = search_people(query, organization_id=organization_id, limit=limit, queryset=persons)
+        serializer = PersonSearchResultSerializer(found, many=True)
+        return Response({
+            "query": query,
+            "count": len(found),
+            "results": serializer.data
+        }, status=status.HTTP_200_OK)
+
+
 @extend_schema(
     tags=['Person Management'],
     summary='Get person details with carts and products',
-    description='Возвращает детальную информацию о Person, включая все его корзины и товары',
+    description=(
+        'Возвращает детальную информацию о Person, включая его корзины и товары. '
+        'Корзины отдаются постранично (новые первыми), счетчики считаются в SQL.'
+    ),
+    parameters=[
+        OpenApiParameter(
+            name='carts_page',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description='Страница корзин (по умолчанию: 1)',
+            default=1
+        ),
+        OpenApiParameter(
+            name='carts_page_size',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description='Корзин на странице (по умолчанию: 20, максимум: 100)',
+            default=20
+        ),
+    ],
     responses={
         200: PersonDetailSerializer,
+        400: {'description': 'Ошибка валидации параметров'},
         404: {'description': 'Person не найден'}
     }
 )
 class PersonDetailView(APIView):
     """GET API для получения детальной информации о Person."""
 
+    @conditional('person-detail', _person_etag)
     def get(self, request, person_id, *args, **kwargs) -> Response:
         """Возвращает детальную информацию о Person с корзинами и товарами."""
         try:
-            person = Person.objects.prefetch_related(
-                'carts__cartproduct_set__product'
-            ).get(id=person_id)
-        except Person.DoesNotExist:
+            carts_page = max(int(request.GET.get('carts_page', 1)), 1)
+            carts_page_size = min(max(int(request.GET.get('carts_page_size', 20)), 1), 100)
+        except (ValueError, TypeError):
+            return Response(
+                {"error": "carts_page и carts_page_size должны быть числами"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        person = Person.objects.select_related('profile').defer(*PERSON_DEFERRED_FIELDS).filter(id=person_id).first()
+        if person is None:
             return Response(
                 {"error": "Person не найден"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        serializer = PersonDetailSerializer(person)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        offset = (carts_page - 1) * carts_page_size
+        carts = (
+            Cart.objects.filter(person=person)
+            .order_by('-created_at', '-id')
+            .annotate(total_products=Count('cartproduct'))
+            .prefetch_related(Prefetch(
+                'cartproduct_set',
+                queryset=CartProduct.objects.select_related('product').order_by('created_at', 'id')
+            ))[offset:offset + carts_page_size]
+        )
+
+        serializer = PersonDetailSerializer(person, context={'carts': carts})
+        response_data = dict(serializer.data)
+        response_data.update({
+            "carts_page": carts_page,
+            "carts_page_size": carts_page_size,
+            "carts_total_pages": -(-response_data["total_carts"] // carts_page_size),
+        })
+        return Response(response_data, status=status.HTTP_200_OK)
 
 
 @extend_schema(
     tags=['Person Management'],
     summary='Get person summary with AI analysis',
-    description='Возвращает краткую сводку по Person с анализом предпочтений и ИИ-резюме',
+    description=(
+        'Возвращает краткую сводку по Person с анализом предпочтений и ИИ-резюме. '
+        'ИИ-резюме хранится в БД и генерируется в фоне только при изменении истории заказов: '
+        'ai_summary_stale — резюме построено по старой истории, '
+        'ai_summary_pending — новое резюме ещё генерируется.'
+    ),
     responses={
         200: PersonSummarySerializer,
-        404: {'description': 'Person не найден'},
-        500: {'description': 'Ошибка при обращении к OpenAI API'}
+        404: {'description': 'Person не найден'}
     }
 )
 class PersonSummaryView(APIView):
@@ -229,139 +458,121 @@ class PersonSummaryView(APIView):
     def get(self, request, person_id, *args, **kwargs) -> Response:
         """Возвращает сводку по Person с анализом предпочтений."""
         try:
-            person = Person.objects.prefetch_related(
-                'carts__cartproduct_set__product'
-            ).get(id=person_id)
+            person = Person.objects.select_related('profile').defer(*PERSON_DEFERRED_FIELDS).get(id=person_id)
         except Person.DoesNotExist:
             return Response(
                 {"error": "Person не найден"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Получаем полную историю заказов как JSON
-        carts = person.carts.all().order_by('-created_at')
-        total_visits = carts.count()
-        last_visit = carts.first().created_at if carts.exists() else None
-
-        # Собираем полную историю заказов в формате JSON
-        order_history_data = {
-            "person_id": str(person.id),
-            "person_name": person.full_name or "Unknown",
-            "total_orders": total_visits,
-            "orders": []
-        }
-
-        # Анализируем любимые столы и блюда
-        table_counts = Counter()
-        dish_counts = Counter()
-        total_items = 0
-
-        for cart in carts:
-            cart_products = cart.cartproduct_set.select_related('product')
-
-            # Собираем данные о столе
-            if cart.table_number:
-                table_counts[cart.table_number] += 1
+        # Статистика берётся из PersonProfile и используется и в ответе, и в промпте
+        digest = history_digest(person)
 
-            # Собираем продукты в заказе
-            products_in_cart = []
-            for cart_product in cart_products:
-                dish_name = cart_product.product.name
-                dish_counts[dish_name] += 1
-                total_items += 1
-
-                products_in_cart.append({
-                    "product_id": str(cart_product.product.id),
-                    "product_name": cart_product.product.name,
-                    "added_at": cart_product.created_at.isoformat()
-                })
-
-            # Добавляем заказ в историю
-            order_history_data["orders"].append({
-                "cart_id": str(cart.id),
-                "cart_created_at": cart.created_at.isoformat(),
-                "cart_updated_at": cart.updated_at.isoformat(),
-                "table_number": cart.table_number,
-                "products": products_in_cart,
-                "total_products": len(products_in_cart)
-            })
-
-        # Определяем любимые блюда и стол
-        favorite_table = table_counts.most_common(1)[0][0] if table_counts else None
-        favorite_dishes = [
-            {"dish": dish, "count": count}
-            for dish, count in dish_counts.most_common(5)
-        ]
-
-        # Генерируем ИИ-сводку с полной историей заказов
-        ai_summary = _generate_ai_summary(person, order_history_data)
+        # Сохранённая ИИ-сводка; при изменении истории она генерируется заново в фоне
+        summary = person_summary(person, digest)
 
         # Формируем ответ
         summary_data = {
             "person_id": str(person.id),
             "person_name": person.full_name or "Unknown",
-            "total_visits": total_visits,
-            "favorite_table": favorite_table,
-            "favorite_dishes": favorite_dishes,
-            "ai_summary": ai_summary,
-            "last_visit": last_visit,
-            "total_spent_items": total_items
+            "total_visits": digest["total_visits"],
+            "favorite_table": digest["favorite_table"],
+            "favorite_dishes": digest["favorite_dishes"],
+            "ai_summary": summary["ai_summary"],
+            "ai_summary_stale": summary["stale"],
+            "ai_summary_pending": summary["pending"],
+            "last_visit": digest["last_visit"],
+            "total_spent_items": digest["total_items"]
         }
 
         serializer = PersonSummarySerializer(summary_data)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-
 @extend_schema(
     tags=['Person Management'],
     summary='Get person order history',
-    description='Возвращает историю заказов для указанного Person',
+    description=(
+        'Возвращает историю заказов для указанного Person с пагинацией по корзинам. '
+        'Число запросов не зависит от количества корзин: товары загружаются одним prefetch.'
+    ),
+    parameters=[
+        OpenApiParameter(
+            name='page',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description='Номер страницы (по умолчанию: 1)',
+            default=1
+        ),
+        OpenApiParameter(
+            name='page_size',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description='Корзин на странице (по умолчанию: 20, максимум: 100)',
+            default=20
+        ),
+    ],
     responses={
         200: PersonOrderHistoryResponseSerializer,
-        404: {'description': 'Person не найден'}
+        400: {'description': 'Ошибка валидации параметров'},
+        404: {'description': 'Person или страница не найдены'}
     }
 )
 class PersonOrderHistoryView(APIView):
     """GET API для получения истории заказов Person."""
 
+    @conditional('person-order-history', _person_etag)
     def get(self, request, person_id, *args, **kwargs) -> Response:
         """Возвращает историю заказов для указанного Person."""
         try:
-            person = Person.objects.get(id=person_id)
-        except Person.DoesNotExist:
+            page = int(request.GET.get('page', 1))
+            page_size = int(request.GET.get('page_size', 20))
+        except (ValueError, TypeError):
+            return Response(
+                {"error": "page и page_size должны быть числами"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page_size = min(max(page_size, 1), 100)
+
+        person = Person.objects.only('id', 'full_name').filter(id=person_id).first()
+        if person is None:
             return Response(
                 {"error": "Person не найден"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        carts = Cart.objects.filter(person=person).order_by('-created_at')
-
-        if not carts.exists():
-            return Response({
-                "person_id": str(person.id),
-                "person_name": person.full_name,
-                "total_orders": 0,
-                "orders": []
-            }, status=status.HTTP_200_OK)
+        # Товары всех корзин страницы — одним запросом вместо запроса на каждую корзину
+        carts = (
+            Cart.objects.filter(person=person)
+            .order_by('-created_at', '-id')
+            .prefetch_related(Prefetch(
+                'cartproduct_set',
+                queryset=CartProduct.objects.select_related('product').order_by('created_at', 'id')
+            ))
+        )
+        paginator = Paginator(carts, page_size)
+        if paginator.count and not 1 <= page <= paginator.num_pages:
+            return Response(
+                {"error": f"Страница {page} не найдена"},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
+        page_carts = paginator.page(page).object_list if paginator.count else []
         orders_data = []
-
-        for cart in carts:
-            cart_products = CartProduct.objects.filter(cart=cart).select_related('product')
-
-            products_in_cart = []
-            for cart_product in cart_products:
-                products_in_cart.append({
+        for cart in page_carts:
+            products_in_cart = [
+                {
                     "product_id": str(cart_product.product.id),
                     "product_name": cart_product.product.name,
                     "added_at": cart_product.created_at.isoformat()
-                })
-
+                }
+                for cart_product in cart.cartproduct_set.all()
+            ]
             orders_data.append({
                 "cart_id": str(cart.id),
                 "cart_created_at": cart.created_at,
                 "cart_updated_at": cart.updated_at,
+                "table_number": cart.table_number,
                 "products": products_in_cart,
                 "total_products": len(products_in_cart)
             })
@@ -369,7 +580,11 @@ class PersonOrderHistoryView(APIView):
         response_data = {
             "person_id": str(person.id),
             "person_name": person.full_name,
-            "total_orders": len(orders_data),
+            "total_orders": paginator.count,
+            "current_page": page,
+            "page_size": page_size,
+            "total_pages": paginator.num_pages if paginator.count else 0,
+            "has_next": page < paginator.num_pages if paginator.count else False,
             "orders": orders_data
         }
 
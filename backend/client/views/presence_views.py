@@ -0,0 +1,65 @@
+"""
+Presence-related views.
+"""
+
+import uuid
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
+
+from ..events import notify_presence_changed
+from ..presence import get_occupancy_index
+from ..serializers import PresenceSnapshotSerializer
+
+
+@extend_schema(
+    tags=['Presence'],
+    summary='Get live presence snapshot',
+    description=(
+        'Возвращает людей, находящихся в заведении сейчас, из индекса присутствия в памяти. '
+        'Изменения приходят по WebSocket ws/person/ как события "presence".'
+    ),
+    parameters=[
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='ID организации (UUID)',
+            required=True
+        )
+    ],
+    responses={
+        200: PresenceSnapshotSerializer,
+        400: {'description': 'Неверный или отсутствующий параметр organization'}
+    }
+)
+class PresenceSnapshotView(APIView):
+    """GET API для получения текущего присутствия без запросов к БД."""
+
+    def get(self, request, *args, **kwargs) -> Response:
+        """Возвращает снимок присутствия организации."""
+        try:
+            organization_id = uuid.UUID(request.GET.get('organization', ''))
+        except ValueError:
+            return Response(
+                {"error": "Параметр 'organization' должен быть UUID"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        index = get_occupancy_index()
+        for entry in index.expire(organization_id):
+            notify_presence_changed(organization_id, "leave", entry.as_dict())
+
+        people = [entry.as_dict() for entry in index.snapshot(organization_id)]
+        response_data = {
+            "organization": organization_id,
+            "count": len(people),
+            "timeout_seconds": int(index.timeout.total_seconds()),
+            "people": people,
+        }
+
+        serializer = PresenceSnapshotSerializer(response_data)
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -2,15 +2,20 @@
 Product-related views.
 """
 
+import uuid
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
+from django.conf import settings
 from django.core.paginator import Paginator
 
+from ..catalog import autocomplete
 from ..models import Product
-from ..serializers import ProductSerializer
+from ..pagination import cursor_paginated_response
+from ..serializers import ProductAutocompleteResponseSerializer, ProductSerializer
 
 
 @extend_schema(
@@ -43,9 +48,26 @@ from ..serializers import ProductSerializer
             name='search',
             type=OpenApiTypes.STR,
             location=OpenApiParameter.QUERY,
-            description='Поиск по названию продукта',
+            description='Поиск по подстроке названия (на PostgreSQL — по триграммному GIN-индексу)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='cursor',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description=(
+                'Курсорная пагинация: пустое значение — первая страница, дальше next_cursor/previous_cursor '
+                'из ответа. Если передан, page игнорируется'
+            ),
+            required=False
+        ),
+        OpenApiParameter(
+            name='count',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Подсчет total при курсорной пагинации: exact, estimate, none (по умолчанию: none)',
             required=False
-        )
+        ),
     ],
     responses={
         200: ProductSerializer(many=True),
@@ -93,6 +115,9 @@ class ProductListView(APIView):
         if search_query:
             products = products.filter(name__icontains=search_query)
 
+        if 'cursor' in request.GET:
+            return cursor_paginated_response(request, products, ProductSerializer, page_size)
+
         # Сортировка по дате создания
         products = products.order_by('-created_at')
 
@@ -121,3 +146,75 @@ class ProductListView(APIView):
         }
 
         return Response(response_data, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['Product Management'],
+    summary='Autocomplete products by name prefix',
+    description=(
+        'Подсказки продуктов для POS: каждое слово запроса должно начинать слово в названии. '
+        'Каталоги небольших организаций держатся в памяти процесса и сбрасываются при изменении продуктов'
+    ),
+    parameters=[
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Организация (UUID)',
+            required=True
+        ),
+        OpenApiParameter(
+            name='q',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Начало названия, например "piz" или "coca c"',
+            required=True
+        ),
+        OpenApiParameter(
+            name='limit',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description='Сколько подсказок вернуть (по умолчанию: 10, максимум: 100)',
+            default=10
+        ),
+    ],
+    responses={
+        200: ProductAutocompleteResponseSerializer,
+        400: {'description': 'Ошибка валидации параметров'}
+    }
+)
+class ProductAutocompleteView(APIView):
+    """GET API для подсказок продуктов по началу названия."""
+
+    def get(self, request, *args, **kwargs) -> Response:
+        """Возвращает продукты организации, подходящие под начало названия."""
+        query = request.GET.get('q', '').strip()
+        if not query:
+            return Response(
+                {"error": "Параметр q обязателен"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            organization_id = uuid.UUID(request.GET.get('organization', ''))
+        except ValueError:
+            return Response(
+                {"error": "Параметр organization обязателен и должен быть UUID"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = int(request.GET.get('limit', settings.PRODUCT_AUTOCOMPLETE_LIMIT))
+        except (ValueError, TypeError):
+            return Response(
+                {"error": "limit должен быть числом"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = min(max(limit, 1), 100)
+
+        results = autocomplete(organization_id, query, limit)
+        return Response({
+            "query": query,
+            "count": len(results),
+            "results": results
+        }, status=status.HTTP_200_OK)
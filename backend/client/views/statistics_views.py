@@ -2,50 +2,260 @@
 Statistics-related views.
 """
 
+import uuid
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
-from django.core.paginator import Paginator
-from django.db.models import Count, Q
+from django.db.models import IntegerField, Sum
+from django.db.models.functions import Cast
 from django.utils import timezone
-from datetime import datetime, timedelta
-from collections import Counter
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime
 
-from ..models import Person, CartProduct, Cart, Product
+from ..models import Person
 from ..serializers import (
     VisitCountSerializer,
     BodyTypeStatsSerializer,
     GenderStatsSerializer,
     EmotionStatsSerializer,
     AgeStatsSerializer,
+    DashboardStatsSerializer,
+    UniqueVisitorsSerializer,
+    TopProductsSerializer,
+    CoPurchasesSerializer,
 )
-from ..utils import get_age_category
+from ..conditional import not_modified, with_etag
+from ..stats_cache import cached_count_by_bucket, cached_stats_entry, organization_timezone
+from ..sketches import unique_visitors
+from ..product_stats import co_purchases, top_products
+from ..rollups import aggregate_all_rollups, aggregate_rollups, rollup_queryset
+from ..timeseries import BUCKETS, MAX_BUCKETS, PRESETS, align_range, preset_range
+from ..utils import AGE_CATEGORIES, age_categories_from_edges, age_histogram, bucket_age_counts
+
+
+def _parse_organization(request):
+    """Возвращает (UUID организации или None, Response с ошибкой или None)."""
+    organization_id = request.GET.get('organization')
+    if not organization_id:
+        return None, None
+    try:
+        return uuid.UUID(organization_id), None
+    except ValueError:
+        return None, Response(
+            {"error": "Неверный формат UUID для organization"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+
+def _parse_datetime(value, tz=None):
+    """Разбирает дату или дату-время ISO 8601 в aware datetime (без смещения — в часовом поясе tz)."""
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            parsed_date = parse_date(value)
+            if parsed_date is None:
+                return None
+            parsed = datetime.combine(parsed_date, datetime.min.time())
+    except ValueError:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, tz)
+    return parsed
+
+
+def _parse_visit_range(request, tz, default_type=None):
+    """
+    Возвращает ((type, bucket, start, end), None) или (None, Response с ошибкой).
+
+    Границы выровнены по календарным интервалам в часовом поясе tz.
+    """
+    stats_type = request.GET.get('type', default_type)
+    bucket_name = request.GET.get('bucket')
+
+    if not stats_type and not bucket_name:
+        return None, Response(
+            {"error": "Параметр 'type' или 'bucket' обязателен"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if stats_type:
+        if stats_type not in PRESETS:
+            return None, Response(
+                {"error": "Неверный тип статистики. Доступные типы: last_6_hours, day, week, month"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return (stats_type, *preset_range(stats_type, tz=tz)), None
+
+    bucket = BUCKETS.get(bucket_name)
+    if bucket is None:
+        return None, Response(
+            {"error": "Неверный bucket. Доступные значения: 15m, hour, day, week"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    start_time = _parse_datetime(request.GET.get('start'), tz)
+    end_time = _parse_datetime(request.GET.get('end'), tz) if request.GET.get('end') else timezone.now()
+    if start_time is None or end_time is None or start_time >= end_time:
+        return None, Response(
+            {"error": "Параметры 'start' и 'end' должны быть датами ISO 8601, start < end"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if (end_time - start_time) / bucket.step > MAX_BUCKETS:
+        return None, Response(
+            {"error": f"Слишком много интервалов (максимум {MAX_BUCKETS})"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return ("custom", bucket, *align_range(start_time, end_time, bucket, tz)), None
+
+
+def _parse_limit(request, default=10, maximum=100):
+    """Возвращает (limit, None) или (None, Response с ошибкой)."""
+    try:
+        limit = int(request.GET.get('limit', default))
+    except (TypeError, ValueError):
+        return None, Response(
+            {"error": "limit должен быть числом"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return max(1, min(limit, maximum)), None
+
+
+def _visit_range_params(visit_range) -> tuple:
+    """Часть ключа кеша для диапазона: готовые периоды — по имени, свои — по границам."""
+    stats_type, bucket, start_time, end_time = visit_range
+    if stats_type in PRESETS:
+        return (stats_type,)
+    return (stats_type, bucket.name, start_time.isoformat(), end_time.isoformat())
+
+
+def _cached_response(request, endpoint, compute, organization_id=None, params=()) -> Response:
+    """Ответ из кеша статистики с ETag; 304, если If-None-Match совпадает (без запросов к БД)."""
+    data, etag = cached_stats_entry(endpoint, compute, organization_id, params)
+    response = not_modified(request, etag, endpoint)
+    if response is not None:
+        return response
+    return with_etag(Response(data, status=status.HTTP_200_OK), etag)
+
+
+def _visit_count_stats(organization_id, visit_range, tz) -> dict:
+    """
+    Данные для VisitCountSerializer не более чем одним агрегирующим запросом.
+
+    Закрытые интервалы берутся из кеша, пересчитывается только текущий; метки — в местном времени.
+    """
+    stats_type, bucket, start_time, end_time = visit_range
+    persons = Person.objects.all()
+    if organization_id:
+        persons = persons.filter(organization_id=organization_id)
+
+    counts = cached_count_by_bucket(
+        persons, 'created_at', start_time, end_time, bucket, tz, organization_id
+    )
+    data_points = [
+        {"date": moment.strftime(bucket.label_format), "value": count}
+        for moment, count in counts
+    ]
+    return {
+        "type": stats_type,
+        "bucket": bucket.name,
+        "timezone": str(tz),
+        "total_visits": sum(point["value"] for point in data_points),
+        "data": data_points
+    }
+
+
+def _percentage_stats(rows) -> dict:
+    """Данные для распределений в процентах из строк {"value", "count"}."""
+    total = sum(item['count'] for item in rows)
+
+    data = []
+    for item in rows:
+        percentage = (item['count'] / total * 100) if total > 0 else 0
+        data.append({
+            "type": item['value'],
+            "percentage": round(percentage, 2)
+        })
+
+    return {
+        "total_people": total,
+        "data": data
+    }
+
+
+def _count_stats(rows) -> dict:
+    """Данные для распределений в абсолютных значениях из строк {"value", "count"}."""
+    return {
+        "total_people": sum(item['count'] for item in rows),
+        "data": [{"type": item['value'], "value": item['count']} for item in rows]
+    }
+
+
+def _age_stats(histogram) -> dict:
+    """Данные для AgeStatsSerializer из пар (категория, количество)."""
+    return _percentage_stats([{"value": category, "count": count} for category, count in histogram])
 
 
 @extend_schema(
     tags=['Statistics'],
     summary='Get visit count statistics',
-    description='Возвращает статистику количества посещений с фильтрацией по времени',
+    description=(
+        'Возвращает статистику количества посещений с фильтрацией по времени. '
+        'Либо type (готовый период), либо bucket + start/end для произвольного диапазона. '
+        'Интервалы выровнены по календарю в часовом поясе организации (Organization.timezone). '
+        'Считается не более чем одним агрегирующим запросом: закрытые интервалы кешируются.'
+    ),
     parameters=[
         OpenApiParameter(
             name='type',
             type=OpenApiTypes.STR,
             location=OpenApiParameter.QUERY,
-            description='Тип статистики: last_6_hours, day, week, month',
-            required=True
-        )
+            description='Готовый период: last_6_hours, day, week, month',
+            required=False
+        ),
+        OpenApiParameter(
+            name='bucket',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Размер интервала: 15m, hour, day, week',
+            required=False
+        ),
+        OpenApiParameter(
+            name='start',
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description='Начало диапазона (ISO 8601, без смещения — в часовом поясе организации), обязательно вместе с bucket',
+            required=False
+        ),
+        OpenApiParameter(
+            name='end',
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description='Конец диапазона (ISO 8601, по умолчанию: сейчас)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
     ],
     responses={
         200: VisitCountSerializer,
-        400: {'description': 'Неверный тип статистики'}
+        400: {'description': 'Неверный тип статистики или диапазон'}
     },
     examples=[
         OpenApiExample(
             'Success Response',
             value={
                 'type': 'day',
+                'bucket': 'hour',
+                'timezone': 'Asia/Tashkent',
                 'total_visits': 150,
                 'data': [
                     {'date': '2024-01-01 00:00', 'value': 5},
@@ -60,132 +270,144 @@ class VisitCountStatsView(APIView):
 
     def get(self, request, *args, **kwargs) -> Response:
         """Возвращает статистику посещений."""
-        stats_type = request.GET.get('type')
-
-        if not stats_type:
-            return Response(
-                {"error": "Параметр 'type' обязателен"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        now = timezone.now()
-
-        if stats_type == 'last_6_hours':
-            # Последние 6 часов с интервалом в 1 час
-            start_time = now - timedelta(hours=6)
-            data_points = []
-
-            for i in range(6):
-                hour_start = start_time + timedelta(hours=i)
-                hour_end = hour_start + timedelta(hours=1)
-
-                count = Person.objects.filter(
-                    created_at__gte=hour_start,
-                    created_at__lt=hour_end
-                ).count()
-
-                data_points.append({
-                    "date": hour_start.strftime("%Y-%m-%d %H:00"),
-                    "value": count
-                })
-
-            response_data = {
-                "type": "last_6_hours",
-                "total_visits": sum(point["value"] for point in data_points),
-                "data": data_points
-            }
-
-        elif stats_type == 'day':
-            # Последние 24 часа с интервалом в 1 час
-            start_time = now - timedelta(hours=24)
-            data_points = []
-
-            for i in range(24):
-                hour_start = start_time + timedelta(hours=i)
-                hour_end = hour_start + timedelta(hours=1)
-
-                count = Person.objects.filter(
-                    created_at__gte=hour_start,
-                    created_at__lt=hour_end
-                ).count()
-
-                data_points.append({
-                    "date": hour_start.strftime("%Y-%m-%d %H:00"),
-                    "value": count
-                })
-
-            response_data = {
-                "type": "day",
-                "total_visits": sum(point["value"] for point in data_points),
-                "data": data_points
-            }
+        organization_id, error = _parse_organization(request)
+        if error:
+            return error
+
+        tz = organization_timezone(organization_id)
+        visit_range, error = _parse_visit_range(request, tz)
+        if error:
+            return error
+
+        return _cached_response(
+            request,
+            'visit-count',
+            lambda: VisitCountSerializer(_visit_count_stats(organization_id, visit_range, tz)).data,
+            organization_id,
+            _visit_range_params(visit_range),
+        )
 
-        elif stats_type == 'week':
-            # Последние 7 дней
-            start_time = now - timedelta(days=7)
-            data_points = []
-
-            for i in range(7):
-                day_start = start_time + timedelta(days=i)
-                day_end = day_start + timedelta(days=1)
-
-                count = Person.objects.filter(
-                    created_at__gte=day_start,
-                    created_at__lt=day_end
-                ).count()
-
-                data_points.append({
-                    "date": day_start.strftime("%Y-%m-%d"),
-                    "value": count
-                })
-
-            response_data = {
-                "type": "week",
-                "total_visits": sum(point["value"] for point in data_points),
-                "data": data_points
-            }
 
-        elif stats_type == 'month':
-            # Последние 30 дней
-            start_time = now - timedelta(days=30)
-            data_points = []
-
-            for i in range(30):
-                day_start = start_time + timedelta(days=i)
-                day_end = day_start + timedelta(days=1)
-
-                count = Person.objects.filter(
-                    created_at__gte=day_start,
-                    created_at__lt=day_end
-                ).count()
-
-                data_points.append({
-                    "date": day_start.strftime("%Y-%m-%d"),
-                    "value": count
-                })
-
-            response_data = {
-                "type": "month",
-                "total_visits": sum(point["value"] for point in data_points),
-                "data": data_points
+@extend_schema(
+    tags=['Statistics'],
+    summary='Get unique visitor statistics',
+    description=(
+        'Возвращает приблизительное число уникальных посетителей за период и по интервалам. '
+        'Считается объединением почасовых HyperLogLog-скетчей; relative_error — '
+        'относительная стандартная ошибка оценки.'
+    ),
+    parameters=[
+        OpenApiParameter(
+            name='type',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Готовый период: last_6_hours, day, week, month',
+            required=False
+        ),
+        OpenApiParameter(
+            name='bucket',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Размер интервала: hour, day, week',
+            required=False
+        ),
+        OpenApiParameter(
+            name='start',
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description='Начало диапазона (ISO 8601), обязательно вместе с bucket',
+            required=False
+        ),
+        OpenApiParameter(
+            name='end',
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description='Конец диапазона (ISO 8601, по умолчанию: сейчас)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
+    ],
+    responses={
+        200: UniqueVisitorsSerializer,
+        400: {'description': 'Неверный тип статистики или диапазон'}
+    },
+    examples=[
+        OpenApiExample(
+            'Success Response',
+            value={
+                'type': 'week',
+                'bucket': 'day',
+                'timezone': 'Asia/Tashkent',
+                'unique_visitors': 412,
+                'relative_error': 0.01625,
+                'data': [
+                    {'date': '2024-01-01', 'value': 95},
+                    {'date': '2024-01-02', 'value': 120}
+                ]
             }
+        )
+    ]
+)
+class UniqueVisitorsStatsView(APIView):
+    """GET API для получения статистики уникальных посетителей."""
 
-        else:
+    def get(self, request, *args, **kwargs) -> Response:
+        """Возвращает оценку числа уникальных посетителей."""
+        organization_id, error = _parse_organization(request)
+        if error:
+            return error
+
+        tz = organization_timezone(organization_id)
+        visit_range, error = _parse_visit_range(request, tz)
+        if error:
+            return error
+
+        stats_type, bucket, start_time, end_time = visit_range
+        if bucket.name == '15m':
             return Response(
-                {"error": "Неверный тип статистики. Доступные типы: last_6_hours, day, week, month"},
+                {"error": "Уникальные посетители считаются по часам: bucket должен быть hour, day или week"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        serializer = VisitCountSerializer(response_data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def compute():
+            total, series = unique_visitors(start_time, end_time, bucket, tz, organization_id)
+            return UniqueVisitorsSerializer({
+                "type": stats_type,
+                "bucket": bucket.name,
+                "timezone": str(tz),
+                "unique_visitors": total.count(),
+                "relative_error": round(total.relative_error, 5),
+                "data": [
+                    {"date": moment.strftime(bucket.label_format), "value": count}
+                    for moment, count in series
+                ],
+            }).data
+
+        return _cached_response(request, 'unique-visitors', compute, organization_id, _visit_range_params(visit_range))
 
 
 @extend_schema(
     tags=['Statistics'],
     summary='Get body type statistics',
-    description='Возвращает статистику по типам телосложения',
+    description='Возвращает статистику по типам телосложения (из почасовых агрегатов)',
+    parameters=[
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
+    ],
     responses={
-        200: BodyTypeStatsSerializer
+        200: BodyTypeStatsSerializer,
+        400: {'description': 'Неверный UUID организации'}
     },
     examples=[
         OpenApiExample(
@@ -207,33 +429,34 @@ class BodyTypeStatsView(APIView):
 
     def get(self, request, *args, **kwargs) -> Response:
         """Возвращает статистику по типам телосложения."""
-        body_types = Person.objects.values('body_type').annotate(count=Count('body_type'))
-
-        total = sum(item['count'] for item in body_types)
-
-        data = []
-        for item in body_types:
-            percentage = (item['count'] / total * 100) if total > 0 else 0
-            data.append({
-                "type": item['body_type'] or "Не указан",
-                "percentage": round(percentage, 2)
-            })
-
-        response_data = {
-            "total_people": total,
-            "data": data
-        }
-
-        serializer = BodyTypeStatsSerializer(response_data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        organization_id, error = _parse_organization(request)
+        if error:
+            return error
+
+        return _cached_response(
+            request,
+            'body-type',
+            lambda: BodyTypeStatsSerializer(_percentage_stats(aggregate_rollups('body_type', organization_id))).data,
+            organization_id,
+        )
 
 
 @extend_schema(
     tags=['Statistics'],
     summary='Get gender statistics',
-    description='Возвращает статистику по полу',
+    description='Возвращает статистику по полу (из почасовых агрегатов)',
+    parameters=[
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
+    ],
     responses={
-        200: GenderStatsSerializer
+        200: GenderStatsSerializer,
+        400: {'description': 'Неверный UUID организации'}
     },
     examples=[
         OpenApiExample(
@@ -253,33 +476,34 @@ class GenderStatsView(APIView):
 
     def get(self, request, *args, **kwargs) -> Response:
         """Возвращает статистику по полу."""
-        genders = Person.objects.values('gender').annotate(count=Count('gender'))
-
-        total = sum(item['count'] for item in genders)
-
-        data = []
-        for item in genders:
-            percentage = (item['count'] / total * 100) if total > 0 else 0
-            data.append({
-                "type": item['gender'] or "Не указан",
-                "percentage": round(percentage, 2)
-            })
-
-        response_data = {
-            "total_people": total,
-            "data": data
-        }
-
-        serializer = GenderStatsSerializer(response_data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        organization_id, error = _parse_organization(request)
+        if error:
+            return error
+
+        return _cached_response(
+            request,
+            'gender',
+            lambda: GenderStatsSerializer(_percentage_stats(aggregate_rollups('gender', organization_id))).data,
+            organization_id,
+        )
 
 
 @extend_schema(
     tags=['Statistics'],
     summary='Get emotion statistics',
-    description='Возвращает статистику по эмоциям',
+    description='Возвращает статистику по эмоциям (из почасовых агрегатов)',
+    parameters=[
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
+    ],
     responses={
-        200: EmotionStatsSerializer
+        200: EmotionStatsSerializer,
+        400: {'description': 'Неверный UUID организации'}
     },
     examples=[
         OpenApiExample(
@@ -300,30 +524,41 @@ class EmotionStatsView(APIView):
 
     def get(self, request, *args, **kwargs) -> Response:
         """Возвращает статистику по эмоциям."""
-        emotions = Person.objects.values('emotion').annotate(count=Count('emotion'))
-
-        data = []
-        for item in emotions:
-            data.append({
-                "type": item['emotion'] or "Не указана",
-                "value": item['count']
-            })
-
-        response_data = {
-            "total_people": sum(item['count'] for item in emotions),
-            "data": data
-        }
-
-        serializer = EmotionStatsSerializer(response_data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        organization_id, error = _parse_organization(request)
+        if error:
+            return error
+
+        return _cached_response(
+            request,
+            'emotion',
+            lambda: EmotionStatsSerializer(_count_stats(aggregate_rollups('emotion', organization_id))).data,
+            organization_id,
+        )
 
 
 @extend_schema(
     tags=['Statistics'],
     summary='Get age statistics',
-    description='Возвращает статистику по возрастным категориям',
+    description='Возвращает статистику по возрастным категориям (из почасовых агрегатов)',
+    parameters=[
+        OpenApiParameter(
+            name='edges',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Свои границы категорий через запятую, например 18,30,50 (по умолчанию: стандартные 8 категорий)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
+    ],
     responses={
-        200: AgeStatsSerializer
+        200: AgeStatsSerializer,
+        400: {'description': 'Неверные границы категорий или UUID организации'}
     },
     examples=[
         OpenApiExample(
@@ -345,34 +580,280 @@ class AgeStatsView(APIView):
 
     def get(self, request, *args, **kwargs) -> Response:
         """Возвращает статистику по возрастным категориям."""
-        # Получаем всех людей с возрастом
-        people_with_age = Person.objects.exclude(age__isnull=True)
-
-        # Группируем по возрастным категориям
-        age_categories = {}
-        for person in people_with_age:
-            category = get_age_category(person.age)
-            if category not in age_categories:
-                age_categories[category] = 0
-            age_categories[category] += 1
-
-        total = sum(age_categories.values())
-
-        data = []
-        for category, count in age_categories.items():
-            percentage = (count / total * 100) if total > 0 else 0
-            data.append({
-                "type": category,
-                "percentage": round(percentage, 2)
-            })
-
-        # Сортируем по возрасту
-        data.sort(key=lambda x: int(x['type'].split('-')[0]))
-
-        response_data = {
-            "total_people": total,
-            "data": data
-        }
-
-        serializer = AgeStatsSerializer(response_data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        organization_id, error = _parse_organization(request)
+        if error:
+            return error
+
+        edges = request.GET.get('edges')
+        categories = AGE_CATEGORIES
+        if edges:
+            try:
+                edge_values = [int(edge) for edge in edges.split(',')]
+            except ValueError:
+                edge_values = []
+            if not edge_values or edge_values[0] <= 0 or edge_values != sorted(set(edge_values)):
+                return Response(
+                    {"error": "Параметр 'edges' должен быть списком возрастающих положительных чисел, например 18,30,50"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            categories = age_categories_from_edges(edge_values)
+
+        def compute():
+            # Категории считаются в БД: CASE/WHEN по возрасту из почасовых агрегатов
+            rollups = rollup_queryset('age', organization_id).annotate(age_value=Cast('value', IntegerField()))
+            histogram = age_histogram(rollups, field='age_value', count=Sum('count'), categories=categories)
+            return AgeStatsSerializer(_age_stats(histogram)).data
+
+        return _cached_response(request, 'age', compute, organization_id, (edges or '',))
+
+
+@extend_schema(
+    tags=['Statistics'],
+    summary='Get dashboard statistics',
+    description=(
+        'Возвращает все распределения дашборда одним ответом: посещения, телосложение, пол, '
+        'эмоции и возраст. Распределения считаются одним запросом к почасовым агрегатам, '
+        'посещения — одним агрегирующим запросом.'
+    ),
+    parameters=[
+        OpenApiParameter(
+            name='type',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Период для посещений: last_6_hours, day, week, month (по умолчанию: day)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
+    ],
+    responses={
+        200: DashboardStatsSerializer,
+        400: {'description': 'Неверный тип статистики или UUID организации'}
+    }
+)
+class DashboardStatsView(APIView):
+    """GET API для получения сводной статистики дашборда."""
+
+    def get(self, request, *args, **kwargs) -> Response:
+        """Возвращает все распределения дашборда одним ответом."""
+        organization_id, error = _parse_organization(request)
+        if error:
+            return error
+
+        tz = organization_timezone(organization_id)
+        visit_range, error = _parse_visit_range(request, tz, default_type='day')
+        if error:
+            return error
+
+        def compute():
+            rollups = aggregate_all_rollups(organization_id)
+            age_counts = ((row['value'], row['count']) for row in rollups['age'])
+            return DashboardStatsSerializer({
+                "visit_count": _visit_count_stats(organization_id, visit_range, tz),
+                "body_type": _percentage_stats(rollups['body_type']),
+                "gender": _percentage_stats(rollups['gender']),
+                "emotion": _count_stats(rollups['emotion']),
+                "age": _age_stats(bucket_age_counts(age_counts)),
+            }).data
+
+        return _cached_response(request, 'dashboard', compute, organization_id, _visit_range_params(visit_range))
+
+
+@extend_schema(
+    tags=['Statistics'],
+    summary='Get top products',
+    description=(
+        'Возвращает самые заказываемые продукты за период: сколько раз заказан и в скольких корзинах. '
+        'Считается одним агрегирующим запросом.'
+    ),
+    parameters=[
+        OpenApiParameter(
+            name='type',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Готовый период: last_6_hours, day, week, month (по умолчанию: month)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='bucket',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Размер интервала для выравнивания своего диапазона: 15m, hour, day, week',
+            required=False
+        ),
+        OpenApiParameter(
+            name='start',
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description='Начало диапазона (ISO 8601), обязательно вместе с bucket',
+            required=False
+        ),
+        OpenApiParameter(
+            name='end',
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description='Конец диапазона (ISO 8601, по умолчанию: сейчас)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='limit',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description='Количество записей (по умолчанию: 10, максимум: 100)',
+            default=10
+        ),
+    ],
+    responses={
+        200: TopProductsSerializer,
+        400: {'description': 'Неверный период или параметры'}
+    }
+)
+class TopProductsStatsView(APIView):
+    """GET API для получения популярных продуктов."""
+
+    def get(self, request, *args, **kwargs) -> Response:
+        """Возвращает популярные продукты за период."""
+        organization_id, error = _parse_organization(request)
+        if error:
+            return error
+
+        limit, error = _parse_limit(request)
+        if error:
+            return error
+
+        tz = organization_timezone(organization_id)
+        visit_range, error = _parse_visit_range(request, tz, default_type='month')
+        if error:
+            return error
+        stats_type, _, start_time, end_time = visit_range
+
+        return _cached_response(
+            request,
+            'top-products',
+            lambda: TopProductsSerializer({
+                "type": stats_type,
+                "start": start_time,
+                "end": end_time,
+                "data": top_products(start_time, end_time, organization_id, limit),
+            }).data,
+            organization_id,
+            (*_visit_range_params(visit_range), limit),
+        )
+
+
+@extend_schema(
+    tags=['Statistics'],
+    summary='Get products ordered together',
+    description=(
+        'Возвращает пары продуктов, которые чаще всего заказывают в одной корзине, '
+        'или продукты, заказываемые вместе с выбранным (product). Считается одним агрегирующим запросом.'
+    ),
+    parameters=[
+        OpenApiParameter(
+            name='type',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Готовый период: last_6_hours, day, week, month (по умолчанию: month)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='bucket',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Размер интервала для выравнивания своего диапазона: 15m, hour, day, week',
+            required=False
+        ),
+        OpenApiParameter(
+            name='start',
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description='Начало диапазона (ISO 8601), обязательно вместе с bucket',
+            required=False
+        ),
+        OpenApiParameter(
+            name='end',
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            description='Конец диапазона (ISO 8601, по умолчанию: сейчас)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='organization',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Фильтр по организации (UUID)',
+            required=False
+        ),
+        OpenApiParameter(
+            name='limit',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description='Количество записей (по умолчанию: 10, максимум: 100)',
+            default=10
+        ),
+        OpenApiParameter(
+            name='product',
+            type=OpenApiTypes.UUID,
+            location=OpenApiParameter.QUERY,
+            description='Продукт (UUID), для которого искать совместные заказы',
+            required=False
+        ),
+    ],
+    responses={
+        200: CoPurchasesSerializer,
+        400: {'description': 'Неверный период или параметры'}
+    }
+)
+class CoPurchaseStatsView(APIView):
+    """GET API для получения продуктов, заказываемых вместе."""
+
+    def get(self, request, *args, **kwargs) -> Response:
+        """Возвращает пары продуктов из одних корзин."""
+        organization_id, error = _parse_organization(request)
+        if error:
+            return error
+
+        product_id = request.GET.get('product')
+        if product_id:
+            try:
+                product_id = uuid.UUID(product_id)
+            except ValueError:
+                return Response(
+                    {"error": "Неверный формат UUID для product"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        limit, error = _parse_limit(request)
+        if error:
+            return error
+
+        tz = organization_timezone(organization_id)
+        visit_range, error = _parse_visit_range(request, tz, default_type='month')
+        if error:
+            return error
+        stats_type, _, start_time, end_time = visit_range
+
+        return _cached_response(
+            request,
+            'co-purchases',
+            lambda: CoPurchasesSerializer({
+                "type": stats_type,
+                "start": start_time,
+                "end": end_time,
+                "data": co_purchases(start_time, end_time, organization_id, product_id, limit),
+            }).data,
+            organization_id,
+            (*_visit_range_params(visit_range), limit, product_id or ''),
+        )
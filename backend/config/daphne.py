@@ -0,0 +1,42 @@
+"""
+Daphne entrypoint with permessage-deflate enabled for WebSockets.
+
+Daphne does not expose autobahn's compression options on its command line,
+so this wrapper swaps in a factory that accepts permessage-deflate offers
+and then hands over to the regular Daphne CLI::
+
+    python -m config.daphne -b 0.0.0.0 -p 8000 config.asgi:application
+"""
+from daphne import server
+from daphne.cli import CommandLineInterface
+from daphne.ws_protocol import WebSocketFactory
+
+from autobahn.websocket.compress import (
+    PerMessageDeflateOffer,
+    PerMessageDeflateOfferAccept,
+)
+
+
+def accept_permessage_deflate(offers):
+    """Accept the first permessage-deflate offer made by the client."""
+    for offer in offers:
+        if isinstance(offer, PerMessageDeflateOffer):
+            return PerMessageDeflateOfferAccept(offer)
+    return None
+
+
+class DeflateWebSocketFactory(WebSocketFactory):
+    """Daphne WebSocket factory that negotiates permessage-deflate."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setProtocolOptions(perMessageCompressionAccept=accept_permessage_deflate)
+
+
+def main() -> None:
+    server.WebSocketFactory = DeflateWebSocketFactory
+    CommandLineInterface.entrypoint()
+
+
+if __name__ == "__main__":
+    main()
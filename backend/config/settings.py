@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     "rest_framework",
     "drf_spectacular",
@@ -138,12 +139,79 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Кеш Django хранит счётчики версий статистики, кешированные ответы, ETag и блокировки ИИ-сводок.
+# В продакшене он должен быть общим для всех процессов (Redis): у LocMemCache в каждом
+# процессе свои счётчики, и записи в одном процессе не сбрасывают кеш других
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+    }
+else:
+    # Локальная разработка и тесты: один процесс; лимит поднят, чтобы счётчики версий не вытеснялись
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 100_000},
+        },
+    }
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels.layers.InMemoryChannelLayer",
     },
 }
 
+# Буферизация и heartbeat для ws/person/
+PERSON_EVENTS_BUFFER_SIZE = int(os.getenv("PERSON_EVENTS_BUFFER_SIZE", "100"))
+PERSON_EVENTS_OVERFLOW_POLICY = os.getenv("PERSON_EVENTS_OVERFLOW_POLICY", "drop_oldest")  # drop_oldest, coalesce, disconnect
+PERSON_EVENTS_HEARTBEAT_INTERVAL = float(os.getenv("PERSON_EVENTS_HEARTBEAT_INTERVAL", "30"))  # 0 отключает heartbeat
+PERSON_EVENTS_HEARTBEAT_TIMEOUT = float(os.getenv("PERSON_EVENTS_HEARTBEAT_TIMEOUT", "90"))
+
+# Журнал последних событий для Last-Event-ID в SSE (/api/events/person/)
+EVENT_LOG_SIZE = int(os.getenv("EVENT_LOG_SIZE", "1000"))
+SSE_KEEPALIVE_INTERVAL = float(os.getenv("SSE_KEEPALIVE_INTERVAL", "15"))
+SSE_RETRY_MS = 3000
+
+# Индекс присутствия: через сколько секунд без детекций человек считается ушедшим
+PRESENCE_TIMEOUT_SECONDS = int(os.getenv("PRESENCE_TIMEOUT_SECONDS", "1800"))
+
+# Выгрузки: сколько строк читать из курсора БД за раз
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Кеш статистики: максимальная устаревшость ответа в секундах
+# (записи Person/Cart сбрасывают кеш сразу через счётчик версий)
+STATISTICS_CACHE_TIMEOUT = int(os.getenv("STATISTICS_CACHE_TIMEOUT", "60"))
+# Закрытый интервал посещений кешируется навсегда только через N секунд после его конца:
+# created_at ставится до коммита, и строка может появиться в БД уже после границы
+STATS_CLOSED_BUCKET_GRACE = int(os.getenv("STATS_CLOSED_BUCKET_GRACE", "60"))
+
+# Поиск Person по имени и телефону (/api/client/persons/search/): результатов по умолчанию и максимум
+PERSON_SEARCH_LIMIT = 20
+PERSON_SEARCH_MAX_LIMIT = 100
+
+# Автодополнение продуктов (/api/client/products/autocomplete/): каталоги организаций
+# до N продуктов держим в памяти процесса, большие ищем в БД по триграммному индексу
+PRODUCT_CATALOG_CACHE_SIZE = int(os.getenv("PRODUCT_CATALOG_CACHE_SIZE", "5000"))
+PRODUCT_CATALOG_CACHE_ORGANIZATIONS = 256  # сколько каталогов хранить одновременно
+PRODUCT_AUTOCOMPLETE_LIMIT = 10
+
+# ИИ-сводки по Person: клиент LLM (openai или fake — локальный, без сети),
+# фоновые потоки генерации и синхронный режим (для тестов)
+AI_SUMMARY_BACKEND = os.getenv("AI_SUMMARY_BACKEND", "openai")
+AI_SUMMARY_MODEL = os.getenv("AI_SUMMARY_MODEL", "gpt-3.5-turbo")
+AI_SUMMARY_TIMEOUT = float(os.getenv("AI_SUMMARY_TIMEOUT", "30"))
+AI_SUMMARY_WORKERS = int(os.getenv("AI_SUMMARY_WORKERS", "2"))
+AI_SUMMARY_INLINE = os.getenv("AI_SUMMARY_INLINE", "false").lower() == "true"
+AI_SUMMARY_LOCK_TIMEOUT = 300  # сколько секунд генерация считается выполняющейся
+AI_SUMMARY_RETRY_DELAY = 60  # пауза перед повтором после ошибки API
+# Размер промпта: не больше N последних заказов и примерно столько токенов
+AI_SUMMARY_PROMPT_ORDERS = int(os.getenv("AI_SUMMARY_PROMPT_ORDERS", "20"))
+AI_SUMMARY_PROMPT_TOKEN_BUDGET = int(os.getenv("AI_SUMMARY_PROMPT_TOKEN_BUDGET", "1500"))
+
 # ASGI настройки
 ASGI_APPLICATION = "config.asgi.application"
 
@@ -193,6 +261,8 @@ SPECTACULAR_SETTINGS = {
         {'name': 'Person Management', 'description': 'Управление персонами'},
         {'name': 'Statistics', 'description': 'Статистика и аналитика'},
         {'name': 'Cart Management', 'description': 'Управление корзинами и товарами'},
+        {'name': 'Presence', 'description': 'Кто сейчас в заведении'},
+        {'name': 'Export', 'description': 'Потоковые выгрузки данных'},
     ],
     'CONTACT': {
         'name': 'Nome.ai Team',
@@ -232,8 +302,12 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-none-match',
 ]
 
+# ETag нужен фронтенду для условных GET (If-None-Match -> 304)
+CORS_EXPOSE_HEADERS = ['etag']
+
 CORS_ALLOW_METHODS = [
     'DELETE',
     'GET',
@@ -0,0 +1,74 @@
+"""Bounded per-connection send buffers for realtime consumers."""
+from __future__ import annotations
+
+import itertools
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+DISCONNECT = "disconnect"
+
+OVERFLOW_POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+
+class BufferOverflow(Exception):
+    """Raised when a buffer using the ``disconnect`` policy is full."""
+
+
+class SendBuffer:
+    """
+    FIFO of outgoing messages with a fixed capacity.
+
+    When the buffer is full the overflow policy decides what happens:
+
+    * ``drop_oldest`` discards the oldest pending message;
+    * ``coalesce`` replaces a pending message with the same key in place
+      (falling back to ``drop_oldest`` when nothing can be merged);
+    * ``disconnect`` raises :class:`BufferOverflow` so the caller can close
+      the connection.
+    """
+
+    def __init__(self, maxsize: int, policy: str = DROP_OLDEST) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def push(self, message: Any, key: Optional[Hashable] = None) -> None:
+        """Append ``message``; ``key`` identifies messages that may be coalesced."""
+        if self.policy == COALESCE and key is not None:
+            slot = ("key", key)
+            if slot in self._items:
+                self._items[slot] = message
+                self.coalesced += 1
+                return
+        else:
+            slot = ("seq", next(self._sequence))
+
+        if len(self._items) >= self.maxsize:
+            if self.policy == DISCONNECT:
+                raise BufferOverflow(f"Send buffer full ({self.maxsize} messages)")
+            self._items.popitem(last=False)
+            self.dropped += 1
+
+        self._items[slot] = message
+
+    def pop(self) -> Any:
+        """Remove and return the oldest pending message."""
+        return self._items.popitem(last=False)[1]
+
+    def clear(self) -> None:
+        self._items.clear()
@@ -1,7 +1,20 @@
 """WebSocket consumers for realtime features."""
 from __future__ import annotations
 
+import asyncio
+from urllib.parse import parse_qs
+
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from . import metrics
+from .buffers import BufferOverflow, SendBuffer
+from .encoding import ENCODINGS, JSON, encode_event
+from .event_bus import PERSON_EVENTS_GROUP
+
+UNSUPPORTED_ENCODING_CLOSE_CODE = 4003
+SLOW_CONSUMER_CLOSE_CODE = 4008
+HEARTBEAT_TIMEOUT_CLOSE_CODE = 4009
 
 
 class EchoConsumer(AsyncJsonWebsocketConsumer):
@@ -19,17 +32,115 @@ class EchoConsumer(AsyncJsonWebsocketConsumer):
 
 
 class PersonEventsConsumer(AsyncJsonWebsocketConsumer):
-    """Broadcast person presence events."""
+    """
+    Broadcast person presence events.
+
+    Group messages are not written to the socket directly: they are queued
+    in a bounded :class:`~core.buffers.SendBuffer` and flushed by a writer
+    task. Overflow is handled by ``PERSON_EVENTS_OVERFLOW_POLICY`` and
+    counted in :mod:`core.metrics`.
+
+    The buffer only bounds bursts inside this process, i.e. events that
+    arrive faster than the writer task gets scheduled. It is not
+    backpressure from the client: under daphne ``send()`` hands the frame to
+    the server's transport buffer and returns without waiting for the peer,
+    so a slow reader is not visible here. Dead or stalled clients are caught
+    by the heartbeat, which sends ``{"event": "ping"}`` and closes sockets
+    that have not sent anything within the timeout.
 
-    group_name = "person_events"
+    Clients pick a frame encoding with ``?encoding=json|compact|msgpack``
+    (see :mod:`core.encoding`); ``json`` is the default.
+    """
+
+    group_name = PERSON_EVENTS_GROUP
 
     async def connect(self) -> None:
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        self.encoding = query.get("encoding", [JSON])[0]
+        if self.encoding not in ENCODINGS:
+            await self.close(code=UNSUPPORTED_ENCODING_CLOSE_CODE)
+            return
+
+        self.send_buffer = SendBuffer(
+            maxsize=settings.PERSON_EVENTS_BUFFER_SIZE,
+            policy=settings.PERSON_EVENTS_OVERFLOW_POLICY,
+        )
+        self._buffer_ready = asyncio.Event()
+        self._last_seen = asyncio.get_running_loop().time()
+        self._tasks: list[asyncio.Task] = []
+
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
+        metrics.increment("person_events.connections")
+
+        self._tasks.append(asyncio.create_task(self._writer()))
+        if settings.PERSON_EVENTS_HEARTBEAT_INTERVAL:
+            self._tasks.append(asyncio.create_task(self._heartbeat()))
 
     async def disconnect(self, code: int) -> None:
+        for task in getattr(self, "_tasks", []):
+            task.cancel()
+        if hasattr(self, "send_buffer"):
+            self.send_buffer.clear()
+            metrics.increment("person_events.connections", -1)
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
         await super().disconnect(code)
 
+    async def receive(self, text_data=None, bytes_data=None, **kwargs) -> None:
+        # Clients only answer heartbeats; any inbound frame proves liveness.
+        self._last_seen = asyncio.get_running_loop().time()
+
     async def person_joined(self, event) -> None:
-        await self.send_json(event.get("payload", {}))
+        payload = event.get("payload", {})
+        await self._enqueue(payload, key=self._coalesce_key(payload, "id"))
+
+    async def presence_changed(self, event) -> None:
+        payload = event.get("payload", {})
+        await self._enqueue(payload, key=self._coalesce_key(payload, "person_id"))
+
+    @staticmethod
+    def _coalesce_key(payload: dict, id_field: str):
+        person_id = (payload.get("person") or {}).get(id_field)
+        return (payload.get("event"), person_id) if person_id else None
+
+    async def _enqueue(self, payload: dict, key=None) -> None:
+        buffer = self.send_buffer
+        dropped, coalesced = buffer.dropped, buffer.coalesced
+        try:
+            buffer.push(payload, key=key)
+        except BufferOverflow:
+            metrics.increment("person_events.disconnected_slow")
+            metrics.increment("person_events.dropped", len(buffer) + 1)
+            buffer.clear()
+            await self.close(code=SLOW_CONSUMER_CLOSE_CODE)
+            return
+
+        if buffer.dropped != dropped:
+            metrics.increment("person_events.dropped", buffer.dropped - dropped)
+        if buffer.coalesced != coalesced:
+            metrics.increment("person_events.coalesced", buffer.coalesced - coalesced)
+        self._buffer_ready.set()
+
+    async def _writer(self) -> None:
+        while True:
+            await self._buffer_ready.wait()
+            while self.send_buffer:
+                await self._send_event(self.send_buffer.pop())
+                metrics.increment("person_events.sent")
+            self._buffer_ready.clear()
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = settings.PERSON_EVENTS_HEARTBEAT_INTERVAL
+        timeout = settings.PERSON_EVENTS_HEARTBEAT_TIMEOUT
+        while True:
+            await asyncio.sleep(interval)
+            if loop.time() - self._last_seen > timeout:
+                metrics.increment("person_events.heartbeat_timeouts")
+                await self.close(code=HEARTBEAT_TIMEOUT_CLOSE_CODE)
+                return
+            await self._send_event({"event": "ping"})
+
+    async def _send_event(self, payload: dict) -> None:
+        text_data, bytes_data = encode_event(payload, self.encoding)
+        await self.send(text_data=text_data, bytes_data=bytes_data)
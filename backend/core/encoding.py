@@ -0,0 +1,61 @@
+"""Wire encodings for realtime event frames."""
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+import msgpack
+
+JSON = "json"
+COMPACT = "compact"
+MSGPACK = "msgpack"
+
+ENCODINGS = (JSON, COMPACT, MSGPACK)
+
+# Fields of a ``person_joined`` person that dashboards actually render.
+COMPACT_PERSON_FIELDS = (
+    "id",
+    "image",
+    "full_name",
+    "age",
+    "gender",
+    "emotion",
+    "body_type",
+    "entry_time",
+)
+
+
+def compact_payload(payload: dict) -> dict:
+    """Trim a ``person_joined`` payload to :data:`COMPACT_PERSON_FIELDS`, dropping nulls."""
+    person = payload.get("person")
+    if payload.get("event") != "person_joined" or not isinstance(person, dict):
+        return payload
+    trimmed = {
+        field: person[field]
+        for field in COMPACT_PERSON_FIELDS
+        if person.get(field) is not None
+    }
+    return {**payload, "person": trimmed}
+
+
+def encode_event(payload: dict, encoding: str = JSON) -> tuple[Optional[str], Optional[bytes]]:
+    """
+    Encode ``payload`` for the wire.
+
+    Returns ``(text_data, bytes_data)`` with exactly one of them set, matching
+    the arguments of ``AsyncWebsocketConsumer.send``.
+    """
+    if encoding == JSON:
+        return json.dumps(payload), None
+    if encoding == COMPACT:
+        return json.dumps(compact_payload(payload), separators=(",", ":")), None
+    if encoding == MSGPACK:
+        return None, msgpack.packb(compact_payload(payload), use_bin_type=True)
+    raise ValueError(f"Unknown encoding: {encoding}")
+
+
+def decode_event(data: Any) -> dict:
+    """Inverse of :func:`encode_event` for either frame type."""
+    if isinstance(data, (bytes, bytearray)):
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
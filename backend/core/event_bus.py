@@ -0,0 +1,69 @@
+"""Publishing of realtime events to WebSocket and SSE subscribers."""
+from __future__ import annotations
+
+import itertools
+import threading
+from collections import deque
+from typing import Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+PERSON_EVENTS_GROUP = "person_events"
+
+
+class EventLog:
+    """Ring buffer of recently published events with increasing ids."""
+
+    def __init__(self, maxlen: int) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._events: deque[tuple[int, str, dict]] = deque(maxlen=maxlen)
+
+    def append(self, message_type: str, payload: dict) -> int:
+        with self._lock:
+            event_id = next(self._ids)
+            self._events.append((event_id, message_type, payload))
+            return event_id
+
+    def since(self, last_id: int) -> list[tuple[int, str, dict]]:
+        """Return retained events newer than ``last_id``, oldest first."""
+        with self._lock:
+            return [event for event in self._events if event[0] > last_id]
+
+
+_event_log: Optional[EventLog] = None
+_event_log_lock = threading.Lock()
+
+
+def get_event_log() -> EventLog:
+    """Return the process-wide event log."""
+    global _event_log
+    if _event_log is None:
+        with _event_log_lock:
+            if _event_log is None:
+                _event_log = EventLog(settings.EVENT_LOG_SIZE)
+    return _event_log
+
+
+def publish(message_type: str, payload: dict) -> int:
+    """
+    Record ``payload`` in the event log and send it to the person events group.
+
+    ``message_type`` is the consumer handler name (e.g. ``person_joined``).
+    Returns the event id used for SSE ``Last-Event-ID`` resume.
+    """
+    event_id = get_event_log().append(message_type, payload)
+
+    channel_layer = get_channel_layer()
+    if channel_layer:
+        async_to_sync(channel_layer.group_send)(
+            PERSON_EVENTS_GROUP,
+            {
+                "type": message_type,
+                "id": event_id,
+                "payload": payload,
+            },
+        )
+    return event_id
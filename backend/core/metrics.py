@@ -0,0 +1,32 @@
+"""In-process counters for operational metrics."""
+from __future__ import annotations
+
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+_counters: Counter[str] = Counter()
+
+
+def increment(name: str, value: int = 1) -> None:
+    """Add ``value`` to the counter called ``name``."""
+    with _lock:
+        _counters[name] += value
+
+
+def get(name: str) -> int:
+    """Return the current value of a counter (0 if never incremented)."""
+    with _lock:
+        return _counters[name]
+
+
+def snapshot() -> dict[str, int]:
+    """Return a copy of all counters."""
+    with _lock:
+        return dict(_counters)
+
+
+def reset() -> None:
+    """Clear all counters. Intended for tests."""
+    with _lock:
+        _counters.clear()
@@ -4,6 +4,8 @@ from . import views
 
 urlpatterns = [
     path("", views.health_check, name="health-check"),
+    path("metrics/", views.metrics_view, name="metrics"),
+    path("events/person/", views.person_events_stream, name="person-events-stream"),
     path("auth/login/", views.LoginView.as_view(), name="user-login"),
     path("auth/logout/", views.LogoutView.as_view(), name="user-logout"),
     path("auth/profile/", views.UserProfileView.as_view(), name="user-profile"),
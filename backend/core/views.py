@@ -1,4 +1,9 @@
 """Views for core app."""
+import asyncio
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -9,6 +14,9 @@ from django.contrib.auth import login, logout
 from django.utils import timezone
 from django.contrib.auth.decorators import login_required
 
+from . import metrics
+from .encoding import COMPACT, JSON, encode_event
+from .event_bus import PERSON_EVENTS_GROUP, get_event_log
 from .models import User
 from .serializers import (
     UserSerializer,
@@ -32,6 +40,92 @@ def health_check(request):
     return Response({"status": "ok"})
 
 
+@extend_schema(
+    tags=['System'],
+    summary='Runtime metrics',
+    description='Счётчики процесса: WebSocket-события, отброшенные и объединённые сообщения и т.д.',
+    responses={
+        200: {'description': 'Metric counters'}
+    }
+)
+@api_view(['GET'])
+def metrics_view(request):
+    """Return in-process metric counters."""
+    return Response(metrics.snapshot())
+
+
+def _format_sse(event_id: int, payload: dict, encoding: str) -> str:
+    text_data, _ = encode_event(payload, encoding)
+    return f"id: {event_id}\nevent: {payload.get('event', 'message')}\ndata: {text_data}\n\n"
+
+
+async def _person_event_stream(last_event_id, event_types, encoding):
+    channel_layer = get_channel_layer()
+    channel = await channel_layer.new_channel()
+    # Subscribe before replaying so nothing published in between is lost.
+    await channel_layer.group_add(PERSON_EVENTS_GROUP, channel)
+    metrics.increment("person_events.sse_connections")
+    last_sent = 0
+    try:
+        yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+
+        if last_event_id is not None:
+            for event_id, _, payload in get_event_log().since(last_event_id):
+                if not event_types or payload.get("event") in event_types:
+                    yield _format_sse(event_id, payload, encoding)
+                last_sent = event_id
+
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    channel_layer.receive(channel),
+                    timeout=settings.SSE_KEEPALIVE_INTERVAL,
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            event_id = message.get("id", 0)
+            payload = message.get("payload", {})
+            if event_id <= last_sent:
+                continue
+            last_sent = event_id
+            if event_types and payload.get("event") not in event_types:
+                continue
+            yield _format_sse(event_id, payload, encoding)
+    finally:
+        metrics.increment("person_events.sse_connections", -1)
+        await channel_layer.group_discard(PERSON_EVENTS_GROUP, channel)
+
+
+async def person_events_stream(request):
+    """
+    Server-Sent Events stream of person events.
+
+    A read-only alternative to ``ws/person/`` fed by the same channel-layer
+    group. Supports ``Last-Event-ID`` resume from the in-process event log,
+    ``?events=person_joined,presence`` filtering and ``?encoding=compact``.
+    """
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    encoding = request.GET.get("encoding", JSON)
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return HttpResponseBadRequest("Last-Event-ID должен быть числом")
+    if encoding not in (JSON, COMPACT):
+        return HttpResponseBadRequest("encoding должен быть json или compact")
+
+    event_types = {name for name in request.GET.get("events", "").split(",") if name}
+
+    response = StreamingHttpResponse(
+        _person_event_stream(last_event_id, event_types, encoding),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 @extend_schema(
     tags=['Authentication'],
     summary='User registration',
@@ -0,0 +1,21 @@
+"""Tests for the client app's deployment checks."""
+from django.test import SimpleTestCase, override_settings
+
+from client.checks import check_shared_cache
+
+
+class SharedCacheCheckTestCase(SimpleTestCase):
+    """Test cases for the shared cache deploy check."""
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_local_cache_warns(self):
+        """A process-local cache is reported as client.W001."""
+        self.assertEqual([message.id for message in check_shared_cache(None)], ["client.W001"])
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://localhost:6379/0",
+    }})
+    def test_shared_cache_passes(self):
+        """Redis raises no warning."""
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,104 @@
+"""Tests for ETag / If-None-Match handling on read endpoints."""
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from client.models import Cart, CartProduct, Organization, Person, Product
+from client.stats_cache import organization_timezone
+from core import metrics
+
+
+class ConditionalGetTestCase(TestCase):
+    """Test cases for conditional GET."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        metrics.reset()
+        self.client = APIClient()
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        self.other = Organization.objects.create(name="Other Organization", private_key="TEST002")
+        self.person = Person.objects.create(organization=self.organization, full_name="Regular Guest", gender="Male")
+        self.product = Product.objects.create(organization=self.organization, name="Pizza")
+        cart = Cart.objects.create(organization=self.organization, person=self.person, table_number=5)
+        CartProduct.objects.create(organization=self.organization, cart=cart, product=self.product)
+        organization_timezone(self.organization.id)
+
+    def _revalidate(self, url, etag, queries=None):
+        if queries is None:
+            return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        with self.assertNumQueries(queries):
+            return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_person_list_not_modified_without_queries(self):
+        """An unchanged list is answered with 304 before any query runs."""
+        url = f"{reverse('person-list')}?organization={self.organization.id}&page_size=5"
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        response = self._revalidate(url, etag, queries=0)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(metrics.get('conditional_get.person-list.not_modified'), 1)
+
+        reordered = f"{reverse('person-list')}?page_size=5&organization={self.organization.id}"
+        self.assertEqual(self._revalidate(reordered, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        other_page = f"{reverse('person-list')}?organization={self.organization.id}&page_size=6"
+        self.assertEqual(self._revalidate(other_page, etag).status_code, status.HTTP_200_OK)
+
+    def test_person_list_changes_after_writes(self):
+        """Writes in the organization change the ETag; other organizations do not."""
+        url = f"{reverse('person-list')}?organization={self.organization.id}"
+        etag = self.client.get(url)['ETag']
+
+        Person.objects.create(organization=self.other, full_name="Elsewhere")
+        self.assertEqual(self._revalidate(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Person.objects.create(organization=self.organization, full_name="New Guest")
+        response = self._revalidate(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_person_detail_and_history(self):
+        """Detail and order history revalidate without queries and change with orders."""
+        for name in ('person-detail', 'person-order-history'):
+            url = reverse(name, kwargs={'person_id': self.person.id})
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self._revalidate(url, etag, queries=0).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        url = reverse('person-detail', kwargs={'person_id': self.person.id})
+        etag = self.client.get(url)['ETag']
+        self.product.name = "Pizza Margherita"
+        self.product.save()
+        response = self._revalidate(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        Cart.objects.create(organization=self.organization, person=self.person, table_number=2)
+        self.assertEqual(self._revalidate(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_missing_person_still_404(self):
+        """No ETag is computed for an unknown person."""
+        url = reverse('person-detail', kwargs={'person_id': '00000000-0000-0000-0000-000000000000'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"anything"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_statistics_not_modified(self):
+        """Statistics ETags hash the cached result and survive unrelated recomputation."""
+        url = f"{reverse('gender-stats')}?organization={self.organization.id}"
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        self.assertEqual(self._revalidate(url, etag, queries=0).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # A cart write bumps the version but leaves the gender split unchanged
+        Cart.objects.create(organization=self.organization, person=self.person)
+        self.assertEqual(self._revalidate(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Person.objects.create(organization=self.organization, gender="Female")
+        response = self._revalidate(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,59 @@
+"""Tests for migrations that backfill denormalized tables from existing rows."""
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class BackfillMigrationTestCase(TransactionTestCase):
+    """Migrations creating rollups and profiles fill them from existing data."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.executor = MigrationExecutor(connection)
+        self.latest = self.executor.loader.graph.leaf_nodes("client")
+
+    def tearDown(self):
+        self.executor.loader.build_graph()
+        self.executor.migrate(self.latest)
+
+    def _migrate(self, name):
+        self.executor.loader.build_graph()
+        self.executor.migrate([("client", name)])
+        return self.executor.loader.project_state([("client", name)]).apps
+
+    def test_rollups_backfilled(self):
+        """0006 leaves demographic rollups matching the people already stored."""
+        apps = self._migrate("0005_personvector")
+        Organization = apps.get_model("client", "Organization")
+        Person = apps.get_model("client", "Person")
+        organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        Person.objects.create(organization=organization, gender="Female", age=30)
+        Person.objects.create(organization=organization, gender="Female", emotion="Happy")
+
+        apps = self._migrate("0006_person_stat_rollup")
+
+        rollups = apps.get_model("client", "PersonStatRollup").objects.filter(dimension="gender")
+        self.assertEqual([(row.value, row.count) for row in rollups], [("Female", 2)])
+
+    def test_profiles_backfilled(self):
+        """0013 builds a profile for every person who already has orders."""
+        apps = self._migrate("0012_person_summary")
+        Organization = apps.get_model("client", "Organization")
+        Person = apps.get_model("client", "Person")
+        Product = apps.get_model("client", "Product")
+        Cart = apps.get_model("client", "Cart")
+        CartProduct = apps.get_model("client", "CartProduct")
+        organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        person = Person.objects.create(organization=organization, full_name="Regular Guest")
+        Person.objects.create(organization=organization, full_name="New Guest")
+        pizza = Product.objects.create(organization=organization, name="Pizza")
+        for table in (5, 5, 2):
+            cart = Cart.objects.create(organization=organization, person=person, table_number=table)
+            CartProduct.objects.create(organization=organization, cart=cart, product=pizza)
+
+        apps = self._migrate("0013_person_profile")
+
+        profile = apps.get_model("client", "PersonProfile").objects.get()
+        self.assertEqual(profile.person_id, person.id)
+        self.assertEqual((profile.total_visits, profile.total_items, profile.favorite_table), (3, 3, 5))
+        self.assertEqual(profile.favorite_dishes, [{"dish": "Pizza", "count": 3}])
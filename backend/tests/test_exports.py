@@ -0,0 +1,146 @@
+"""Tests for streaming exports."""
+import asyncio
+import csv
+import warnings
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from client.exports import ExportDataset
+from client.models import Cart, CartProduct, Organization, Person, Product
+
+
+class ExportTestCase(TestCase):
+    """Test cases for CSV export endpoints and the export_data command."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        self.other_organization = Organization.objects.create(name="Other Organization", private_key="TEST002")
+        self.people = [
+            Person.objects.create(organization=self.organization, full_name=f"Person {i}", age=20 + i)
+            for i in range(5)
+        ]
+        Person.objects.create(organization=self.other_organization, full_name="Elsewhere")
+        product = Product.objects.create(organization=self.organization, name="Plov")
+        cart = Cart.objects.create(organization=self.organization, person=self.people[0], table_number=3)
+        CartProduct.objects.create(organization=self.organization, cart=cart, product=product)
+
+    def _rows(self, response):
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.DictReader(StringIO(content)))
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_people_export_streams_csv(self):
+        """People are streamed as CSV in chunks, filtered by organization, without vectors."""
+        url = reverse('export', args=['people'])
+        response = self.client.get(url, {'organization': str(self.organization.id)})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = self._rows(response)
+        self.assertEqual([row['full_name'] for row in rows], [f"Person {i}" for i in range(5)])
+        self.assertNotIn('vector', rows[0])
+
+    def test_cart_products_export(self):
+        """Cart product rows include related person and product name."""
+        response = self.client.get(reverse('export', args=['cart_products']))
+        rows = self._rows(response)
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['product_name'], 'Plov')
+        self.assertEqual(rows[0]['cart_person_id'], str(self.people[0].id))
+
+    def test_date_range_filter(self):
+        """Rows outside the date range are excluded."""
+        response = self.client.get(reverse('export', args=['carts']), {'end': '2000-01-01'})
+        self.assertEqual(self._rows(response), [])
+
+    def test_invalid_requests(self):
+        """Unknown datasets and bad parameters are rejected."""
+        self.assertEqual(
+            self.client.get(reverse('export', args=['secrets'])).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(
+            self.client.get(reverse('export', args=['people']), {'start': 'yesterday'}).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_export_command_csv(self):
+        """The management command writes the same CSV."""
+        out, err = StringIO(), StringIO()
+        call_command('export_data', 'people', organization=str(self.organization.id), stdout=out, stderr=err)
+
+        rows = list(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 5)
+        self.assertIn('Exported 5 people rows', err.getvalue())
+
+    def test_export_command_parquet_requires_output(self):
+        """Parquet output needs a file path."""
+        with self.assertRaises(CommandError):
+            call_command('export_data', 'people', format='parquet', stdout=StringIO(), stderr=StringIO())
+
+
+class ASGIExportTestCase(TransactionTestCase):
+    """Test cases for exports served through the ASGI handler, as under daphne."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        for i in range(5):
+            Person.objects.create(organization=self.organization, full_name=f"Person {i}")
+
+    async def _get(self, path, events):
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await asyncio.Event().wait()  # no disconnect until the test ends
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                events.append(("body", message["body"]))
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+            "headers": [(b"host", b"testserver")], "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+        }
+        await ASGIHandler()(scope, receive, send)
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_export_streams_under_asgi(self):
+        """Rows are fetched while earlier batches are already sent, and Django does not warn."""
+        events = []
+        rows = ExportDataset.rows
+
+        def counted_rows(dataset, *args):
+            for row in rows(dataset, *args):
+                events.append(("row", None))
+                yield row
+
+        with warnings.catch_warnings(record=True) as caught, \
+                mock.patch.object(ExportDataset, "rows", counted_rows):
+            warnings.simplefilter("always")
+            async_to_sync(self._get)(reverse('export', args=['people']), events)
+
+        self.assertEqual([str(warning.message) for warning in caught if "Streaming" in str(warning.message)], [])
+        kinds = [kind for kind, _body in events]
+        self.assertEqual(kinds.count("row"), 5)
+        self.assertLess(kinds.index("body"), len(kinds) - 1 - kinds[::-1].index("row"))
+        content = b"".join(body for kind, body in events if kind == "body").decode()
+        self.assertEqual(len(list(csv.DictReader(StringIO(content)))), 5)
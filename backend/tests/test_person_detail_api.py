@@ -0,0 +1,64 @@
+"""Integration tests for Person Detail API."""
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from client.models import Cart, CartProduct, Organization, Person, Product
+
+
+class PersonDetailAPITestCase(TestCase):
+    """Test cases for Person Detail API."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        self.person = Person.objects.create(organization=self.organization, full_name="Regular Guest")
+        self.products = [
+            Product.objects.create(organization=self.organization, name=f"Product {i}") for i in range(3)
+        ]
+        self.url = reverse('person-detail', kwargs={'person_id': self.person.id})
+
+    def _create_carts(self, count, products_per_cart=2):
+        for i in range(count):
+            cart = Cart.objects.create(organization=self.organization, person=self.person, table_number=i)
+            for product in self.products[:products_per_cart]:
+                CartProduct.objects.create(organization=self.organization, cart=cart, product=product)
+
+    def test_detail_counts_without_per_cart_queries(self):
+        """Counts come from annotations; query count does not depend on carts."""
+        self._create_carts(3)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_carts'], 3)
+        self.assertEqual(response.data['total_products_in_carts'], 6)
+        self.assertEqual(response.data['carts'][0]['total_products'], 2)
+        self.assertNotIn('vector', response.data)
+
+        self._create_carts(20, products_per_cart=3)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'carts_page_size': 100})
+        self.assertEqual(response.data['total_carts'], 23)
+        self.assertEqual(response.data['total_products_in_carts'], 66)
+
+    def test_detail_carts_are_paginated(self):
+        """Carts are paginated newest first while totals cover all carts."""
+        self._create_carts(5)
+
+        response = self.client.get(self.url, {'carts_page': 2, 'carts_page_size': 2})
+
+        self.assertEqual(response.data['total_carts'], 5)
+        self.assertEqual(response.data['carts_total_pages'], 3)
+        self.assertEqual([cart['table_number'] for cart in response.data['carts']], [2, 1])
+
+    def test_detail_errors(self):
+        """Unknown person and bad pagination parameters are rejected."""
+        response = self.client.get(self.url, {'carts_page': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.person.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,135 @@
+"""Tests for PersonEventsConsumer buffering and heartbeat."""
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, override_settings
+
+from core import metrics
+from core.buffers import BufferOverflow, SendBuffer
+from core.encoding import decode_event, encode_event
+from core.consumers import HEARTBEAT_TIMEOUT_CLOSE_CODE, PersonEventsConsumer
+
+
+class SendBufferTestCase(SimpleTestCase):
+    """Test cases for the bounded send buffer policies."""
+
+    def test_drop_oldest(self):
+        """Oldest message is discarded when the buffer is full."""
+        buffer = SendBuffer(maxsize=2, policy="drop_oldest")
+        for i in range(4):
+            buffer.push(i)
+
+        self.assertEqual(buffer.dropped, 2)
+        self.assertEqual([buffer.pop(), buffer.pop()], [2, 3])
+
+    def test_coalesce_replaces_pending_message_in_place(self):
+        """Messages with the same key are merged and keep their position."""
+        buffer = SendBuffer(maxsize=3, policy="coalesce")
+        buffer.push("a1", key="a")
+        buffer.push("b1", key="b")
+        buffer.push("a2", key="a")
+
+        self.assertEqual(buffer.coalesced, 1)
+        self.assertEqual(buffer.dropped, 0)
+        self.assertEqual([buffer.pop(), buffer.pop()], ["a2", "b1"])
+
+    def test_disconnect_raises_when_full(self):
+        """The disconnect policy signals overflow to the caller."""
+        buffer = SendBuffer(maxsize=1, policy="disconnect")
+        buffer.push(1)
+
+        with self.assertRaises(BufferOverflow):
+            buffer.push(2)
+
+    def test_invalid_policy(self):
+        """Unknown policies are rejected."""
+        with self.assertRaises(ValueError):
+            SendBuffer(maxsize=1, policy="unknown")
+
+
+class EventEncodingTestCase(SimpleTestCase):
+    """Test cases for event frame encodings."""
+
+    payload = {
+        "event": "person_joined",
+        "person": {"id": "1", "age": 30, "phone_number": None, "updated_at": "2025-01-01T00:00:00Z"},
+    }
+
+    def test_compact_trims_fields_and_nulls(self):
+        """Compact frames keep only rendered, non-null person fields."""
+        text_data, bytes_data = encode_event(self.payload, "compact")
+
+        self.assertIsNone(bytes_data)
+        self.assertEqual(decode_event(text_data)["person"], {"id": "1", "age": 30})
+
+    def test_msgpack_is_binary(self):
+        """msgpack frames are binary and decode to the compact payload."""
+        text_data, bytes_data = encode_event(self.payload, "msgpack")
+
+        self.assertIsNone(text_data)
+        self.assertEqual(decode_event(bytes_data)["person"], {"id": "1", "age": 30})
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    PERSON_EVENTS_HEARTBEAT_INTERVAL=0,
+)
+class PersonEventsConsumerTestCase(SimpleTestCase):
+    """Test cases for the ws/person/ consumer."""
+
+    def setUp(self):
+        metrics.reset()
+
+    async def test_person_joined_is_delivered(self):
+        """Group events reach the socket through the send buffer."""
+        communicator = WebsocketCommunicator(PersonEventsConsumer.as_asgi(), "/ws/person/")
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        payload = {"event": "person_joined", "person": {"id": "1"}}
+        await get_channel_layer().group_send(
+            PersonEventsConsumer.group_name,
+            {"type": "person_joined", "payload": payload},
+        )
+
+        self.assertEqual(await communicator.receive_json_from(), payload)
+        self.assertEqual(metrics.get("person_events.sent"), 1)
+        await communicator.disconnect()
+        self.assertEqual(metrics.get("person_events.connections"), 0)
+
+    async def test_msgpack_encoding(self):
+        """Clients can request binary msgpack frames."""
+        communicator = WebsocketCommunicator(PersonEventsConsumer.as_asgi(), "/ws/person/?encoding=msgpack")
+        await communicator.connect()
+
+        payload = {"event": "person_joined", "person": {"id": "1", "age": 30}}
+        await get_channel_layer().group_send(
+            PersonEventsConsumer.group_name,
+            {"type": "person_joined", "payload": payload},
+        )
+
+        frame = await communicator.receive_output()
+        self.assertEqual(decode_event(frame["bytes"]), payload)
+        await communicator.disconnect()
+
+    async def test_unknown_encoding_is_rejected(self):
+        """The handshake fails for unsupported encodings."""
+        communicator = WebsocketCommunicator(PersonEventsConsumer.as_asgi(), "/ws/person/?encoding=xml")
+        connected, _ = await communicator.connect()
+
+        self.assertFalse(connected)
+
+    @override_settings(PERSON_EVENTS_HEARTBEAT_INTERVAL=0.05, PERSON_EVENTS_HEARTBEAT_TIMEOUT=0.12)
+    async def test_silent_socket_is_closed_by_heartbeat(self):
+        """A client that never answers pings is disconnected."""
+        communicator = WebsocketCommunicator(PersonEventsConsumer.as_asgi(), "/ws/person/")
+        await communicator.connect()
+
+        self.assertEqual(await communicator.receive_json_from(), {"event": "ping"})
+        output = await communicator.receive_output(timeout=1)
+        while output["type"] == "websocket.send":
+            output = await communicator.receive_output(timeout=1)
+
+        self.assertEqual(output["type"], "websocket.close")
+        self.assertEqual(output["code"], HEARTBEAT_TIMEOUT_CLOSE_CODE)
+        self.assertEqual(metrics.get("person_events.heartbeat_timeouts"), 1)
+        await communicator.disconnect()
@@ -0,0 +1,70 @@
+"""Tests for the Server-Sent Events person stream."""
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from client.events import notify_person_joined, notify_presence_changed
+from core.event_bus import get_event_log
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    SSE_KEEPALIVE_INTERVAL=0.05,
+)
+class PersonEventsStreamTestCase(SimpleTestCase):
+    """Test cases for /api/events/person/."""
+
+    async def _open(self, **extra):
+        response = await self.async_client.get(reverse('person-events-stream'), **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+        return stream
+
+    async def _next_event(self, stream):
+        while True:
+            chunk = (await anext(stream)).decode()
+            if not chunk.startswith(':'):
+                return dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+
+    async def test_live_events_are_streamed(self):
+        """Published events are delivered with an id and event name."""
+        stream = await self._open()
+
+        await sync_to_async(notify_person_joined)({"id": "p1", "vector": None})
+
+        event = await self._next_event(stream)
+        self.assertEqual(event['event'], 'person_joined')
+        self.assertEqual(json.loads(event['data'])['person'], {"id": "p1"})
+        await stream.aclose()
+
+    async def test_resume_from_last_event_id(self):
+        """Events after Last-Event-ID are replayed from the event log."""
+        first = {"id": "p1", "vector": None}
+        second = {"id": "p2", "vector": None}
+        await sync_to_async(notify_person_joined)(first)
+        await sync_to_async(notify_person_joined)(second)
+        stream = await self._open()
+        await stream.aclose()
+        last_id = get_event_log().since(0)[-1][0]
+
+        stream = await self._open(headers={'Last-Event-ID': str(last_id - 1)})
+        event = await self._next_event(stream)
+
+        self.assertEqual(int(event['id']), last_id)
+        self.assertEqual(json.loads(event['data'])['person']['id'], 'p2')
+        await stream.aclose()
+
+    async def test_event_type_filter(self):
+        """Only requested event types are sent."""
+        stream = await self._open(QUERY_STRING='events=person_joined')
+
+        await sync_to_async(notify_presence_changed)("org", "enter", {"person_id": "p1"})
+        await sync_to_async(notify_person_joined)({"id": "p2", "vector": None})
+
+        event = await self._next_event(stream)
+        self.assertEqual(event['event'], 'person_joined')
+        await stream.aclose()
@@ -3,6 +3,8 @@ from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from client.models import Person, Organization
 from datetime import datetime
 
@@ -106,3 +108,104 @@ class PersonListAPITestCase(TestCase):
         self.assertTrue(response.data['has_previous'])
         self.assertEqual(response.data['next_page'], 3)
         self.assertEqual(response.data['previous_page'], 1)
+
+    def test_cursor_pagination_walks_all_pages(self):
+        """Cursor pages cover every person once, newest first, without COUNT by default."""
+        url = reverse('person-list')
+        seen = []
+        params = {'cursor': '', 'page_size': 4}
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, params)
+        self.assertIsNone(response.data['count'])
+        self.assertFalse(response.data['has_previous'])
+
+        while True:
+            seen.extend(person['id'] for person in response.data['results'])
+            if not response.data['next_cursor']:
+                break
+            response = self.client.get(url, {'cursor': response.data['next_cursor'], 'page_size': 4})
+
+        expected = [str(pk) for pk in Person.objects.order_by('-created_at', '-id').values_list('id', flat=True)]
+        self.assertEqual(seen, expected)
+
+    def test_cursor_pagination_row_comparison(self):
+        """Later pages bound (created_at, id) with one row comparison and handle equal timestamps."""
+        url = reverse('person-list')
+        tied = Person.objects.order_by('created_at').first().created_at
+        Person.objects.filter(id__in=Person.objects.order_by('created_at').values('id')[:6]).update(created_at=tied)
+        first = self.client.get(url, {'cursor': '', 'page_size': 12})
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(url, {'cursor': first.data['next_cursor'], 'page_size': 12})
+
+        sql = queries[0]['sql']
+        self.assertIn('("client_person"."created_at", "client_person"."id") <', sql)
+        self.assertNotIn(' OR ', sql)
+        ids = [row['id'] for row in first.data['results'] + second.data['results']]
+        expected = [str(pk) for pk in Person.objects.order_by('-created_at', '-id').values_list('id', flat=True)]
+        self.assertEqual(ids, expected)
+
+    def test_cursor_pagination_previous_page(self):
+        """previous_cursor returns the page before."""
+        url = reverse('person-list')
+        first = self.client.get(url, {'cursor': '', 'page_size': 5})
+        second = self.client.get(url, {'cursor': first.data['next_cursor'], 'page_size': 5})
+
+        back = self.client.get(url, {'cursor': second.data['previous_cursor'], 'page_size': 5})
+
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertFalse(back.data['has_previous'])
+        self.assertTrue(back.data['has_next'])
+
+    def test_cursor_pagination_count_modes(self):
+        """Count is optional: exact, estimate or none; bad values are rejected."""
+        url = reverse('person-list')
+
+        self.assertEqual(self.client.get(url, {'cursor': '', 'count': 'exact'}).data['count'], 15)
+        self.assertEqual(self.client.get(url, {'cursor': '', 'count': 'estimate'}).data['count'], 15)
+        self.assertEqual(
+            self.client.get(url, {'cursor': '', 'count': 'all'}).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.client.get(url, {'cursor': 'garbage'}).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_list_never_selects_vector(self):
+        """The list query reads neither the vector column nor unrequested fields."""
+        url = reverse('person-list')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'id,full_name'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'full_name'})
+        select = [query['sql'] for query in queries if 'FROM "client_person"' in query['sql']][-1]
+        self.assertNotIn('"vector"', select)
+        self.assertNotIn('"phone_number"', select)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {'cursor': ''})
+        self.assertNotIn('"vector"', queries[-1]['sql'])
+
+    def test_list_fields_validation(self):
+        """Unknown fields are rejected."""
+        response = self.client.get(reverse('person-list'), {'fields': 'id,vector'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('vector', str(response.data))
+
+    def test_list_scoped_to_organization(self):
+        """The organization parameter limits the list to that tenant."""
+        other = Organization.objects.create(name="Other Organization", private_key="TEST002")
+        Person.objects.create(organization=other, full_name="Elsewhere")
+        url = reverse('person-list')
+
+        response = self.client.get(url, {'organization': str(other.id), 'cursor': '', 'count': 'exact'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['full_name'], 'Elsewhere')
+
+        response = self.client.get(url, {'organization': 'nope'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -128,3 +128,41 @@ class PersonOrderHistoryAPITestCase(TestCase):
             self.assertIn('product_id', product)
             self.assertIn('product_name', product)
             self.assertIn('added_at', product)
+
+    def _create_carts(self, count):
+        for i in range(count):
+            cart = Cart.objects.create(organization=self.organization, person=self.person, table_number=i)
+            for product in self.products:
+                CartProduct.objects.create(organization=self.organization, cart=cart, product=product)
+
+    def test_order_history_constant_query_count(self):
+        """Query count does not grow with the number of carts."""
+        url = reverse('person-order-history', kwargs={'person_id': self.person.id})
+        self._create_carts(3)
+
+        # person, COUNT(carts), carts page, prefetched cart products with products
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data['orders']), 3)
+
+        self._create_carts(30)
+        with self.assertNumQueries(4):
+            response = self.client.get(url, {'page_size': 100})
+        self.assertEqual(len(response.data['orders']), 33)
+        self.assertEqual(response.data['orders'][0]['total_products'], 3)
+
+    def test_order_history_paginated_by_cart(self):
+        """Orders are paginated by cart, newest first."""
+        url = reverse('person-order-history', kwargs={'person_id': self.person.id})
+        self._create_carts(5)
+
+        response = self.client.get(url, {'page': 2, 'page_size': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_orders'], 5)
+        self.assertEqual(response.data['total_pages'], 3)
+        self.assertTrue(response.data['has_next'])
+        self.assertEqual([order['table_number'] for order in response.data['orders']], [2, 1])
+
+        response = self.client.get(url, {'page': 4, 'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,143 @@
+"""Tests for the incrementally maintained PersonProfile."""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from client.models import Cart, CartProduct, Organization, Person, PersonProfile, Product
+
+PROFILE_FIELDS = (
+    'total_visits', 'total_items', 'first_visit', 'last_visit',
+    'favorite_table', 'favorite_dishes', 'table_counts', 'dish_counts',
+)
+
+
+class PersonProfileTestCase(TestCase):
+    """Test cases for PersonProfile maintenance."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        self.person = Person.objects.create(organization=self.organization, full_name="Regular Guest")
+        self.pizza = Product.objects.create(organization=self.organization, name="Pizza")
+        self.salad = Product.objects.create(organization=self.organization, name="Salad")
+
+    def _order(self, table, *products, person=None):
+        cart = Cart.objects.create(organization=self.organization, person=person or self.person, table_number=table)
+        for product in products:
+            CartProduct.objects.create(organization=self.organization, cart=cart, product=product)
+        return cart
+
+    def _profile(self, person=None):
+        return PersonProfile.objects.get(person=person or self.person)
+
+    def _snapshot(self):
+        return {
+            profile.person_id: {name: getattr(profile, name) for name in PROFILE_FIELDS}
+            for profile in PersonProfile.objects.all()
+        }
+
+    def test_new_orders_update_profile(self):
+        """Creating carts and cart products updates counters and favorites."""
+        self._order(5, self.pizza, self.salad)
+        last = self._order(5, self.pizza)
+        self._order(2, self.salad, self.salad, self.pizza)
+
+        profile = self._profile()
+        self.assertEqual(profile.total_visits, 3)
+        self.assertEqual(profile.total_items, 6)
+        self.assertEqual(profile.favorite_table, 5)
+        self.assertEqual(profile.favorite_dishes, [{"dish": "Pizza", "count": 3}, {"dish": "Salad", "count": 3}])
+        self.assertGreaterEqual(profile.last_visit, last.created_at)
+
+    def test_edits_and_deletes_keep_profile_in_sync(self):
+        """Moving and deleting orders leaves the same profile a rebuild would produce."""
+        other = Person.objects.create(organization=self.organization, full_name="Other Guest")
+        cart = self._order(5, self.pizza, self.salad)
+        self._order(3, self.salad)
+        self._order(1, self.pizza, person=other)
+
+        cart.table_number = 7
+        cart.save()
+        CartProduct.objects.filter(product=self.salad).first().delete()
+        moved = Cart.objects.filter(person=self.person, table_number=3).get()
+        moved.person = other
+        moved.save()
+        self._order(None, self.salad).delete()
+        incremental = self._snapshot()
+
+        call_command('rebuild_person_profiles', stdout=StringIO())
+
+        self.assertEqual(self._snapshot(), incremental)
+        self.assertEqual(self._profile().favorite_table, 7)
+        self.assertEqual(self._profile(other).total_visits, 2)
+
+    def test_product_rename_keeps_profile_in_sync(self):
+        """Renaming a product moves its counts to the new name; later deletes use that name too."""
+        self._order(5, self.pizza, self.pizza, self.salad)
+
+        self.pizza.name = "Pizza Margherita"
+        self.pizza.save()
+        self.assertEqual(self._profile().dish_counts, {"Pizza Margherita": 2, "Salad": 1})
+
+        CartProduct.objects.filter(product=self.pizza).first().delete()
+        self._order(2, self.pizza)
+        incremental = self._snapshot()
+
+        call_command('rebuild_person_profiles', stdout=StringIO())
+
+        self.assertEqual(self._snapshot(), incremental)
+        self.assertEqual(
+            self._profile().favorite_dishes,
+            [{"dish": "Pizza Margherita", "count": 2}, {"dish": "Salad", "count": 1}],
+        )
+
+    def test_person_delete_removes_profile(self):
+        """Cascading deletes drop the profile instead of recomputing it."""
+        self._order(5, self.pizza)
+
+        self.person.delete()
+
+        self.assertFalse(PersonProfile.objects.exists())
+
+    def test_last_cart_delete_removes_profile(self):
+        """A person without orders has no profile row."""
+        cart = self._order(5, self.pizza)
+
+        cart.delete()
+
+        self.assertFalse(PersonProfile.objects.filter(person=self.person).exists())
+
+    def test_rebuild_command_backfills_profiles(self):
+        """Rebuilding regenerates missing profiles for one organization."""
+        self._order(5, self.pizza, self.salad)
+        expected = self._snapshot()
+        PersonProfile.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_person_profiles', organization=str(self.organization.id), stdout=out)
+
+        self.assertIn("Rebuilt 1 person profiles", out.getvalue())
+        self.assertEqual(self._snapshot(), expected)
+
+    def test_list_and_detail_include_profile(self):
+        """List and detail read favorites from the profile without extra queries."""
+        self._order(5, self.pizza)
+        Person.objects.create(organization=self.organization, full_name="New Guest")
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('person-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profiles = {row['full_name']: row['profile'] for row in response.data['results']}
+        self.assertEqual(profiles["Regular Guest"]['favorite_table'], 5)
+        self.assertEqual(profiles["Regular Guest"]['favorite_dishes'], [{"dish": "Pizza", "count": 1}])
+        self.assertEqual(profiles["New Guest"]['total_visits'], 0)
+
+        response = self.client.get(reverse('person-detail', kwargs={'person_id': self.person.id}))
+        self.assertEqual(response.data['profile']['total_visits'], 1)
+        self.assertEqual(response.data['total_products_in_carts'], 1)
@@ -0,0 +1,125 @@
+"""Tests for person search by name and phone."""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from client.models import Organization, Person
+
+
+class PersonSearchAPITestCase(TestCase):
+    """Test cases for the person search API."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('person-search')
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        self.other = Organization.objects.create(name="Other Organization", private_key="TEST002")
+        self.alisher = Person.objects.create(
+            organization=self.organization, full_name="Alisher Usmanov", phone_number="+998 (90) 123-45-67"
+        )
+        self.alina = Person.objects.create(
+            organization=self.organization, full_name="Alina Karimova", phone_number="+998 91 555 00 11"
+        )
+        self.guest = Person.objects.create(
+            organization=self.other, full_name="Alisher Navoi", phone_number="998901234567"
+        )
+
+    def _search(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_phone_is_normalized_on_save(self):
+        """phone_normalized keeps only digits and follows phone_number updates."""
+        self.assertEqual(self.alisher.phone_normalized, "998901234567")
+
+        self.alisher.phone_number = "+1 (555) 010-99"
+        self.alisher.save(update_fields=['phone_number'])
+
+        self.alisher.refresh_from_db()
+        self.assertEqual(self.alisher.phone_normalized, "155501099")
+
+    def test_search_by_partial_name_ranked(self):
+        """Partial and misspelled names match, best match first."""
+        data = self._search("alisher", organization=self.organization.id)
+        self.assertEqual([row['id'] for row in data['results']], [str(self.alisher.id)])
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['query'], "alisher")
+        self.assertIn('profile', data['results'][0])
+        self.assertNotIn('vector', data['results'][0])
+
+        data = self._search("Alishr", organization=self.organization.id)
+        self.assertEqual(data['results'][0]['id'], str(self.alisher.id))
+
+        data = self._search("Al", organization=self.organization.id)
+        self.assertEqual({row['full_name'] for row in data['results']}, {"Alisher Usmanov", "Alina Karimova"})
+
+    def test_search_by_phone_in_any_format(self):
+        """Exact phones rank above prefixes, and prefixes above substrings."""
+        data = self._search("+998 90 123 45 67")
+        ranks = {row['id']: row['rank'] for row in data['results']}
+        self.assertEqual(ranks[str(self.alisher.id)], 1.0)
+        self.assertEqual(ranks[str(self.guest.id)], 1.0)
+
+        data = self._search("99891", organization=self.organization.id)
+        self.assertEqual([row['id'] for row in data['results']], [str(self.alina.id)])
+        self.assertEqual(data['results'][0]['rank'], 0.9)
+
+        data = self._search("555 00", organization=self.organization.id)
+        self.assertEqual(data['results'][0]['id'], str(self.alina.id))
+        self.assertEqual(data['results'][0]['rank'], 0.6)
+
+    def test_search_is_scoped_to_organization(self):
+        """Other organizations' people are not returned."""
+        data = self._search("Alisher", organization=self.other.id)
+        self.assertEqual([row['id'] for row in data['results']], [str(self.guest.id)])
+
+        data = self._search("Alisher")
+        self.assertEqual(data['count'], 2)
+
+    def test_new_people_are_searchable(self):
+        """Writes rebuild the in-memory index before the next search."""
+        self.assertEqual(self._search("Dilnoza")['count'], 0)
+
+        Person.objects.create(organization=self.organization, full_name="Dilnoza Rahimova")
+
+        self.assertEqual(self._search("Dilnoza")['count'], 1)
+
+    def test_limit_and_validation(self):
+        """limit caps the results; a missing query or bad parameters are rejected."""
+        self.assertEqual(self._search("Ali", limit=1)['count'], 1)
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'q': 'Ali', 'limit': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'q': 'Ali', 'organization': 'bad'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_search_uses_index(self):
+        """The admin changelist search goes through the same ranking."""
+        admin = get_user_model().objects.create_superuser(username="admin", email="admin@example.com", password="pass")
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse('admin:client_person_changelist'), {'q': '90 123'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    @override_settings(PERSON_SEARCH_MAX_LIMIT=1)
+    def test_admin_search_is_not_capped_and_respects_filters(self):
+        """Admin search returns every match within the changelist filters."""
+        admin = get_user_model().objects.create_superuser(username="admin", email="admin@example.com", password="pass")
+        self.client.force_login(admin)
+        for name in ("Alisher Karimov", "Alisher Tursunov"):
+            Person.objects.create(organization=self.other, full_name=name)
+        url = reverse('admin:client_person_changelist')
+
+        response = self.client.get(url, {'q': 'Alisher'})
+        self.assertEqual(response.context['cl'].result_count, 4)
+
+        response = self.client.get(url, {'q': 'Alisher', 'organization__id__exact': str(self.organization.id)})
+        self.assertEqual([person.pk for person in response.context['cl'].result_list], [self.alisher.pk])
@@ -0,0 +1,146 @@
+"""Integration tests for the persisted, asynchronous Person summary."""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from client import summaries
+from client.llm import FakeLLMClient
+from client.models import Cart, CartProduct, Organization, Person, PersonSummary, Product
+
+
+@override_settings(AI_SUMMARY_BACKEND="fake", AI_SUMMARY_INLINE=True)
+class PersonSummaryAPITestCase(TestCase):
+    """Test cases for Person Summary API."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        self.person = Person.objects.create(organization=self.organization, full_name="Regular Guest", age=30)
+        self.pizza = Product.objects.create(organization=self.organization, name="Pizza")
+        self.cart = Cart.objects.create(organization=self.organization, person=self.person, table_number=5)
+        CartProduct.objects.create(organization=self.organization, cart=self.cart, product=self.pizza)
+        self.url = reverse('person-summary', kwargs={'person_id': self.person.id})
+
+    def test_summary_generated_once_and_reused(self):
+        """The LLM is called on the first request only while history is unchanged."""
+        with mock.patch.object(FakeLLMClient, 'complete', autospec=True, side_effect=FakeLLMClient.complete) as complete:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(complete.call_count, 1)
+        self.assertTrue(first.data['ai_summary'].startswith("Offline summary"))
+        self.assertEqual(second.data['ai_summary'], first.data['ai_summary'])
+        self.assertFalse(second.data['ai_summary_stale'])
+        self.assertFalse(second.data['ai_summary_pending'])
+        self.assertEqual(first.data['favorite_table'], 5)
+        self.assertEqual(first.data['favorite_dishes'], [{"dish": "Pizza", "count": 1}])
+        self.assertEqual(PersonSummary.objects.count(), 1)
+
+    def test_new_order_regenerates_summary(self):
+        """A changed order history changes the fingerprint and triggers regeneration."""
+        first = self.client.get(self.url)
+        fingerprint = PersonSummary.objects.get().fingerprint
+
+        CartProduct.objects.create(organization=self.organization, cart=self.cart, product=self.pizza)
+        second = self.client.get(self.url)
+
+        self.assertNotEqual(PersonSummary.objects.get().fingerprint, fingerprint)
+        self.assertNotEqual(second.data['ai_summary'], first.data['ai_summary'])
+        self.assertFalse(second.data['ai_summary_stale'])
+        self.assertEqual(second.data['total_spent_items'], 2)
+
+    @override_settings(AI_SUMMARY_INLINE=False)
+    def test_stale_summary_returned_while_pending(self):
+        """In background mode the stored summary is returned at once and flagged."""
+        PersonSummary.objects.create(person=self.person, text="Old summary", fingerprint="0" * 64)
+
+        with mock.patch.object(summaries, '_get_executor') as get_executor:
+            response = self.client.get(self.url)
+            again = self.client.get(self.url)
+
+        get_executor.return_value.submit.assert_called_once()
+        self.assertEqual(response.data['ai_summary'], "Old summary")
+        self.assertTrue(response.data['ai_summary_stale'])
+        self.assertTrue(response.data['ai_summary_pending'])
+        self.assertTrue(again.data['ai_summary_pending'])
+
+    @override_settings(AI_SUMMARY_INLINE=False)
+    def test_first_summary_pending_is_null(self):
+        """Without any stored summary the field is null until generation finishes."""
+        with mock.patch.object(summaries, '_get_executor'):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['ai_summary'])
+        self.assertTrue(response.data['ai_summary_pending'])
+
+    def test_generation_error_is_not_persisted(self):
+        """A failed LLM call is reported and retried later instead of being stored."""
+        with mock.patch.object(FakeLLMClient, 'complete', side_effect=RuntimeError("boom")):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['ai_summary'], "Error generating AI summary: boom")
+        self.assertFalse(response.data['ai_summary_pending'])
+        self.assertFalse(PersonSummary.objects.exists())
+
+    @override_settings(AI_SUMMARY_BACKEND="openai")
+    def test_missing_api_key(self):
+        """Without an API key nothing is scheduled and a message is returned."""
+        with mock.patch.dict('os.environ', {}, clear=True):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['ai_summary'], summaries.UNAVAILABLE_MESSAGE)
+        self.assertFalse(response.data['ai_summary_pending'])
+
+    def _add_carts(self, count):
+        for i in range(count):
+            cart = Cart.objects.create(organization=self.organization, person=self.person, table_number=i % 3)
+            CartProduct.objects.create(organization=self.organization, cart=cart, product=self.pizza)
+
+    def test_query_count_does_not_grow_with_history(self):
+        """Statistics come from the profile and only the recent carts are loaded."""
+        self.client.get(self.url)
+        self._add_carts(2)
+        self.client.get(self.url)
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+
+        self._add_carts(30)
+        self.client.get(self.url)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['total_visits'], 33)
+        self.assertEqual(response.data['total_spent_items'], 33)
+        self.assertEqual(response.data['favorite_dishes'], [{"dish": "Pizza", "count": 33}])
+
+    @override_settings(AI_SUMMARY_PROMPT_ORDERS=5, AI_SUMMARY_PROMPT_TOKEN_BUDGET=400)
+    def test_prompt_is_bounded(self):
+        """The prompt holds aggregates and at most the last N orders within the token budget."""
+        self._add_carts(50)
+        digest = summaries.history_digest(self.person)
+        prompt = summaries.build_summary_prompt(self.person, digest)
+
+        self.assertEqual(len(digest['recent_orders']), 5)
+        self.assertEqual(digest['total_visits'], 51)
+        self.assertLessEqual(summaries.estimate_tokens(prompt), 400)
+        self.assertIn("Total visits: 51", prompt)
+        self.assertIn("of 51):", prompt)
+
+        budget = summaries.estimate_tokens(prompt) - 20
+        tight = summaries.build_summary_prompt(self.person, digest, token_budget=budget)
+        self.assertLessEqual(summaries.estimate_tokens(tight), budget)
+        self.assertLess(tight.count("\n- 20"), prompt.count("\n- 20"))
+
+    def test_nonexistent_person(self):
+        """Test 404 for a missing person."""
+        url = reverse('person-summary', kwargs={'person_id': '00000000-0000-0000-0000-000000000000'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
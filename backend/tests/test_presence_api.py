@@ -0,0 +1,96 @@
+"""Integration tests for the presence snapshot API."""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from client.models import Organization, Person
+from client.presence import OccupancyIndex, get_occupancy_index
+
+
+class PresenceAPITestCase(TestCase):
+    """Test cases for the presence snapshot API."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        get_occupancy_index().clear()
+        self.organization = Organization.objects.create(
+            name="Test Organization",
+            private_key="TEST001"
+        )
+        self.url = reverse('presence-snapshot')
+
+    def _snapshot(self):
+        response = self.client.get(self.url, {'organization': str(self.organization.id)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_detection_marks_person_present(self):
+        """A detection adds the person to the snapshot without a Person scan."""
+        response = self.client.post(reverse('person-vector'), {
+            'organization_key': self.organization.private_key,
+            'age': 30,
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(0):
+            data = self._snapshot()
+
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['people'][0]['person_id'], response.data['id'])
+
+    def test_cart_sets_table_and_exit_removes(self):
+        """Cart creation records the table; an exit time removes the person."""
+        person = Person.objects.create(organization=self.organization, full_name="Guest")
+
+        response = self.client.post(reverse('cart-create'), {
+            'organization_key': self.organization.private_key,
+            'person': str(person.id),
+            'table_number': 7,
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._snapshot()['people'][0]['table_number'], 7)
+
+        response = self.client.put(
+            reverse('person-update', kwargs={'person_id': person.id}),
+            {'exit_time': timezone.now().isoformat()},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._snapshot()['count'], 0)
+
+    def test_missing_organization(self):
+        """The organization parameter is required."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OccupancyIndexTestCase(TestCase):
+    """Unit tests for OccupancyIndex."""
+
+    def test_inactive_people_expire(self):
+        """Entries older than the timeout are expired."""
+        index = OccupancyIndex(timedelta(minutes=5))
+        now = timezone.now()
+        index.touch("org", "a", seen_at=now - timedelta(minutes=10))
+        index.touch("org", "b", seen_at=now)
+
+        expired = index.expire("org", now=now)
+
+        self.assertEqual([entry.person_id for entry in expired], ["a"])
+        self.assertEqual([entry.person_id for entry in index.snapshot("org")], ["b"])
+
+    def test_touch_reports_enter_then_update(self):
+        """Repeated sightings update the existing entry."""
+        index = OccupancyIndex(timedelta(minutes=5))
+
+        self.assertEqual(index.touch("org", "a")[0], "enter")
+        action, entry = index.touch("org", "a", table_number=3)
+
+        self.assertEqual(action, "update")
+        self.assertEqual(entry.table_number, 3)
@@ -0,0 +1,106 @@
+"""Tests for product autocomplete and its in-memory catalog."""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from client.catalog import autocomplete
+from client.models import Organization, Product
+
+
+class ProductAutocompleteAPITestCase(TestCase):
+    """Test cases for the product autocomplete API."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('product-autocomplete')
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        self.other = Organization.objects.create(name="Other Organization", private_key="TEST002")
+        for name in ("Pizza Margherita", "Pepperoni Pizza", "Coca-Cola", "Caesar Salad"):
+            Product.objects.create(organization=self.organization, name=name)
+        Product.objects.create(organization=self.other, name="Pizza Quattro Formaggi")
+
+    def _complete(self, q, organization=None, **params):
+        response = self.client.get(self.url, {'q': q, 'organization': organization or self.organization.id, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['name'] for row in response.data['results']]
+
+    def test_word_prefixes_match(self):
+        """Any word of the name can be completed; names starting with the query come first."""
+        self.assertEqual(self._complete("piz"), ["Pizza Margherita", "Pepperoni Pizza"])
+        self.assertEqual(self._complete("pizza m"), ["Pizza Margherita"])
+        self.assertEqual(self._complete("cola"), ["Coca-Cola"])
+        self.assertEqual(self._complete("zza"), [])
+        self.assertEqual(self._complete("piz", organization=self.other.id), ["Pizza Quattro Formaggi"])
+        self.assertEqual(self._complete("p", limit=1), ["Pepperoni Pizza"])
+
+    def test_repeated_keystrokes_run_no_queries(self):
+        """After the first request the catalog is served from memory."""
+        self._complete("p")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(len(self._complete("pi")), 2)
+            self.assertEqual(self._complete("caes"), ["Caesar Salad"])
+
+    def test_product_writes_invalidate_catalog(self):
+        """Creating, renaming and deleting products is visible on the next request."""
+        self._complete("piz")
+
+        product = Product.objects.create(organization=self.organization, name="Pizza Diavola")
+        self.assertIn("Pizza Diavola", self._complete("piz"))
+
+        product.name = "Spicy Diavola"
+        product.save()
+        self.assertEqual(self._complete("spi"), ["Spicy Diavola"])
+
+        product.delete()
+        self.assertEqual(self._complete("spi"), [])
+
+    def test_moving_product_invalidates_both_catalogs(self):
+        """A product moved to another organization leaves the old catalog."""
+        self._complete("caes")
+        self._complete("caes", organization=self.other.id)
+
+        product = Product.objects.get(name="Caesar Salad")
+        product.organization = self.other
+        product.save()
+
+        self.assertEqual(self._complete("caes"), [])
+        self.assertEqual(self._complete("caes", organization=self.other.id), ["Caesar Salad"])
+
+    @override_settings(PRODUCT_CATALOG_CACHE_SIZE=2)
+    def test_large_catalog_falls_back_to_database(self):
+        """Catalogs over the size limit are searched in the database."""
+        self.assertEqual(self._complete("pizza"), ["Pizza Margherita", "Pepperoni Pizza"])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self._complete("salad"), ["Caesar Salad"])
+
+    def test_database_fallback_matches_catalog(self):
+        """Both paths complete word prefixes only, so results do not depend on catalog size."""
+        Product.objects.create(organization=self.organization, name="Rice Bowl")
+        Product.objects.create(organization=self.organization, name="Ice Tea")
+        queries = ("ice", "piz", "pizza m", "cola", "zza", "coca-c", "bowl r")
+
+        def names(query):
+            return [product["name"] for product in autocomplete(self.organization.id, query)]
+
+        with override_settings(PRODUCT_CATALOG_CACHE_SIZE=2):
+            from_database = {query: names(query) for query in queries}
+        cache.clear()  # new catalog version: the next call loads the catalog into memory
+        from_memory = {query: names(query) for query in queries}
+
+        self.assertEqual(from_database, from_memory)
+        self.assertEqual(from_memory["ice"], ["Ice Tea"])
+
+    def test_validation(self):
+        """The query and a valid organization are required."""
+        response = self.client.get(self.url, {'organization': self.organization.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'q': 'piz'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'q': 'piz', 'organization': self.organization.id, 'limit': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
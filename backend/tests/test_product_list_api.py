@@ -0,0 +1,42 @@
+"""Integration tests for Product List API."""
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from client.models import Organization, Product
+
+
+class ProductListAPITestCase(TestCase):
+    """Test cases for Product List API."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        other = Organization.objects.create(name="Other Organization", private_key="TEST002")
+        for i in range(7):
+            Product.objects.create(organization=self.organization, name=f"Dish {i}")
+        Product.objects.create(organization=other, name="Elsewhere")
+        self.url = reverse('product-list')
+
+    def test_page_pagination(self):
+        """Page-number pagination keeps working."""
+        response = self.client.get(self.url, {'page': 2, 'page_size': 5})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 8)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_cursor_pagination_with_filters(self):
+        """Cursor pages respect the organization filter."""
+        params = {'cursor': '', 'page_size': 5, 'organization': str(self.organization.id)}
+        first = self.client.get(self.url, params)
+        second = self.client.get(self.url, dict(params, cursor=first.data['next_cursor']))
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first.data['results']), 5)
+        self.assertEqual(len(second.data['results']), 2)
+        self.assertIsNone(second.data['next_cursor'])
+        names = {product['name'] for product in first.data['results'] + second.data['results']}
+        self.assertEqual(names, {f"Dish {i}" for i in range(7)})
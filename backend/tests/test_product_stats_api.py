@@ -0,0 +1,104 @@
+"""Integration tests for product popularity and co-purchase statistics."""
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from client.models import Cart, CartProduct, Organization, Person, Product
+from client.stats_cache import organization_timezone
+
+
+class ProductStatsAPITestCase(TestCase):
+    """Test cases for product statistics APIs."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        self.other_organization = Organization.objects.create(name="Other Organization", private_key="TEST002")
+        self.person = Person.objects.create(organization=self.organization)
+        self.products = {
+            name: Product.objects.create(organization=self.organization, name=name)
+            for name in ("Plov", "Tea", "Bread", "Salad")
+        }
+        # Plov+Tea+Bread, Plov+Tea, Plov+Tea (twice Tea), Salad
+        for names in (["Plov", "Tea", "Bread"], ["Plov", "Tea"], ["Plov", "Tea", "Tea"], ["Salad"]):
+            self._order(self.organization, names)
+        # Warm the cached organization timezone so query counts cover only the statistics
+        organization_timezone(self.organization.id)
+
+    def _order(self, organization, names):
+        cart = Cart.objects.create(organization=organization, person=self.person)
+        for name in names:
+            CartProduct.objects.create(organization=organization, cart=cart, product=self.products[name])
+        return cart
+
+    def _params(self, **extra):
+        return {'organization': str(self.organization.id), **extra}
+
+    def test_top_products(self):
+        """Products are ranked by times ordered, with distinct cart counts."""
+        url = reverse('top-products-stats')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, self._params(limit=3))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['type'], 'month')
+        self.assertEqual(
+            [(row['name'], row['count'], row['carts']) for row in response.data['data']],
+            [('Tea', 4, 3), ('Plov', 3, 3), ('Bread', 1, 1)]
+        )
+
+    def test_co_purchases(self):
+        """Each pair is reported once, ranked by shared carts."""
+        url = reverse('co-purchase-stats')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, self._params())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        pairs = {
+            frozenset((row['name'], row['other_name'])): row['carts']
+            for row in response.data['data']
+        }
+        self.assertEqual(pairs, {
+            frozenset(('Plov', 'Tea')): 3,
+            frozenset(('Plov', 'Bread')): 1,
+            frozenset(('Tea', 'Bread')): 1,
+        })
+        self.assertEqual(response.data['data'][0]['carts'], 3)
+
+    def test_co_purchases_for_product(self):
+        """With a product, returns what is ordered together with it."""
+        url = reverse('co-purchase-stats')
+        response = self.client.get(url, self._params(product=str(self.products['Tea'].id)))
+
+        self.assertEqual(
+            [(row['other_name'], row['carts']) for row in response.data['data']],
+            [('Plov', 3), ('Bread', 1)]
+        )
+
+    def test_results_scoped_and_cached_per_organization(self):
+        """Results are per organization and cached until orders change."""
+        url = reverse('top-products-stats')
+        other = self.client.get(url, {'organization': str(self.other_organization.id)})
+        self.assertEqual(other.data['data'], [])
+
+        self.client.get(url, self._params())
+        with self.assertNumQueries(0):
+            self.client.get(url, self._params())
+
+        self._order(self.organization, ["Salad", "Salad"])
+        response = self.client.get(url, self._params())
+        self.assertEqual(response.data['data'][0]['name'], 'Tea')
+        self.assertIn(('Salad', 3), [(row['name'], row['count']) for row in response.data['data']])
+
+    def test_invalid_params(self):
+        """Invalid product, limit or period is rejected."""
+        url = reverse('co-purchase-stats')
+        self.assertEqual(self.client.get(url, {'product': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'limit': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'type': 'year'}).status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,71 @@
+"""Tests for incrementally maintained statistics rollups."""
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from client.models import Organization, Person, PersonStatRollup
+
+
+class PersonStatRollupTestCase(TestCase):
+    """Test cases for PersonStatRollup maintenance."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.organization = Organization.objects.create(
+            name="Test Organization",
+            private_key="TEST001"
+        )
+
+    def _counts(self, dimension):
+        rows = (
+            PersonStatRollup.objects.filter(dimension=dimension)
+            .values('value')
+            .annotate(total=Sum('count'))
+        )
+        return {row['value']: row['total'] for row in rows if row['total']}
+
+    def test_create_update_delete_keep_rollups_in_sync(self):
+        """Person writes adjust rollup counts incrementally."""
+        person = Person.objects.create(organization=self.organization, gender='Female', age=30)
+        Person.objects.create(organization=self.organization, gender='Female', age=40)
+        self.assertEqual(self._counts('gender'), {'Female': 2})
+
+        person.gender = 'Male'
+        person.save()
+        self.assertEqual(self._counts('gender'), {'Female': 1, 'Male': 1})
+        self.assertEqual(self._counts('age'), {'30': 1, '40': 1})
+
+        person.delete()
+        self.assertEqual(self._counts('gender'), {'Female': 1})
+
+    def test_rebuild_command_matches_incremental_state(self):
+        """The rebuild command regenerates the same counts."""
+        for gender in ('Female', 'Male', 'Female'):
+            Person.objects.create(organization=self.organization, gender=gender, emotion='Happy')
+        incremental = self._counts('gender')
+
+        PersonStatRollup.objects.all().delete()
+        call_command('rebuild_stat_rollups', stdout=StringIO())
+
+        self.assertEqual(self._counts('gender'), incremental)
+        self.assertEqual(self._counts('emotion'), {'Happy': 3})
+
+    def test_statistics_read_rollups_only(self):
+        """Distribution endpoints cost one query regardless of people count."""
+        for _ in range(20):
+            Person.objects.create(organization=self.organization, gender='Female', body_type='Slim', age=25)
+
+        for name in ('gender-stats', 'body-type-stats', 'emotion-stats', 'age-stats'):
+            with self.assertNumQueries(1):
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse('gender-stats'))
+        self.assertEqual(response.data['total_people'], 20)
+        self.assertEqual(response.data['data'], [{'type': 'Female', 'percentage': 100.0}])
@@ -4,6 +4,7 @@ from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from client.models import Person, Organization
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import datetime, timedelta
 
@@ -81,6 +82,53 @@ class StatisticsAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('Неверный тип статистики', str(response.data))
 
+    def test_visit_count_stats_single_query(self):
+        """Visit count statistics are computed with one aggregated query."""
+        url = reverse('visit-count-stats')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'type': 'month'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']), 30)
+        self.assertEqual(response.data['total_visits'], 5)
+
+    def test_visit_count_stats_custom_range(self):
+        """Custom ranges are bucketed and gap-filled."""
+        base = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.get_current_timezone())
+        Person.objects.filter(full_name="Person 0").update(created_at=base + timedelta(minutes=5))
+        Person.objects.filter(full_name="Person 1").update(created_at=base + timedelta(minutes=10))
+        Person.objects.filter(full_name="Person 2").update(created_at=base + timedelta(minutes=50))
+
+        url = reverse('visit-count-stats')
+        response = self.client.get(url, {
+            'bucket': '15m',
+            'start': '2025-01-01T10:00:00Z',
+            'end': '2025-01-01T11:00:00Z',
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['type'], 'custom')
+        self.assertEqual(
+            [(entry['date'], entry['value']) for entry in response.data['data']],
+            [
+                ('2025-01-01 10:00', 2),
+                ('2025-01-01 10:15', 0),
+                ('2025-01-01 10:30', 0),
+                ('2025-01-01 10:45', 1),
+            ]
+        )
+
+    def test_visit_count_stats_invalid_bucket(self):
+        """Unknown bucket sizes and missing ranges are rejected."""
+        url = reverse('visit-count-stats')
+
+        response = self.client.get(url, {'bucket': '5m', 'start': '2025-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, {'bucket': 'day'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_body_type_stats(self):
         """Test body type statistics."""
         url = reverse('body-type-stats')
@@ -145,6 +193,101 @@ class StatisticsAPITestCase(TestCase):
         total_percentage = sum(entry['percentage'] for entry in response.data['data'])
         self.assertAlmostEqual(total_percentage, 100.0, places=1)
 
+    def test_age_stats_sql_buckets(self):
+        """Age categories follow the shared definition, in age order, in one query."""
+        Person.objects.create(organization=self.organization, age=70)
+        url = reverse('age-stats')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_people'], 6)
+        self.assertEqual(
+            [entry['type'] for entry in response.data['data']],
+            ['18-25', '25-35', '35-45', '65+']
+        )
+
+    def test_age_stats_custom_edges(self):
+        """Custom bucket edges are supported and validated."""
+        url = reverse('age-stats')
+
+        response = self.client.get(url, {'edges': '30,40'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(entry['type'], entry['percentage']) for entry in response.data['data']],
+            [('0-30', 40.0), ('30-40', 40.0), ('40+', 20.0)]
+        )
+
+        response = self.client.get(url, {'edges': '40,30'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_statistics_scoped_to_organization(self):
+        """The organization parameter limits every distribution to that tenant."""
+        other = Organization.objects.create(name="Other Organization", private_key="TEST002")
+        Person.objects.create(organization=other, age=70, gender='Male', emotion='Sad', body_type='Slim')
+        params = {'organization': str(other.id)}
+
+        gender = self.client.get(reverse('gender-stats'), params)
+        self.assertEqual(gender.data, {'total_people': 1, 'data': [{'type': 'Male', 'percentage': 100.0}]})
+
+        emotion = self.client.get(reverse('emotion-stats'), params)
+        self.assertEqual(emotion.data['data'], [{'type': 'Sad', 'value': 1}])
+
+        body_type = self.client.get(reverse('body-type-stats'), params)
+        self.assertEqual(body_type.data['total_people'], 1)
+
+        age = self.client.get(reverse('age-stats'), params)
+        self.assertEqual(age.data['data'], [{'type': '65+', 'percentage': 100.0}])
+
+        own = self.client.get(reverse('gender-stats'), {'organization': str(self.organization.id)})
+        self.assertEqual(own.data['total_people'], 5)
+
+        response = self.client.get(reverse('gender-stats'), {'organization': 'not-a-uuid'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_dashboard_stats(self):
+        """The dashboard returns every distribution, matching the single endpoints."""
+        cache.clear()
+        url = reverse('dashboard-stats')
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'type': 'month'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['visit_count']['total_visits'], 5)
+        self.assertEqual(response.data['visit_count']['type'], 'month')
+        for name, url_name in (
+            ('body_type', 'body-type-stats'),
+            ('gender', 'gender-stats'),
+            ('emotion', 'emotion-stats'),
+            ('age', 'age-stats'),
+        ):
+            self.assertEqual(response.data[name], self.client.get(reverse(url_name)).data)
+
+    def test_dashboard_stats_cached(self):
+        """Repeated dashboard requests are served from the shared cache entry."""
+        cache.clear()
+        url = reverse('dashboard-stats')
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['visit_count']['type'], 'day')
+        self.assertEqual(response.data['gender']['total_people'], 5)
+
+    def test_dashboard_stats_invalid_params(self):
+        """Invalid type or organization is rejected."""
+        url = reverse('dashboard-stats')
+
+        response = self.client.get(url, {'type': 'year'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, {'organization': 'not-a-uuid'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_empty_statistics(self):
         """Test statistics with no data."""
         # Clear all persons
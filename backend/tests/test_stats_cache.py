@@ -0,0 +1,98 @@
+"""Tests for the statistics result cache."""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from client.models import Cart, Organization, Person
+from client.stats_cache import get_version
+from core import metrics
+
+
+class StatisticsCacheTestCase(TestCase):
+    """Test cases for cached statistics and version-based invalidation."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        metrics.reset()
+        self.client = APIClient()
+        self.organization = Organization.objects.create(
+            name="Test Organization",
+            private_key="TEST001"
+        )
+        self.other_organization = Organization.objects.create(
+            name="Other Organization",
+            private_key="TEST002"
+        )
+        Person.objects.create(organization=self.organization, gender='Female', age=30)
+
+    def test_repeated_requests_are_served_from_cache(self):
+        """A second identical request runs no queries and counts as a hit."""
+        url = reverse('gender-stats')
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_people'], 1)
+        self.assertEqual(metrics.get('statistics_cache.gender.miss'), 1)
+        self.assertEqual(metrics.get('statistics_cache.gender.hit'), 1)
+
+    def test_person_write_invalidates_cache(self):
+        """Creating a person makes the next request recompute."""
+        url = reverse('gender-stats')
+        self.client.get(url)
+
+        Person.objects.create(organization=self.organization, gender='Male', age=40)
+        response = self.client.get(url)
+
+        self.assertEqual(response.data['total_people'], 2)
+        self.assertEqual(metrics.get('statistics_cache.gender.miss'), 2)
+
+    def test_cart_write_bumps_organization_version(self):
+        """Cart writes bump the version of their organization and of the global view."""
+        person = Person.objects.get()
+        org_version = get_version(self.organization.id)
+        all_version = get_version()
+        other_version = get_version(self.other_organization.id)
+
+        Cart.objects.create(organization=self.organization, person=person, table_number=1)
+
+        self.assertGreater(get_version(self.organization.id), org_version)
+        self.assertGreater(get_version(), all_version)
+        self.assertEqual(get_version(self.other_organization.id), other_version)
+
+    def test_writes_do_not_invalidate_other_organizations(self):
+        """Another organization's cached dashboard survives unrelated writes."""
+        url = reverse('dashboard-stats')
+        params = {'organization': str(self.other_organization.id)}
+        self.client.get(url, params)
+
+        Person.objects.create(organization=self.organization, gender='Male', age=40)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_ranges_are_cached_separately(self):
+        """Different periods use different cache entries."""
+        url = reverse('visit-count-stats')
+        day = self.client.get(url, {'type': 'day'})
+        week = self.client.get(url, {'type': 'week'})
+
+        self.assertEqual(day.data['type'], 'day')
+        self.assertEqual(week.data['type'], 'week')
+        self.assertEqual(metrics.get('statistics_cache.visit-count.miss'), 2)
+
+    @override_settings(STATISTICS_CACHE_TIMEOUT=0)
+    def test_max_staleness_setting(self):
+        """A zero timeout disables caching."""
+        url = reverse('gender-stats')
+        self.client.get(url)
+        self.client.get(url)
+
+        self.assertEqual(metrics.get('statistics_cache.gender.miss'), 2)
+        self.assertEqual(metrics.get('statistics_cache.gender.hit'), 0)
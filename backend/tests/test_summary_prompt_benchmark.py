@@ -0,0 +1,15 @@
+"""Smoke test for the summary prompt benchmark."""
+from django.test import SimpleTestCase
+
+from benchmarks.summary_prompt import run
+
+
+class SummaryPromptBenchmarkTestCase(SimpleTestCase):
+    """Test cases for benchmarks.summary_prompt."""
+
+    def test_bounded_prompt_stops_growing(self):
+        """The legacy prompt grows with history, the bounded one does not."""
+        small, large = run([10, 500], repeat=1)
+
+        self.assertGreater(large["legacy_tokens"], 10 * small["legacy_tokens"])
+        self.assertLess(large["bounded_tokens"], 2 * small["bounded_tokens"])
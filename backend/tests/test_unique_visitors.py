@@ -0,0 +1,102 @@
+"""Tests for HyperLogLog sketches and the unique visitors API."""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from client.hll import HyperLogLog
+from client.ingestion import record_detection
+from client.models import Organization, Person, VisitorSketch
+
+
+class HyperLogLogTestCase(SimpleTestCase):
+    """Test cases for the HyperLogLog estimator."""
+
+    def test_estimate_within_error_bound(self):
+        """Large cardinalities are estimated within three standard errors."""
+        sketch = HyperLogLog()
+        for value in range(20000):
+            sketch.add(value)
+
+        self.assertLess(abs(sketch.count() - 20000) / 20000, 3 * sketch.relative_error)
+
+    def test_small_counts_are_exact_enough(self):
+        """Linear counting keeps small cardinalities accurate; duplicates are ignored."""
+        sketch = HyperLogLog()
+        for value in list(range(50)) * 3:
+            sketch.add(value)
+
+        self.assertAlmostEqual(sketch.count(), 50, delta=2)
+
+    def test_merge_and_serialization(self):
+        """Merged sketches count the union; bytes round-trip and stay compact."""
+        first, second = HyperLogLog(), HyperLogLog()
+        for value in range(1000):
+            first.add(value)
+        for value in range(500, 1500):
+            second.add(value)
+
+        restored = HyperLogLog.from_bytes(first.to_bytes())
+        union = HyperLogLog.union([restored, second])
+
+        self.assertLess(abs(union.count() - 1500) / 1500, 3 * union.relative_error)
+        self.assertLess(len(HyperLogLog().to_bytes()), 100)
+
+
+class UniqueVisitorsAPITestCase(TestCase):
+    """Test cases for the unique visitors API."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('unique-visitors-stats')
+        self.organization = Organization.objects.create(name="Test Organization", private_key="TEST001")
+        self.people = [Person.objects.create(organization=self.organization) for _ in range(3)]
+        self.day = datetime(2024, 12, 1, tzinfo=dt_timezone.utc)
+
+    def test_detections_update_hourly_sketches(self):
+        """Repeated detections in an hour share one sketch row."""
+        for person in self.people + self.people[:1]:
+            record_detection(person, seen_at=self.day + timedelta(hours=10))
+
+        self.assertEqual(VisitorSketch.objects.count(), 1)
+
+    def test_unique_visitors_merge_across_hours(self):
+        """Returning visitors are counted once per window and once per bucket."""
+        record_detection(self.people[0], seen_at=self.day + timedelta(hours=9))
+        record_detection(self.people[1], seen_at=self.day + timedelta(hours=9))
+        record_detection(self.people[0], seen_at=self.day + timedelta(hours=30))
+        record_detection(self.people[2], seen_at=self.day + timedelta(hours=30))
+
+        response = self.client.get(self.url, {
+            'bucket': 'day',
+            'start': '2024-12-01',
+            'end': '2024-12-03',
+            'organization': str(self.organization.id),
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['unique_visitors'], 3)
+        self.assertEqual(
+            [(point['date'], point['value']) for point in response.data['data']],
+            [('2024-12-01', 2), ('2024-12-02', 2)]
+        )
+        self.assertAlmostEqual(response.data['relative_error'], 0.01625, places=4)
+
+    def test_new_detection_invalidates_cache(self):
+        """A new visitor in the open hour is reflected on the next request."""
+        params = {'type': 'day', 'organization': str(self.organization.id)}
+        record_detection(self.people[0])
+        self.assertEqual(self.client.get(self.url, params).data['unique_visitors'], 1)
+
+        record_detection(self.people[1])
+        self.assertEqual(self.client.get(self.url, params).data['unique_visitors'], 2)
+
+    def test_sub_hour_bucket_rejected(self):
+        """Sketches are hourly, so 15 minute buckets are rejected."""
+        response = self.client.get(self.url, {'bucket': '15m', 'start': '2024-12-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
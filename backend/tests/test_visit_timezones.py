@@ -0,0 +1,129 @@
+"""Tests for timezone-aware visit count buckets and closed-bucket caching."""
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from client.models import Organization, Person
+from client.stats_cache import cached_count_by_bucket
+from client.timeseries import BUCKETS
+
+
+class VisitTimezoneTestCase(TestCase):
+    """Test cases for per-organization timezone bucketing."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('visit-count-stats')
+        self.organization = Organization.objects.create(
+            name="Tashkent Venue",
+            private_key="TEST001",
+            timezone="Asia/Tashkent"
+        )
+        # 20:00 UTC on Dec 1 is 01:00 on Dec 2 in Tashkent (UTC+5)
+        self.person = self._create_person(datetime(2024, 12, 1, 20, 0, tzinfo=dt_timezone.utc))
+        self.params = {
+            'bucket': 'day',
+            'start': '2024-12-01',
+            'end': '2024-12-03',
+            'organization': str(self.organization.id),
+        }
+
+    def _create_person(self, created_at):
+        person = Person.objects.create(organization=self.organization)
+        Person.objects.filter(pk=person.pk).update(created_at=created_at)
+        return person
+
+    def test_day_buckets_follow_organization_timezone(self):
+        """Days are split at local midnight and labelled in local time."""
+        response = self.client.get(self.url, self.params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['timezone'], 'Asia/Tashkent')
+        self.assertEqual(
+            [(point['date'], point['value']) for point in response.data['data']],
+            [('2024-12-01', 0), ('2024-12-02', 1)]
+        )
+
+        params = dict(self.params)
+        del params['organization']
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.data['timezone'], 'UTC')
+        self.assertEqual(response.data['data'][0]['value'], 1)
+
+    def test_custom_range_is_aligned_to_buckets(self):
+        """Unaligned bounds are widened to whole local buckets."""
+        params = dict(self.params, bucket='hour', start='2024-12-02T01:30:00', end='2024-12-02T02:10:00')
+        response = self.client.get(self.url, params)
+
+        self.assertEqual(
+            [(point['date'], point['value']) for point in response.data['data']],
+            [('2024-12-02 01:00', 1), ('2024-12-02 02:00', 0)]
+        )
+
+    def test_closed_buckets_are_served_from_cache(self):
+        """Historical buckets survive writes that only touch the open bucket."""
+        self.client.get(self.url, self.params)
+
+        # A new detection invalidates the response cache but not closed buckets
+        Person.objects.create(organization=self.organization)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, self.params)
+        self.assertEqual(response.data['total_visits'], 1)
+
+        # Presets include the open bucket, which is always recounted
+        self.client.get(self.url, {'type': 'week', 'organization': str(self.organization.id)})
+        Person.objects.create(organization=self.organization)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'type': 'week', 'organization': str(self.organization.id)})
+        self.assertEqual(response.data['total_visits'], 2)
+
+    def test_just_closed_bucket_is_recounted(self):
+        """A row committed after the boundary but dated before it is still counted."""
+        tz = dt_timezone.utc
+        start = datetime(2024, 12, 1, 20, 0, tzinfo=tz)
+        end = datetime(2024, 12, 1, 22, 0, tzinfo=tz)
+        now = datetime(2024, 12, 1, 21, 0, 10, tzinfo=tz)
+        persons = Person.objects.filter(organization=self.organization)
+
+        def counts():
+            rows = cached_count_by_bucket(
+                persons, 'created_at', start, end, BUCKETS['hour'], tz, self.organization.id, now=now
+            )
+            return [count for _moment, count in rows]
+
+        self.assertEqual(counts(), [1, 0])
+        self._create_person(datetime(2024, 12, 1, 20, 59, 59, tzinfo=tz))
+        self.assertEqual(counts(), [2, 0])
+
+    def test_delete_invalidates_closed_buckets(self):
+        """Deleting a person recounts historical buckets."""
+        self.client.get(self.url, self.params)
+
+        self.person.delete()
+        response = self.client.get(self.url, self.params)
+
+        self.assertEqual(response.data['total_visits'], 0)
+
+    def test_timezone_change_rebuckets(self):
+        """Changing the organization timezone drops cached buckets."""
+        self.client.get(self.url, self.params)
+
+        self.organization.timezone = 'UTC'
+        self.organization.save()
+        response = self.client.get(self.url, self.params)
+
+        self.assertEqual(response.data['timezone'], 'UTC')
+        self.assertEqual(response.data['data'][0]['value'], 1)
+
+    def test_invalid_timezone_rejected(self):
+        """Organization timezone must be an IANA name."""
+        self.organization.timezone = 'Mars/Olympus'
+        with self.assertRaises(ValidationError):
+            self.organization.full_clean()
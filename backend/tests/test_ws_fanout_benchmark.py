@@ -0,0 +1,25 @@
+"""Smoke test for the WebSocket fan-out load test."""
+from argparse import Namespace
+
+from django.test import SimpleTestCase, override_settings
+
+from benchmarks.ws_fanout import run
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    PERSON_EVENTS_HEARTBEAT_INTERVAL=0,
+)
+class WebsocketFanoutBenchmarkTestCase(SimpleTestCase):
+    """Test cases for benchmarks.ws_fanout."""
+
+    async def test_small_run_delivers_everything(self):
+        """Every published event reaches every dashboard."""
+        args = Namespace(dashboards=3, cameras=2, events=3, rate=0, encoding="compact", idle_timeout=1.0)
+
+        result = await run(args)
+
+        self.assertEqual(result["expected_deliveries"], 18)
+        self.assertEqual(result["delivered"], 18)
+        self.assertEqual(result["dropped"], 0)
+        self.assertGreater(result["latency_ms"]["p50"], 0)
@@ -57,6 +57,13 @@ export const useWebSocketPersonEvents = ({
         try {
           const data = JSON.parse(event.data)
 
+          // Answer server heartbeats so the socket is not closed as dead
+          if (data?.event === 'ping') {
+            socket.send(JSON.stringify({ event: 'pong' }))
+
+            return
+          }
+
           // Convert snake_case to camelCase to match frontend expectations
           const camelizedData = humps.camelizeKeys(data)
 